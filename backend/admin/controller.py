@@ -1,16 +1,19 @@
 from models.meeting_model import Meeting
-from services.repository import MeetingRepository
+from services.repository import MeetingRepository, SqliteMeetingRepository, create_meeting_repository
 from services.s3_storage import S3Storage
 from services.bedrock_utils import summarize_transcript
 
 
 class AdminController:
-    def __init__(self, repository: MeetingRepository | None = None):
-        self.repository = repository or MeetingRepository()
+    def __init__(self, repository: MeetingRepository | SqliteMeetingRepository | None = None):
+        self.repository = repository or create_meeting_repository()
         self.storage = S3Storage()
 
-    def list_meetings(self) -> list[Meeting]:
-        return self.repository.list_meetings()
+    def list_meetings(self, status: str | None = None, limit: int | None = None, offset: int = 0) -> list[Meeting]:
+        return self.repository.list_meetings(status=status, limit=limit, offset=offset)
+
+    def count_meetings(self, status: str | None = None) -> int:
+        return self.repository.count_meetings(status=status)
 
     def create_meeting(self, payload: dict) -> Meeting:
         title = payload.get("title")
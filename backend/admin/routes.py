@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
 
 from .controller import AdminController
 
@@ -7,8 +7,14 @@ controller = AdminController()
 
 
 @router.get("/meetings")
-def list_meetings():
-    return controller.list_meetings()
+def list_meetings(
+    response: Response,
+    status: str | None = None,
+    limit: int | None = Query(None, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+):
+    response.headers["X-Total-Count"] = str(controller.count_meetings(status=status))
+    return controller.list_meetings(status=status, limit=limit, offset=offset)
 
 
 @router.post("/meetings")
@@ -15,15 +15,70 @@ class Settings(BaseSettings):
     aws_region: str = "ap-northeast-1"
     aws_access_key_id: str | None = None
     aws_secret_access_key: str | None = None
+    aws_connect_timeout: float = 3.0
+    aws_read_timeout: float = 30.0
+    aws_max_attempts: int = 3
+    aws_max_pool_connections: int = 16
+    bedrock_read_timeout: float = 60.0
+    comprehend_read_timeout: float = 10.0
     s3_bucket_name: str = "meeting-police-dev"
+    s3_connect_timeout: float = 2.0
+    s3_read_timeout: float = 10.0
+    s3_max_attempts: int = 2
+    s3_max_pool_connections: int = 16
+    s3_breaker_failure_threshold: int = 3
+    s3_breaker_reset_seconds: float = 30.0
     bedrock_model_id: str = "anthropic.claude-v2"
+    bedrock_summarize_model_id: str = ""
+    bedrock_classify_model_id: str = ""
+    bedrock_classify_escalation_model_id: str = ""
+    bedrock_classify_escalation_confidence: int = 60
+    bedrock_embed_model_id: str = "amazon.titan-embed-text-v2:0"
+    bedrock_embed_concurrency: int = 4
+    bedrock_embed_dimensions: int = 512
+    bedrock_classify_window_tokens: int = 3000
+    bedrock_classify_overlap: int = 2
+    bedrock_classify_concurrency: int = 4
+    classify_rule_min_confidence: float = 0.85
+    bedrock_summary_chunk_tokens: int = 2000
+    bedrock_summary_concurrency: int = 4
     comprehend_language: str = "en"
+    comprehend_batch_concurrency: int = 4
+    llm_cache_enabled: bool = True
+    llm_cache_dir: str = ""
+    llm_cache_max_entries: int = 1024
+
+    meeting_repository_backend: str = "sqlite"
+    meeting_db_path: str = ""
 
     vonage_application_id: str = ""
     vonage_api_key: str = ""
     vonage_api_secret: str = ""
     vonage_private_key_path: str = "secrets/vonage_private.key"
 
+    poc_subscriber_buffer_size: int = 256
+    poc_slow_consumer_policy: str = "drop_oldest"
+    poc_event_log_size: int = 1024
+    poc_max_upload_bytes: int = 1024 * 1024 * 1024
+    poc_audio_backend: str = "auto"
+    poc_pacing: str = "realtime"
+    poc_max_concurrent_jobs: int = 2
+    poc_max_queued_jobs: int = 8
+    poc_queue_policy: str = "fifo"
+    poc_max_resident_jobs: int = 32
+    poc_completed_job_ttl_seconds: int = 900
+    poc_live_classification: bool = False
+    poc_live_batch_size: int = 8
+    poc_live_batch_seconds: float = 3.0
+    poc_live_context_sentences: int = 2
+    poc_job_bus: str = "local"
+    poc_job_bus_url: str = ""
+    poc_owner_timeout_seconds: int = 60
+    poc_search_db_path: str = ""
+    poc_vector_index: bool = True
+    poc_vector_index_dir: str = ""
+    poc_vector_quantize: bool = False
+
     @field_validator("cors_origins", mode="before")
     @classmethod
     def split_cors(cls, value: str | list[str]) -> list[str] | list[AnyHttpUrl]:
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import gzip
+import json
+from typing import Any
+
+# v1: pretty-printed JSON with one object per transcript row (``poc/*.json``).
+# v2: gzip-compressed compact JSON with column-oriented transcripts (``poc/*.json.gz``).
+ARCHIVE_FORMAT_VERSION = 2
+ARCHIVE_SUFFIX = ".json.gz"
+LEGACY_SUFFIX = ".json"
+ARCHIVE_CONTENT_TYPE = "application/gzip"
+GZIP_MAGIC = b"\x1f\x8b"
+TRANSCRIPT_COLUMNS = ("index", "speaker", "raw_speaker", "result_id", "text", "timestamp")
+
+
+def is_archive_key(key: str) -> bool:
+    return key.endswith(ARCHIVE_SUFFIX) or key.endswith(LEGACY_SUFFIX)
+
+
+def encode_archive(payload: dict[str, Any]) -> bytes:
+    """Serialize an archive payload in the current (v2) format."""
+    document = dict(payload)
+    document["format"] = ARCHIVE_FORMAT_VERSION
+    document["transcripts"] = _to_columns(payload.get("transcripts") or [])
+    raw = json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    # mtime=0 keeps the output deterministic, so re-archiving unchanged jobs yields identical objects
+    return gzip.compress(raw, compresslevel=6, mtime=0)
+
+
+def decode_archive(raw: bytes | str) -> dict[str, Any]:
+    """Parse an archive in any known format; always returns the v1 (row-oriented) shape."""
+    if isinstance(raw, str):
+        raw = raw.encode("utf-8")
+    if raw[:2] == GZIP_MAGIC:
+        raw = gzip.decompress(raw)
+    document = json.loads(raw)
+    version = document.pop("format", 1)
+    if version > ARCHIVE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported archive format: {version}")
+    if version >= 2:
+        document["transcripts"] = _from_columns(document.get("transcripts") or {})
+    return document
+
+
+def _to_columns(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    present: dict[str, None] = {}
+    for row in rows:
+        present.update(dict.fromkeys(row))
+    columns = [column for column in TRANSCRIPT_COLUMNS if column in present]
+    columns += [column for column in present if column not in TRANSCRIPT_COLUMNS]
+    data = {column: [row.get(column) for row in rows] for column in columns}
+    # rows lacking a key are listed so decoding does not invent ``None`` values for them
+    absent = {
+        column: missing
+        for column in columns
+        if (missing := [idx for idx, row in enumerate(rows) if column not in row])
+    }
+    encoded: dict[str, Any] = {"count": len(rows), "columns": data}
+    if absent:
+        encoded["absent"] = absent
+    return encoded
+
+
+def _from_columns(encoded: dict[str, Any]) -> list[dict[str, Any]]:
+    columns: dict[str, list[Any]] = encoded.get("columns") or {}
+    absent = {column: set(indices) for column, indices in (encoded.get("absent") or {}).items()}
+    rows: list[dict[str, Any]] = []
+    for idx in range(encoded.get("count", 0)):
+        row = {}
+        for column, values in columns.items():
+            if idx not in absent.get(column, ()):
+                row[column] = values[idx]
+        rows.append(row)
+    return rows
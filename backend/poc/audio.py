@@ -0,0 +1,341 @@
+from __future__ import annotations
+
+import math
+import struct
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator
+
+try:
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+except ImportError:  # pragma: no cover - numpy is optional, audioop is the fallback
+    np = None
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    try:
+        import audioop
+    except ImportError:  # removed in Python 3.13
+        audioop = None
+
+WAV_HEADER_PROBE_BYTES = 64 * 1024
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+TARGET_SAMPLE_RATE = 16000
+TARGET_SAMPLE_WIDTH = 2
+# smallest conversion block; iter_chunks re-chunks the output, so this only trades a little memory
+MIN_BLOCK_FRAMES = 2048
+# largest banded cycle matrix the resampler builds (float32 entries); beyond it, it gathers per output
+MAX_CYCLE_ENTRIES = 1 << 20
+# outputs per resampler cycle (at least one phase period of the polyphase filter)
+CYCLE_OUTPUTS = 64
+
+
+class AudioValidationError(ValueError):
+    """The uploaded audio cannot be processed."""
+
+
+class AudioTooLargeError(AudioValidationError):
+    """The uploaded audio exceeds the configured size limit."""
+
+
+@dataclass(frozen=True)
+class WavInfo:
+    channels: int
+    sample_rate: int
+    sample_width: int
+    data_offset: int
+    data_size: int
+
+    @property
+    def frame_width(self) -> int:
+        return self.channels * self.sample_width
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.data_size / (self.frame_width * self.sample_rate)
+
+
+def parse_wav_header(header: bytes) -> WavInfo:
+    """Parse the RIFF/WAVE header at the start of ``header`` without touching the audio body."""
+    if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        raise AudioValidationError("WAV (RIFF/WAVE) 形式の音声ファイルを指定してください")
+
+    fmt: tuple[int, int, int, int] | None = None
+    offset = 12
+    while offset + 8 <= len(header):
+        chunk_id = header[offset : offset + 4]
+        (chunk_size,) = struct.unpack_from("<I", header, offset + 4)
+        body = offset + 8
+        if chunk_id == b"fmt ":
+            if chunk_size < 16 or body + 16 > len(header):
+                raise AudioValidationError("WAV の fmt チャンクが不正です")
+            audio_format, channels, sample_rate, _byte_rate, _block_align, bits = struct.unpack_from("<HHIIHH", header, body)
+            if audio_format == WAVE_FORMAT_EXTENSIBLE and chunk_size >= 40 and body + 26 <= len(header):
+                (audio_format,) = struct.unpack_from("<H", header, body + 24)
+            fmt = (audio_format, channels, sample_rate, bits)
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise AudioValidationError("WAV の fmt チャンクが data より前にありません")
+            audio_format, channels, sample_rate, bits = fmt
+            if audio_format != WAVE_FORMAT_PCM:
+                raise AudioValidationError("リニア PCM の WAV のみ対応しています")
+            if bits not in (8, 16, 24, 32) or not 1 <= channels <= 2 or not 8000 <= sample_rate <= 192000:
+                raise AudioValidationError("対応していない WAV フォーマットです")
+            return WavInfo(
+                channels=channels,
+                sample_rate=sample_rate,
+                sample_width=bits // 8,
+                data_offset=body,
+                data_size=chunk_size,
+            )
+        offset = body + chunk_size + (chunk_size & 1)
+    raise AudioValidationError("WAV の data チャンクが見つかりません")
+
+
+def read_wav_info(path: Path) -> WavInfo:
+    with path.open("rb") as handle:
+        return parse_wav_header(handle.read(WAV_HEADER_PROBE_BYTES))
+
+
+class AudioopBlockConverter:
+    """Scalar ``audioop`` conversion, kept for environments without NumPy."""
+
+    name = "audioop"
+
+    def __init__(self, info: WavInfo):
+        self.info = info
+        self._state = None
+
+    def convert(self, raw: bytes) -> bytes:
+        info = self.info
+        width = info.sample_width
+        if width == 1:
+            # 8-bit WAV samples are unsigned; audioop expects signed samples
+            raw = audioop.bias(raw, 1, -128)
+        if width != TARGET_SAMPLE_WIDTH:
+            raw = audioop.lin2lin(raw, width, TARGET_SAMPLE_WIDTH)
+        if info.channels == 2:
+            raw = audioop.tomono(raw, TARGET_SAMPLE_WIDTH, 0.5, 0.5)
+        if info.sample_rate != TARGET_SAMPLE_RATE:
+            raw, self._state = audioop.ratecv(raw, TARGET_SAMPLE_WIDTH, 1, info.sample_rate, TARGET_SAMPLE_RATE, self._state)
+        return raw
+
+
+class PolyphaseResampler:
+    """Streaming rational resampler (upsample by L, low-pass, downsample by M) built on NumPy.
+
+    The FIR is a Kaiser-windowed sinc split into L polyphase branches, so each output
+    sample only needs ``taps / L`` multiply-adds. Output phases repeat every L outputs, which
+    consume exactly M inputs, so one cycle of L outputs is a fixed banded matrix applied to
+    an input span starting every M samples: a whole block becomes a single strided view
+    times that matrix (one BLAS call) instead of a gather per output sample. Input from the
+    start of the next cycle is kept between calls, so block-wise processing is equivalent
+    to processing the whole signal. Rates whose L would make that matrix too large fall
+    back to gathering one window per output sample.
+    """
+
+    def __init__(self, src_rate: int, dst_rate: int, zero_crossings: int = 12, rolloff: float = 0.945, beta: float = 8.6):
+        divisor = math.gcd(src_rate, dst_rate)
+        self.up = dst_rate // divisor
+        self.down = src_rate // divisor
+        factor = max(self.up, self.down)
+        half = zero_crossings * factor
+        t = np.arange(-half, half + 1, dtype=np.float64)
+        cutoff = rolloff / factor
+        taps = cutoff * np.sinc(cutoff * t) * np.kaiser(t.size, beta) * self.up
+        per_phase = -(-t.size // self.up)
+        taps = np.pad(taps, (0, per_phase * self.up - t.size))
+        # phases[p, k] == taps[p + (per_phase - 1 - k) * up], i.e. each branch reversed so it
+        # lines up with a forward window over the input
+        phases = np.ascontiguousarray(taps.reshape(per_phase, self.up).T[:, ::-1], dtype=np.float32)
+        self._lag = per_phase - 1
+        self._history = np.zeros(self._lag, dtype=np.float32)
+        self._history_start = -self._lag  # absolute input index of _history[0]
+        self._consumed = 0
+        self._next_output = 0
+        if (self.down + per_phase) * self.up > MAX_CYCLE_ENTRIES:
+            # unusual rates (e.g. 44099 Hz) make L huge; gather one window per output instead
+            self._phases = phases
+            self._cycle = None
+            return
+        # a cycle spans several phase periods when L is small, so each matrix row yields enough
+        # outputs for BLAS to beat a per-output dot product
+        repeat = max(1, CYCLE_OUTPUTS // self.up)
+        self._cycle_outputs = self.up * repeat
+        self._cycle_inputs = self.down * repeat
+        # output j of a cycle reads inputs offsets[j] .. offsets[j] + per_phase - 1 of the cycle's span
+        offsets = np.arange(self._cycle_outputs) * self.down // self.up
+        self._cycle = np.zeros((self._cycle_inputs + per_phase - 1, self._cycle_outputs), dtype=np.float32)
+        for j, offset in enumerate(offsets):
+            self._cycle[offset : offset + per_phase, j] = phases[j * self.down % self.up]
+
+    def process(self, samples: "np.ndarray") -> "np.ndarray":
+        if self._cycle is None:
+            return self._process_gather(samples)
+        available = self._history.size + samples.size
+        self._consumed += samples.size
+        stop = -(-self._consumed * self.up // self.down)
+        first_cycle = self._next_output // self._cycle_outputs
+        cycles = -(-stop // self._cycle_outputs) - first_cycle
+        origin = first_cycle * self._cycle_inputs - self._lag - self._history_start
+        # the tail of the last cycle may not be here yet: it is zero-filled and its outputs not emitted
+        buffer = np.empty(max(available, origin + (cycles - 1) * self._cycle_inputs + self._cycle.shape[0]), dtype=np.float32)
+        buffer[: self._history.size] = self._history
+        buffer[self._history.size : available] = samples
+        buffer[available:] = 0
+        result = np.empty(0, dtype=np.float32)
+        if stop > self._next_output:
+            # overlapping rows over the buffer, one per cycle; cheaper to build than as_strided
+            spans = np.ndarray(
+                (cycles, self._cycle.shape[0]),
+                dtype=np.float32,
+                buffer=buffer,
+                offset=origin * buffer.itemsize,
+                strides=(self._cycle_inputs * buffer.itemsize, buffer.itemsize),
+            )
+            offset = first_cycle * self._cycle_outputs
+            # BLAS needs contiguous rows; copying the overlapping view is cheaper than numpy's fallback loop
+            result = (np.ascontiguousarray(spans) @ self._cycle).ravel()[self._next_output - offset : stop - offset]
+            self._next_output = stop
+        # keep everything from the span of the cycle the next output belongs to
+        keep_from = min(available, (self._next_output // self._cycle_outputs) * self._cycle_inputs - self._lag - self._history_start)
+        self._history = buffer[keep_from:available].copy()
+        self._history_start += keep_from
+        return result
+
+    def _process_gather(self, samples: "np.ndarray") -> "np.ndarray":
+        buffer = np.concatenate((self._history, samples.astype(np.float32, copy=False)))
+        self._consumed += samples.size
+        stop = -(-self._consumed * self.up // self.down)
+        positions = np.arange(self._next_output, stop, dtype=np.int64) * self.down
+        oldest = positions // self.up - self._lag - self._history_start
+        window = sliding_window_view(buffer, self._lag + 1)[oldest]
+        result = np.einsum("ij,ij->i", window, self._phases[positions % self.up])
+        self._next_output = max(self._next_output, stop)
+        keep_from = min(buffer.size, self._next_output * self.down // self.up - self._lag - self._history_start)
+        self._history = buffer[keep_from:].copy()
+        self._history_start += keep_from
+        return result
+
+
+class NumpyBlockConverter:
+    """Vectorized sample-width conversion, downmix and polyphase resampling."""
+
+    name = "numpy"
+
+    def __init__(self, info: WavInfo):
+        self.info = info
+        self._resampler = (
+            PolyphaseResampler(info.sample_rate, TARGET_SAMPLE_RATE) if info.sample_rate != TARGET_SAMPLE_RATE else None
+        )
+        self._mix = np.full(info.channels, 1 / info.channels, dtype=np.float32)
+
+    def convert(self, raw: bytes) -> bytes:
+        info = self.info
+        samples = _decode_int16_scale(raw, info.sample_width)
+        if info.channels > 1:
+            # a (frames, channels) @ weights product is much faster than summing strided channel slices
+            samples = samples.astype(np.float32).reshape(-1, info.channels) @ self._mix
+        if self._resampler is not None:
+            samples = self._resampler.process(samples)
+        if samples.dtype.kind == "i":
+            return samples.astype("<i2", copy=False).tobytes()
+        # in-place ufuncs: blocks are small, so the np.clip/np.rint wrappers would dominate
+        np.rint(samples, out=samples)
+        np.minimum(samples, 32767, out=samples)
+        np.maximum(samples, -32768, out=samples)
+        return samples.astype("<i2").tobytes()
+
+
+def _decode_int16_scale(raw: bytes, width: int) -> "np.ndarray":
+    """Decode little-endian PCM to integers on the 16-bit scale (truncating like ``lin2lin``)."""
+    if width == 1:
+        return (np.frombuffer(raw, dtype=np.uint8).astype(np.int32) - 128) << 8
+    if width == 2:
+        return np.frombuffer(raw, dtype="<i2")
+    if width == 3:
+        data = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+        return (data[:, 1].astype(np.int32) | (data[:, 2].astype(np.int8).astype(np.int32) << 8))
+    if width == 4:
+        return np.frombuffer(raw, dtype="<i4") >> 16
+    raise AudioValidationError(f"Unsupported sample width: {width}")
+
+
+AUDIO_BACKENDS = {
+    "numpy": NumpyBlockConverter,
+    "audioop": AudioopBlockConverter,
+}
+
+
+def available_backends() -> list[str]:
+    """Importable backends in ``auto`` preference order: NumPy, then audioop as the fallback."""
+    names = []
+    if np is not None:
+        names.append("numpy")
+    if audioop is not None:
+        names.append("audioop")
+    return names
+
+
+def resolve_backend(name: str = "auto") -> str:
+    available = available_backends()
+    if name == "auto":
+        if not available:
+            raise RuntimeError("No audio conversion backend available; install numpy")
+        return available[0]
+    if name not in AUDIO_BACKENDS:
+        raise ValueError(f"Unknown audio backend: {name}")
+    if name not in available:
+        raise RuntimeError(f"Audio backend '{name}' is not available in this environment")
+    return name
+
+
+class PcmStreamConverter:
+    """Converts a WAV file to 16 kHz mono 16-bit PCM one block at a time.
+
+    Only one block of source frames is held in memory, and the conversion state (the
+    resampler history) is carried across blocks so the output matches a whole-file conversion.
+    """
+
+    def __init__(self, path: Path, info: WavInfo | None = None, block_ms: int = 100, backend: str = "auto"):
+        self.path = path
+        self.info = info or read_wav_info(path)
+        self.backend = resolve_backend(backend)
+        self.sample_rate = TARGET_SAMPLE_RATE
+        # low sample rates would otherwise convert in tiny blocks, where per-call overhead dominates
+        self.block_frames = max(MIN_BLOCK_FRAMES, self.info.sample_rate * block_ms // 1000)
+
+    def iter_blocks(self) -> Iterator[bytes]:
+        info = self.info
+        block_bytes = self.block_frames * info.frame_width
+        converter = AUDIO_BACKENDS[self.backend](info)
+        with self.path.open("rb") as handle:
+            handle.seek(info.data_offset)
+            remaining = info.data_size
+            while remaining > 0:
+                raw = handle.read(min(remaining, block_bytes))
+                if not raw:
+                    break
+                remaining -= len(raw)
+                raw = raw[: len(raw) - len(raw) % info.frame_width]
+                if not raw:
+                    continue
+                converted = converter.convert(raw)
+                if converted:
+                    yield converted
+
+    def iter_chunks(self, chunk_bytes: int | Callable[[], int]) -> Iterator[bytes]:
+        """Re-chunk the converted blocks; a callable size is re-read before every chunk."""
+        size = chunk_bytes if callable(chunk_bytes) else (lambda: chunk_bytes)
+        pending = b""
+        for block in self.iter_blocks():
+            pending += block
+            while len(pending) >= size():
+                target = size()
+                yield pending[:target]
+                pending = pending[target:]
+        if pending:
+            yield pending
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import asyncio
-import audioop
-import io
 import json
+import os
 import re
+import shutil
+import socket
+import time
 import uuid
-import wave
 import logging
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -16,12 +17,37 @@ from amazon_transcribe.auth import StaticCredentialResolver
 from amazon_transcribe.client import TranscribeStreamingClient
 
 from config import get_settings
-from services.bedrock_utils import classify_transcript_segments, summarize_transcript
-from services.comprehend_utils import analyze_sentiment
-from services.s3_storage import S3Storage
+from services.agenda_alignment import AgendaAligner, AgendaTracker
+from services.bedrock_utils import classify_transcript_segments, create_embeddings, summarize_transcript
+from services.comprehend_utils import analyze_segments_sentiment
+from services.llm_cache import get_llm_cache
+from services.model_router import usage as model_usage
+from services.s3_storage import AsyncS3Storage
 from utils.auth_aws import get_session
 from utils.time_utils import now_iso
 
+from .archive_format import ARCHIVE_CONTENT_TYPE, ARCHIVE_SUFFIX, decode_archive, encode_archive
+from .audio import WAV_HEADER_PROBE_BYTES, AudioTooLargeError, PcmStreamConverter, parse_wav_header
+from .events import JobEventHub, SlowConsumerError
+from .history_index import ArchiveHistoryIndex
+from .job_bus import create_job_bus
+from .job_cache import JobCache, deep_sizeof
+from .live_classifier import LiveClassifier
+from .pacing import AudioPacer, PacingPolicy
+from .scheduler import TranscriptionScheduler
+from .sentences import merge_classified, sentence_segments, sentence_segments_from_transcripts
+from .text_index import TranscriptSearchIndex
+from .vector_index import VectorIndex, archive_rows
+
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# how often an owner refreshes a job's shared state while only transcript events are flowing
+STATE_PUBLISH_SECONDS = 1.0
+RELAY_POLL_SECONDS = 1.0
+# how long the history index is cached before other workers' jobs and migrated keys are re-read
+HISTORY_MAX_AGE_SECONDS = 5.0
+# how often idle workers drop completed jobs whose POC_COMPLETED_JOB_TTL_SECONDS has passed
+CACHE_SWEEP_SECONDS = 30.0
+
 
 @dataclass
 class PocJob:
@@ -30,65 +56,434 @@ class PocJob:
     audio_filename: str
     created_at: str = field(default_factory=now_iso)
     status: str = "processing"
+    pacing: PacingPolicy = field(default_factory=PacingPolicy)
     transcripts: list[dict[str, Any]] = field(default_factory=list)
-    queue: asyncio.Queue = field(default_factory=asyncio.Queue)
+    events: JobEventHub = field(default_factory=JobEventHub)
     speaker_labels: dict[str, str] = field(default_factory=dict)
     next_speaker_index: int = 1
     next_entry_index: int = 1
     pending_results: dict[str, dict[str, Any]] = field(default_factory=dict)
     processed_result_ids: set[str] = field(default_factory=set)
     classified_segments: list[dict[str, Any]] = field(default_factory=list)
+    completed_at: str | None = None
+    archive_key: str | None = None
+    # set on mirrors of jobs that another worker is transcribing
+    owner: str | None = None
+    queue_hint: int | None = None
+    live_classifier: LiveClassifier | None = None
+    agenda_tracker: AgendaTracker | None = None
+    # latest tracker state (active agenda item / off-topic) and per-sentence alignment by index
+    agenda_state: dict[str, Any] = field(default_factory=dict)
+    agenda_timeline: dict[int, dict[str, Any]] = field(default_factory=dict)
 
 
 class POCController:
     def __init__(self, storage_dir: Path | None = None):
         self.storage_dir = storage_dir or Path(__file__).resolve().parents[1] / "data" / "poc"
         self.storage_dir.mkdir(parents=True, exist_ok=True)
-        self.jobs: dict[str, PocJob] = {}
         self.settings = get_settings()
+        self.jobs: JobCache[PocJob] = JobCache(
+            loader=self._rehydrate_job,
+            evictable=lambda job: job.status == "completed" and job.archive_key is not None,
+            size_of=_job_memory,
+            max_resident=self.settings.poc_max_resident_jobs,
+            ttl_seconds=self.settings.poc_completed_job_ttl_seconds,
+        )
         self.logger = logging.getLogger(__name__)
-        self.archive_storage = S3Storage(bucket="meetingpolice-test")
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        self.bus = create_job_bus(
+            self.settings.poc_job_bus,
+            url=self.settings.poc_job_bus_url,
+            log_size=self.settings.poc_event_log_size,
+        )
+        self.archive_storage = AsyncS3Storage(bucket="meetingpolice-test")
+        self.history_index = ArchiveHistoryIndex(
+            self.archive_storage,
+            self._decode_archive,
+            max_age=HISTORY_MAX_AGE_SECONDS,
+        )
+        vector_dir = self.settings.poc_vector_index_dir
+        self.vector_index = VectorIndex(
+            Path(vector_dir) if vector_dir else self.storage_dir.parent / "poc_vectors",
+            quantize=self.settings.poc_vector_quantize,
+        )
+        # job_ids being embedded right now, so a job is not embedded twice at once
+        self._indexing_jobs: set[str] = set()
+        search_db = self.settings.poc_search_db_path
+        self.text_index = TranscriptSearchIndex(Path(search_db) if search_db else self.storage_dir.parent / "poc_search.db")
+        self._background: set[asyncio.Task] = set()
+        self._inbox_task: asyncio.Task | None = None
+        self._sweep_task: asyncio.Task | None = None
+        self.scheduler = TranscriptionScheduler(
+            max_concurrency=self.settings.poc_max_concurrent_jobs,
+            max_queued=self.settings.poc_max_queued_jobs,
+            policy=self.settings.poc_queue_policy,
+        )
 
-    async def start_transcription(self, agenda_text: str, audio_filename: str, audio_bytes: bytes) -> str:
-        job_id = uuid.uuid4().hex[:12]
-        job = PocJob(job_id=job_id, agenda_text=agenda_text, audio_filename=audio_filename)
+    async def start_transcription(
+        self,
+        agenda_text: str,
+        audio_filename: str,
+        audio: Any,
+        pacing: str | None = None,
+        priority: int = 0,
+        live_classification: bool | None = None,
+    ) -> str:
+        """Validate and store an upload, then queue it for transcription.
+
+        ``audio`` only needs an async ``read(size)`` (e.g. ``UploadFile``); it is copied to disk
+        in chunks so memory use does not depend on the recording length. ``pacing`` overrides
+        ``POC_PACING`` and ``live_classification`` overrides ``POC_LIVE_CLASSIFICATION`` for
+        this job. Raises ``QueueFullError`` when the scheduler is saturated.
+        """
+        pacing_policy = PacingPolicy.parse(pacing or self.settings.poc_pacing)
+        # hold a queue slot before reading the body, so a saturated scheduler rejects the
+        # upload up front instead of after it has been stored
+        reservation = self.scheduler.reserve()
+        try:
+            max_bytes = self.settings.poc_max_upload_bytes
+            declared_size = getattr(audio, "size", None)
+            if declared_size is not None and declared_size > max_bytes:
+                raise AudioTooLargeError("音声ファイルのサイズが上限を超えています")
+            header = await audio.read(WAV_HEADER_PROBE_BYTES)
+            wav_info = parse_wav_header(header)
+            if wav_info.data_offset + wav_info.data_size > max_bytes:
+                raise AudioTooLargeError("音声ファイルのサイズが上限を超えています")
+
+            job_id = uuid.uuid4().hex[:12]
+            job_dir = self._job_dir(job_id)
+            job_dir.mkdir(parents=True, exist_ok=True)
+            audio_path = job_dir / "audio.bin"
+            try:
+                await self._store_upload(audio, header, audio_path, max_bytes)
+            except BaseException:
+                shutil.rmtree(job_dir, ignore_errors=True)
+                raise
+            (job_dir / "agenda.txt").write_text(agenda_text, encoding="utf-8")
+
+            job = PocJob(
+                job_id=job_id,
+                agenda_text=agenda_text,
+                audio_filename=audio_filename,
+                pacing=pacing_policy,
+                events=self._new_event_hub(),
+            )
+            if self.settings.poc_live_classification if live_classification is None else live_classification:
+                job.live_classifier = self._new_live_classifier(job)
+            job.agenda_tracker = self._new_agenda_tracker(job)
+            position = self.scheduler.submit(
+                job_id, lambda: self._process_audio(job, audio_path), priority=priority, reservation=reservation
+            )
+        finally:
+            reservation.release()
+        if position:
+            job.status = "queued"
         self.jobs[job_id] = job
+        self._ensure_cache_sweeper()
+        if self.bus.shared:
+            self._spawn(self._forward_events(job))
+            self._ensure_inbox_consumer()
+        return job_id
 
-        job_dir = self._job_dir(job_id)
-        job_dir.mkdir(parents=True, exist_ok=True)
-        (job_dir / "agenda.txt").write_text(agenda_text, encoding="utf-8")
-        (job_dir / "audio.bin").write_bytes(audio_bytes)
+    async def _store_upload(self, audio: Any, header: bytes, path: Path, max_bytes: int) -> None:
+        written = 0
+        with path.open("wb") as handle:
+            chunk = header
+            while chunk:
+                written += len(chunk)
+                if written > max_bytes:
+                    raise AudioTooLargeError("音声ファイルのサイズが上限を超えています")
+                await asyncio.to_thread(handle.write, chunk)
+                chunk = await audio.read(UPLOAD_CHUNK_BYTES)
+
+    async def get_job(self, job_id: str) -> PocJob | None:
+        job = await self.jobs.get(job_id)
+        if job is not None:
+            self._ensure_cache_sweeper()
+        return job
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "jobs": self.jobs.stats(),
+            "scheduler": self.scheduler.stats(),
+            "storage": self.archive_storage.health(),
+            "bus": {"backend": self.bus.name, "worker_id": self.worker_id},
+            "llm_cache": cache.stats() if (cache := get_llm_cache()) else None,
+            "models": model_usage.stats(),
+        }
 
-        asyncio.create_task(self._process_audio(job, audio_bytes))
-        return job_id
+    async def _rehydrate_job(self, job_id: str) -> PocJob | None:
+        """Rebuild a job that is not resident in this worker.
+
+        Jobs still running on another worker become relayed mirrors; evicted, pre-restart or
+        remotely completed jobs are rebuilt from their archive.
+        """
+        state = await self.bus.get_state(job_id) if self.bus.shared else None
+        if state and state.get("status") != "completed" and state.get("owner") != self.worker_id and self._owner_alive(state):
+            job = self._mirror_job(job_id, state)
+            self._spawn(self._relay_remote_job(job))
+            return job
+        try:
+            key = (state or {}).get("archive_key")
+            data = await (self._load_archived_job(key) if key else self._load_job_archive(job_id))
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        if data.get("job_id") != job_id:
+            return None
+        transcripts = data.get("transcripts") or []
+        return PocJob(
+            job_id=job_id,
+            agenda_text=data.get("agenda_text") or "",
+            audio_filename=data.get("audio_filename") or "",
+            created_at=data.get("created_at") or data.get("completed_at") or now_iso(),
+            status="completed",
+            transcripts=transcripts,
+            next_entry_index=max((item.get("index", 0) for item in transcripts), default=0) + 1,
+            classified_segments=data.get("classified_segments") or [],
+            completed_at=data.get("completed_at"),
+            archive_key=key,
+        )
 
-    def get_job(self, job_id: str) -> PocJob | None:
-        return self.jobs.get(job_id)
+    def _new_event_hub(self) -> JobEventHub:
+        return JobEventHub(
+            buffer_size=self.settings.poc_subscriber_buffer_size,
+            policy=self.settings.poc_slow_consumer_policy,
+            log_size=self.settings.poc_event_log_size,
+        )
+
+    def _new_live_classifier(self, job: PocJob) -> LiveClassifier:
+        return LiveClassifier(
+            classify=lambda segments, agenda_text: asyncio.to_thread(classify_transcript_segments, segments, agenda_text),
+            agenda_text=job.agenda_text,
+            on_delta=lambda delta: self._apply_classification_delta(job, delta),
+            batch_size=self.settings.poc_live_batch_size,
+            max_delay=self.settings.poc_live_batch_seconds,
+            context=self.settings.poc_live_context_sentences,
+        )
 
-    def get_job_payload(self, job_id: str) -> dict[str, Any]:
-        job = self.get_job(job_id)
+    def _new_agenda_tracker(self, job: PocJob) -> AgendaTracker | None:
+        tracker = AgendaTracker(AgendaAligner.from_text(job.agenda_text, job.job_id))
+        return tracker if tracker.enabled else None
+
+    def _track_agenda(self, job: PocJob, transcript: dict[str, Any]) -> None:
+        """Score a finalized transcript row against the agenda locally and publish the active item."""
+        if job.agenda_tracker is None:
+            return
+        segments = sentence_segments(transcript, job.agenda_tracker.sentences + 1)
+        if not segments:
+            return
+        results = job.agenda_tracker.observe([segment["text"] for segment in segments])
+        for segment, result in zip(segments, results):
+            job.agenda_timeline[segment["index"]] = result
+        job.agenda_state = job.agenda_tracker.state()
+        sentences = [
+            {"index": segment["index"], "alignment": result["alignment"], "agenda_id": result["agenda_id"]}
+            for segment, result in zip(segments, results)
+        ]
+        job.events.publish({"type": "agenda", "payload": {**job.agenda_state, "sentences": sentences}})
+
+    def _apply_classification_delta(self, job: PocJob, delta: list[dict[str, Any]]) -> None:
+        # a live batch only sees a few sentences, so the running agenda state comes from the tracker
+        delta = [{**item, **job.agenda_timeline.get(item.get("index"), {})} for item in delta]
+        job.classified_segments = merge_classified(job.classified_segments, delta)
+        job.events.publish({"type": "classification", "action": "delta", "payload": delta})
+
+    async def _drain_live_classifier(self, job: PocJob) -> None:
+        if job.live_classifier is not None:
+            await job.live_classifier.close()
+            job.live_classifier = None
+
+    def _spawn(self, coro: Any) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+
+    def _shared_state(self, job: PocJob) -> dict[str, Any]:
+        snapshot = self.job_snapshot(job)
+        return {
+            "owner": self.worker_id,
+            "seq": snapshot["seq"],
+            "status": job.status,
+            "queue_position": self.scheduler.position(job.job_id),
+            "agenda_text": job.agenda_text,
+            "audio_filename": job.audio_filename,
+            "created_at": job.created_at,
+            "pacing": str(job.pacing),
+            "transcripts": snapshot["payload"]["transcripts"],
+            "classified_segments": job.classified_segments,
+            "agenda": job.agenda_state,
+            "completed_at": job.completed_at,
+            "archive_key": job.archive_key,
+            "updated_at": time.time(),
+        }
+
+    async def _forward_events(self, job: PocJob) -> None:
+        """Copy an owned job's events and state to the shared bus until the job completes."""
+        subscription = None
+        last_state = 0.0
+        try:
+            while True:
+                if subscription is None:
+                    # (re)subscribe before publishing state so no event falls between the two
+                    subscription, _ = job.events.subscribe(
+                        buffer_size=self.settings.poc_event_log_size, policy="disconnect"
+                    )
+                    await self.bus.put_state(job.job_id, self._shared_state(job))
+                    last_state = time.monotonic()
+                try:
+                    message = await asyncio.wait_for(subscription.get(), timeout=RELAY_POLL_SECONDS * 5)
+                except asyncio.TimeoutError:
+                    # heartbeat, so mirrors can tell a quiet (e.g. queued) job from a dead owner
+                    await self.bus.put_state(job.job_id, self._shared_state(job))
+                    last_state = time.monotonic()
+                    continue
+                except SlowConsumerError:
+                    # fell behind the hub: mirrors resynchronise from the fresh state instead
+                    job.events.unsubscribe(subscription)
+                    subscription = None
+                    continue
+                await self.bus.append(job.job_id, message)
+                kind = message.get("type")
+                if kind not in ("transcript", "agenda") or time.monotonic() - last_state >= STATE_PUBLISH_SECONDS:
+                    await self.bus.put_state(job.job_id, self._shared_state(job))
+                    last_state = time.monotonic()
+                if kind == "complete":
+                    break
+        except Exception:
+            self.logger.exception("Failed to forward events for job %s", job.job_id)
+        finally:
+            if subscription is not None:
+                job.events.unsubscribe(subscription)
+
+    def _mirror_job(self, job_id: str, state: dict[str, Any]) -> PocJob:
+        job = PocJob(
+            job_id=job_id,
+            agenda_text=state.get("agenda_text") or "",
+            audio_filename=state.get("audio_filename") or "",
+            created_at=state.get("created_at") or now_iso(),
+            pacing=PacingPolicy.parse(state.get("pacing")),
+            events=self._new_event_hub(),
+            owner=state.get("owner"),
+        )
+        self._apply_state(job, state)
+        return job
+
+    def _apply_state(self, job: PocJob, state: dict[str, Any]) -> None:
+        job.status = state.get("status") or job.status
+        job.queue_hint = state.get("queue_position")
+        job.transcripts = list(state.get("transcripts") or [])
+        job.classified_segments = state.get("classified_segments") or []
+        job.agenda_state = state.get("agenda") or {}
+        job.completed_at = state.get("completed_at")
+        job.archive_key = state.get("archive_key")
+        job.events.last_seq = max(job.events.last_seq, int(state.get("seq") or 0))
+
+    async def _relay_remote_job(self, job: PocJob) -> None:
+        """Feed a mirror's hub from the owner's events so local viewers see the job live."""
+        try:
+            while job.status != "completed":
+                messages = await self.bus.read(job.job_id, job.events.last_seq, timeout=RELAY_POLL_SECONDS)
+                if not messages:
+                    state = await self.bus.get_state(job.job_id)
+                    if not state or not self._owner_alive(state):
+                        self.logger.warning("Owner of job %s stopped reporting; dropping mirror", job.job_id)
+                        job.events.publish({"type": "error", "message": "ジョブを処理しているワーカーと通信できません"})
+                        break
+                    job.queue_hint = state.get("queue_position")
+                    continue
+                if messages[0]["seq"] > job.events.last_seq + 1:
+                    # the owner's log no longer covers our position: resync from its state
+                    state = await self.bus.get_state(job.job_id)
+                    if state and int(state.get("seq") or 0) > job.events.last_seq:
+                        self._apply_state(job, state)
+                        snapshot = self.job_snapshot(job)
+                        job.events.publish({"type": "snapshot", "payload": snapshot["payload"]}, seq=snapshot["seq"])
+                        messages = [message for message in messages if message["seq"] > job.events.last_seq]
+                for message in messages:
+                    _apply_remote_event(job, message)
+                    job.events.publish({key: value for key, value in message.items() if key != "seq"}, seq=message["seq"])
+        except Exception:
+            self.logger.exception("Failed to relay events for job %s", job.job_id)
+        finally:
+            # completed (or orphaned) mirrors are re-read from the archive / registry on next access
+            self.jobs.discard(job.job_id)
+
+    def _owner_alive(self, state: dict[str, Any]) -> bool:
+        return time.time() - state.get("updated_at", 0) <= self.settings.poc_owner_timeout_seconds
+
+    def _ensure_cache_sweeper(self) -> None:
+        if self._sweep_task is None or self._sweep_task.done():
+            self._sweep_task = self._spawn(self._sweep_jobs())
+
+    async def _sweep_jobs(self) -> None:
+        """Evict expired completed jobs even when no request touches the cache."""
+        while len(self.jobs):
+            await asyncio.sleep(min(CACHE_SWEEP_SECONDS, max(1.0, self.jobs.ttl_seconds)))
+            self.jobs.sweep()
+
+    def _ensure_inbox_consumer(self) -> None:
+        if self._inbox_task is None or self._inbox_task.done():
+            self._inbox_task = self._spawn(self._consume_inbox())
+
+    async def _consume_inbox(self) -> None:
+        """Apply changes other workers made to jobs this worker owns."""
+        while True:
+            try:
+                for job_id, message in await self.bus.read_inbox(self.worker_id, timeout=RELAY_POLL_SECONDS):
+                    job = await self.get_job(job_id)
+                    if not job or job.owner is not None or message.get("type") != "classification":
+                        continue
+                    job.classified_segments = message.get("payload") or []
+                    job.events.publish(message)
+                    if job.status == "completed":
+                        await self._persist_transcripts(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.logger.exception("Failed to process job bus inbox")
+                await asyncio.sleep(RELAY_POLL_SECONDS)
+
+    async def get_job_payload(self, job_id: str) -> dict[str, Any]:
+        job = await self.get_job(job_id)
         if not job:
             raise KeyError(job_id)
         return {
             "job_id": job.job_id,
             "status": job.status,
+            "queue_position": self.scheduler.position(job.job_id) if job.owner is None else job.queue_hint,
             "agenda_text": job.agenda_text,
             "audio_filename": job.audio_filename,
             "created_at": job.created_at,
+            "pacing": str(job.pacing),
             "transcripts": job.transcripts,
             "classified_segments": job.classified_segments,
         }
 
+    def job_snapshot(self, job: PocJob) -> dict[str, Any]:
+        """Compact single-frame view of a job, sent instead of replaying the whole event log."""
+        pending = sorted(job.pending_results.values(), key=lambda item: item["index"])
+        return {
+            "type": "snapshot",
+            "seq": job.events.last_seq,
+            "payload": {
+                "status": job.status,
+                "transcripts": job.transcripts + [self._public_payload(entry) for entry in pending],
+                "classified_segments": job.classified_segments,
+                "agenda": job.agenda_state,
+            },
+        }
+
     async def analyze_job(self, job_id: str) -> dict[str, Any]:
-        job = self.get_job(job_id)
+        job = await self.get_job(job_id)
         if not job:
             raise KeyError(job_id)
         if not job.transcripts:
             raise ValueError("Transcription not ready yet")
 
         transcript_text = "\n".join(f"{item['speaker']}: {item['text']}" for item in job.transcripts)
-        summary = summarize_transcript(job_id, transcript_text)
-        sentiment = analyze_sentiment(transcript_text[:4000])
+        summary = await asyncio.to_thread(summarize_transcript, job_id, transcript_text)
+        sentiment = await asyncio.to_thread(analyze_segments_sentiment, job.transcripts)
 
         guidance = [
             "Use the summarized transcript as input for Bedrock to draft meeting minutes or action items.",
@@ -106,7 +501,7 @@ class POCController:
         }
 
     async def classify_job(self, job_id: str, refresh: bool = False) -> list[dict[str, Any]]:
-        job = self.get_job(job_id)
+        job = await self.get_job(job_id)
         if not job:
             raise KeyError(job_id)
         if not job.transcripts:
@@ -119,42 +514,83 @@ class POCController:
         classified = await asyncio.to_thread(classify_transcript_segments, sentence_segments, job.agenda_text)
         if not classified:
             raise RuntimeError("Bedrock classification returned no data")
+        if job.owner is not None:
+            # the owning worker applies it and relays the event back to this mirror
+            await self.bus.send_to_owner(job.owner, job.job_id, {"type": "classification", "payload": classified})
+            return classified
         job.classified_segments = classified
-        await job.queue.put({"type": "classification", "payload": classified})
+        job.events.publish({"type": "classification", "payload": classified})
+        if job.status == "completed":
+            # re-archive so the classification survives eviction
+            await self._persist_transcripts(job)
         return classified
 
-    def list_archived_jobs(self, limit: int = 20) -> list[dict[str, Any]]:
-        keys = [key for key in self.archive_storage.list_objects("poc/") if key.endswith(".json")]
-        items: list[dict[str, Any]] = []
-        for key in sorted(keys, reverse=True):
-            try:
-                data = self._load_archived_job(key)
-            except (FileNotFoundError, json.JSONDecodeError):
-                continue
-            items.append(
-                {
-                    "job_id": data.get("job_id"),
-                    "completed_at": data.get("completed_at"),
-                    "archive_name": data.get("archive_name") or "",
-                    "agenda_preview": (data.get("agenda_text") or "")[:80],
-                    "transcript_count": len(data.get("transcripts") or []),
-                }
-            )
-            if len(items) >= limit:
-                break
-        return items
+    async def list_archived_jobs(self, limit: int = 20, cursor: str | None = None) -> dict[str, Any]:
+        items, next_cursor = await self.history_index.page(limit=limit, cursor=cursor)
+        for item in items:
+            item.pop("key", None)
+        return {"items": items, "next_cursor": next_cursor}
 
-    def get_archived_job(self, job_id: str) -> dict[str, Any]:
-        data = self._load_archived_job(self._archive_key(job_id))
+    async def get_archived_job(self, job_id: str) -> dict[str, Any]:
+        try:
+            data = await self._load_job_archive(job_id)
+        except FileNotFoundError as exc:
+            raise KeyError(job_id) from exc
         if not data:
             raise KeyError(job_id)
         return data
 
+    async def search_history(
+        self,
+        query: str,
+        speaker: str | None = None,
+        category: str | None = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> dict[str, Any]:
+        items, total = await asyncio.to_thread(self.text_index.search, query, speaker, category, limit, offset)
+        return {"query": query, "items": items, "total": total}
+
+    async def index_archived_job(self, data: dict[str, Any]) -> int:
+        """Embed an archived job's transcript passages into the vector index (once per job).
+
+        A job is only added when every passage was embedded, so a partial failure is retried
+        the next time the job is archived or the index is backfilled.
+        """
+        job_id = data.get("job_id")
+        if not job_id or job_id in self._indexing_jobs:
+            return 0
+        self._indexing_jobs.add(job_id)
+        try:
+            if self.vector_index.has_job(job_id):
+                return 0
+            rows = archive_rows(data)
+            vectors = await asyncio.to_thread(create_embeddings, [row["text"] for row in rows])
+            if any(vector is None for vector in vectors):
+                self.logger.warning("Skipping vector indexing for job %s: embedding failed", job_id)
+                return 0
+            return await asyncio.to_thread(self.vector_index.add, rows, vectors)
+        except Exception:
+            self.logger.exception("Failed to index job %s for search", job_id)
+            return 0
+        finally:
+            self._indexing_jobs.discard(job_id)
+
+    async def search_archived_jobs(self, query: str, limit: int = 10) -> dict[str, Any]:
+        if not VectorIndex.available():
+            raise RuntimeError("ベクトル検索には numpy が必要です")
+        vector = (await asyncio.to_thread(create_embeddings, [query]))[0]
+        if vector is None:
+            raise RuntimeError("検索語の埋め込みを生成できませんでした")
+        started = time.perf_counter()
+        items = self.vector_index.search(vector, limit=limit)
+        return {"query": query, "items": items, "took_ms": round((time.perf_counter() - started) * 1000, 2)}
+
     async def classify_archived_job(self, job_id: str) -> list[dict[str, Any]]:
-        data = self.get_archived_job(job_id)
+        data = await self.get_archived_job(job_id)
         transcripts = data.get("transcripts") or []
         agenda_text = data.get("agenda_text") or ""
-        sentence_segments = _sentence_segments_from_transcripts(transcripts)
+        sentence_segments = sentence_segments_from_transcripts(transcripts)
         if not sentence_segments:
             raise ValueError("No transcript sentences available yet")
         classified = await asyncio.to_thread(classify_transcript_segments, sentence_segments, agenda_text)
@@ -162,13 +598,27 @@ class POCController:
             raise RuntimeError("Bedrock classification returned no data")
         return classified
 
-    async def _process_audio(self, job: PocJob, audio_bytes: bytes) -> None:
+    async def _process_audio(self, job: PocJob, audio_path: Path) -> None:
+        if job.status == "queued":
+            job.status = "processing"
+            job.events.publish({"type": "status", "status": job.status})
         try:
-            pcm_bytes, sample_rate = self._prepare_pcm(audio_bytes)
-            await self._run_transcribe_stream(job, pcm_bytes, sample_rate)
+            converter = PcmStreamConverter(audio_path, backend=self.settings.poc_audio_backend)
+            await self._run_transcribe_stream(job, converter)
         except Exception:
             self.logger.exception("Transcribe streaming failed for job %s, fallback to mock data", job.job_id)
             job.transcripts.clear()
+            if job.agenda_tracker is not None:
+                job.agenda_tracker = self._new_agenda_tracker(job)
+                job.agenda_timeline.clear()
+            if job.live_classifier is not None:
+                # sentence numbering restarts with the mock transcript
+                job.live_classifier.cancel()
+                job.live_classifier = self._new_live_classifier(job)
+            if job.live_classifier is not None or job.classified_segments:
+                # a full (non-delta) payload makes clients drop rows of the aborted stream
+                job.classified_segments = []
+                job.events.publish({"type": "classification", "payload": []})
             await self._simulate_stream(job)
 
     async def _simulate_stream(self, job: PocJob) -> None:
@@ -186,12 +636,16 @@ class POCController:
             }
             job.transcripts.append(payload)
             job.next_entry_index = max(job.next_entry_index, idx + 1)
-            await job.queue.put({"type": "transcript", "action": "append", "payload": payload})
+            job.events.publish({"type": "transcript", "action": "append", "payload": payload})
+            self._track_agenda(job, payload)
+            if job.live_classifier is not None:
+                job.live_classifier.add(payload)
             await asyncio.sleep(1.2)
+        await self._drain_live_classifier(job)
         job.status = "completed"
         transcript_path.write_text(json.dumps(job.transcripts, ensure_ascii=False, indent=2), encoding="utf-8")
-        self._persist_transcripts(job)
-        await job.queue.put({"type": "complete"})
+        await self._persist_transcripts(job)
+        job.events.publish({"type": "complete"})
 
     def _build_script(self, job: PocJob) -> list[str]:
         agenda_lines = [
@@ -217,34 +671,8 @@ class POCController:
     def _job_dir(self, job_id: str) -> Path:
         return self.storage_dir / job_id
 
-    def _prepare_pcm(self, audio_bytes: bytes) -> tuple[bytes, int]:
-        try:
-            with wave.open(io.BytesIO(audio_bytes), "rb") as wav:
-                sample_width = wav.getsampwidth()
-                sample_rate = wav.getframerate()
-                channels = wav.getnchannels()
-                raw = wav.readframes(wav.getnframes())
-        except wave.Error:
-            # assume already PCM (e.g. raw upload)
-            return audio_bytes, 16000
-
-        target_width = 2
-        if sample_width != target_width:
-            raw = audioop.lin2lin(raw, sample_width, target_width)
-            sample_width = target_width
-
-        if channels != 1:
-            raw = audioop.tomono(raw, sample_width, 0.5, 0.5)
-            channels = 1
-
-        target_rate = 16000
-        if sample_rate != target_rate:
-            raw, _ = audioop.ratecv(raw, sample_width, channels, sample_rate, target_rate, None)
-            sample_rate = target_rate
-
-        return raw, sample_rate
-
-    async def _run_transcribe_stream(self, job: PocJob, pcm_bytes: bytes, sample_rate: int) -> None:
+    async def _run_transcribe_stream(self, job: PocJob, converter: PcmStreamConverter) -> None:
+        sample_rate = converter.sample_rate
         session = get_session()
         credentials = session.get_credentials()
         if not credentials:
@@ -259,14 +687,13 @@ class POCController:
             region=self.settings.aws_region,
             credential_resolver=credential_resolver,
         )
-        chunk_ms = 50
-        chunk_bytes = max(1, int(sample_rate * 2 * chunk_ms / 1000))
+        pacer = AudioPacer(job.pacing, sample_rate)
 
         self.logger.info(
-            "Starting Transcribe stream job_id=%s sample_rate=%s chunk_bytes=%s",
+            "Starting Transcribe stream job_id=%s sample_rate=%s pacing=%s",
             job.job_id,
             sample_rate,
-            chunk_bytes,
+            job.pacing,
         )
         stream = await client.start_stream_transcription(
             language_code="ja-JP",
@@ -278,11 +705,20 @@ class POCController:
         )
 
         async def send_audio():
-            chunk_delay = chunk_ms / 1000
-            for chunk in self._chunk_pcm(pcm_bytes, chunk_bytes):
+            pacer.start()
+            for chunk in converter.iter_chunks(pacer.chunk_bytes):
+                started = time.monotonic()
                 await stream.input_stream.send_audio_event(audio_chunk=chunk)
-                await asyncio.sleep(chunk_delay)
+                await pacer.after_send(len(chunk), time.monotonic() - started)
             await stream.input_stream.end_stream()
+            self.logger.info(
+                "Sent %.1fs of audio in %.1fs job_id=%s pacing=%s pushbacks=%s",
+                pacer.audio_seconds,
+                pacer.elapsed,
+                job.job_id,
+                job.pacing,
+                pacer.pushbacks,
+            )
 
         async def consume_results():
             async for event in stream.output_stream:
@@ -315,15 +751,12 @@ class POCController:
         finally:
             await self._finalize_pending_results(job)
             if success:
+                await self._drain_live_classifier(job)
                 job.status = "completed"
-                self._persist_transcripts(job)
-                await job.queue.put({"type": "complete"})
+                await self._persist_transcripts(job)
+                job.events.publish({"type": "complete"})
                 self.logger.info("Transcribe stream completed job_id=%s total_segments=%s", job.job_id, len(job.transcripts))
 
-    def _chunk_pcm(self, pcm_bytes: bytes, chunk_size: int):
-        for idx in range(0, len(pcm_bytes), chunk_size):
-            yield pcm_bytes[idx : idx + chunk_size]
-
     def _speaker_name(self, job: PocJob, raw_label: str | None) -> str:
         key = raw_label or "__unknown__"
         if key not in job.speaker_labels:
@@ -356,7 +789,7 @@ class POCController:
             }
             job.next_entry_index += 1
             job.pending_results[result_id] = entry
-            await job.queue.put({"type": "transcript", "action": "append", "payload": self._public_payload(entry)})
+            job.events.publish({"type": "transcript", "action": "append", "payload": self._public_payload(entry)})
         else:
             if entry["text"] == text and entry["speaker"] == speaker_label:
                 if is_final:
@@ -365,7 +798,7 @@ class POCController:
             entry["text"] = text
             entry["speaker"] = speaker_label
             entry["raw_speaker"] = raw_label
-            await job.queue.put({"type": "transcript", "action": "update", "payload": self._public_payload(entry)})
+            job.events.publish({"type": "transcript", "action": "update", "payload": self._public_payload(entry)})
         if is_final:
             await self._finalize_result(job, result_id)
 
@@ -375,7 +808,10 @@ class POCController:
             return
         payload = self._public_payload(entry)
         job.transcripts.append(payload)
-        await job.queue.put({"type": "transcript", "action": "update", "payload": payload})
+        job.events.publish({"type": "transcript", "action": "update", "payload": payload})
+        self._track_agenda(job, payload)
+        if job.live_classifier is not None:
+            job.live_classifier.add(payload)
 
     async def _finalize_pending_results(self, job: PocJob) -> None:
         for result_id in list(job.pending_results.keys()):
@@ -392,40 +828,66 @@ class POCController:
         }
 
     def _sentence_segments(self, job: PocJob) -> list[dict[str, Any]]:
-        return _sentence_segments_from_transcripts(job.transcripts)
+        return sentence_segments_from_transcripts(job.transcripts)
 
-    def _persist_transcripts(self, job: PocJob) -> None:
+    async def _persist_transcripts(self, job: PocJob) -> None:
         try:
             archive_name = self._suggest_archive_slug(job)
+            job.completed_at = job.completed_at or now_iso()
             payload = {
                 "job_id": job.job_id,
                 "agenda_text": job.agenda_text,
-                "completed_at": now_iso(),
+                "audio_filename": job.audio_filename,
+                "created_at": job.created_at,
+                "completed_at": job.completed_at,
                 "transcripts": job.transcripts,
+                "classified_segments": job.classified_segments,
                 "archive_name": archive_name,
             }
             key = self._build_archive_key(job.job_id, archive_name)
-            self.archive_storage.write_json(key, payload)
+            await self.archive_storage.write_bytes(key, encode_archive(payload), ARCHIVE_CONTENT_TYPE)
+            previous_key, job.archive_key = job.archive_key, key
+            await self.history_index.record(ArchiveHistoryIndex.entry_for(key, payload))
+            if previous_key and previous_key != key:
+                # a rehydrated legacy archive has been rewritten in the compact format
+                await self.archive_storage.delete(previous_key)
         except Exception:
             self.logger.exception("Failed to archive transcripts for job %s", job.job_id)
+            return
+        if self.settings.poc_vector_index and VectorIndex.available():
+            self._spawn(self.index_archived_job(payload))
+        try:
+            # re-archiving (e.g. after classification) replaces the job's documents, so categories stay current
+            await asyncio.to_thread(self.text_index.index_job, payload)
+        except Exception:
+            self.logger.exception("Failed to update the search index for job %s", job.job_id)
+
+    async def _load_archived_job(self, key: str) -> dict[str, Any]:
+        raw = await self.archive_storage.read_bytes(key)
+        return self._decode_archive(key, raw)
+
+    @staticmethod
+    def _decode_archive(key: str, raw: bytes) -> dict[str, Any]:
+        # legacy pretty-printed archives and compressed v2 archives are told apart by content
+        return decode_archive(raw)
 
-    def _load_archived_job(self, key: str) -> dict[str, Any]:
-        raw = self.archive_storage.read_text(key)
-        return json.loads(raw)
+    async def _archive_key(self, job_id: str) -> str:
+        return await self.history_index.lookup(job_id) or f"poc/{job_id}{ARCHIVE_SUFFIX}"
 
-    def _archive_key(self, job_id: str) -> str:
-        suffix = f"{job_id}.json"
-        for key in self.archive_storage.list_objects("poc/"):
-            if key.endswith(suffix):
-                return key
-        return f"poc/{job_id}.json"
+    async def _load_job_archive(self, job_id: str) -> dict[str, Any]:
+        try:
+            return await self._load_archived_job(await self._archive_key(job_id))
+        except FileNotFoundError:
+            # the cached key may predate a migration that rewrote the archive
+            self.history_index.invalidate()
+            return await self._load_archived_job(await self._archive_key(job_id))
 
     def _build_archive_key(self, job_id: str, archive_name: str | None) -> str:
         slug = archive_name or ""
         if slug:
             slug = slug[:40]
-            return f"poc/{slug}-{job_id}.json"
-        return f"poc/{job_id}.json"
+            return f"poc/{slug}-{job_id}{ARCHIVE_SUFFIX}"
+        return f"poc/{job_id}{ARCHIVE_SUFFIX}"
 
     def _suggest_archive_slug(self, job: PocJob) -> str:
         source = job.agenda_text or ""
@@ -444,39 +906,40 @@ class POCController:
         return cleaned[:40]
 
 
-SENTENCE_RE = re.compile(r"[^。！？!?]+[。！？!?]?")
-
-
-def _split_sentences(text: str) -> list[str]:
-    if not text:
-        return []
-    matches = SENTENCE_RE.findall(text)
-    sentences = [match.strip() for match in matches if match.strip()]
-    if not sentences and text.strip():
-        sentences = [text.strip()]
-    return sentences
-
-
-def _sentence_segments_from_transcripts(transcripts: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    segments: list[dict[str, Any]] = []
-    idx = 1
-    for transcript in transcripts:
-        speaker = transcript.get("speaker", "")
-        sentences = _split_sentences(transcript.get("text", ""))
-        for sentence in sentences:
-            segments.append(
-                {
-                    "index": idx,
-                    "speaker": speaker,
-                    "text": sentence,
-                    "context_before": "",
-                    "context_after": "",
-                }
-            )
-            idx += 1
-    for i, segment in enumerate(segments):
-        if i > 0:
-            segment["context_before"] = segments[i - 1]["text"]
-        if i + 1 < len(segments):
-            segment["context_after"] = segments[i + 1]["text"]
-    return segments
+def _apply_remote_event(job: PocJob, message: dict[str, Any]) -> None:
+    kind = message.get("type")
+    if kind == "transcript":
+        payload = message.get("payload") or {}
+        for idx in range(len(job.transcripts) - 1, -1, -1):
+            if job.transcripts[idx].get("index") == payload.get("index"):
+                job.transcripts[idx] = payload
+                break
+        else:
+            job.transcripts.append(payload)
+    elif kind == "classification":
+        payload = message.get("payload") or []
+        if message.get("action") == "delta":
+            job.classified_segments = merge_classified(job.classified_segments, payload)
+        else:
+            job.classified_segments = payload
+    elif kind == "agenda":
+        payload = message.get("payload") or {}
+        job.agenda_state = {key: value for key, value in payload.items() if key != "sentences"}
+    elif kind == "status":
+        job.status = message.get("status") or job.status
+    elif kind == "complete":
+        job.status = "completed"
+
+
+def _job_memory(job: PocJob) -> int:
+    return deep_sizeof(
+        (
+            job.transcripts,
+            job.pending_results,
+            job.processed_result_ids,
+            job.classified_segments,
+            job.agenda_timeline,
+            job.speaker_labels,
+            job.events.backlog,
+        )
+    )
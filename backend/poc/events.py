@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Any
+
+SLOW_CONSUMER_POLICIES = ("drop_oldest", "coalesce", "disconnect")
+
+
+class SlowConsumerError(RuntimeError):
+    """Raised to a subscriber that was cut off by the ``disconnect`` policy."""
+
+
+def _coalesce_key(message: dict[str, Any]) -> tuple[str, str] | None:
+    if message.get("type") != "transcript":
+        return None
+    payload = message.get("payload") or {}
+    key = payload.get("result_id") or payload.get("index")
+    return ("transcript", str(key)) if key is not None else None
+
+
+class Subscription:
+    """Bounded per-viewer buffer fed by a :class:`JobEventHub`.
+
+    When the buffer is full, ``drop_oldest`` and ``coalesce`` only drop transcript updates
+    that a newer queued event for the same result supersedes. If nothing can be dropped
+    that way, the buffer is replaced by a single ``resync`` marker whose ``seq`` is the last
+    event the viewer can have seen, and the subscription ends; the viewer reconnects with
+    ``?since=<seq>`` and replays the rest from the hub's log (or gets a snapshot).
+    """
+
+    def __init__(self, buffer_size: int, policy: str):
+        self.buffer_size = max(1, buffer_size)
+        self.policy = policy
+        self.dropped = 0
+        self.closed = False
+        self._buffer: deque[dict[str, Any]] = deque()
+        self._ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def offer(self, message: dict[str, Any]) -> None:
+        if self.closed:
+            return
+        if self.policy == "coalesce" and self._merge(message):
+            return
+        if len(self._buffer) >= self.buffer_size:
+            if self.policy == "disconnect":
+                self.dropped += len(self._buffer) + 1
+                self._buffer.clear()
+                self.closed = True
+                self._ready.set()
+                return
+            if self.policy != "coalesce" and self._merge(message):
+                self.dropped += 1
+                return
+            if not self._drop_superseded():
+                self._resync(message)
+                return
+            self.dropped += 1
+        self._buffer.append(message)
+        self._ready.set()
+
+    async def get(self) -> dict[str, Any]:
+        while not self._buffer:
+            if self.closed:
+                raise SlowConsumerError("subscriber fell too far behind")
+            self._ready.clear()
+            await self._ready.wait()
+        return self._buffer.popleft()
+
+    def _drop_superseded(self) -> bool:
+        """Drop the oldest queued transcript update that a later queued event replaces."""
+        later: set[tuple[str, str]] = set()
+        superseded = None
+        for idx in range(len(self._buffer) - 1, -1, -1):
+            queued = self._buffer[idx]
+            key = _coalesce_key(queued)
+            if key is None:
+                continue
+            if key in later and queued.get("action") == "update":
+                superseded = idx
+            later.add(key)
+        if superseded is None:
+            return False
+        del self._buffer[superseded]
+        return True
+
+    def _resync(self, message: dict[str, Any]) -> None:
+        pending = [*self._buffer, message]
+        since = min(queued.get("seq", 0) for queued in pending) - 1
+        self.dropped += len(pending)
+        self._buffer.clear()
+        self._buffer.append({"type": "resync", "seq": max(0, since)})
+        self.closed = True
+        self._ready.set()
+
+    def _merge(self, message: dict[str, Any]) -> bool:
+        key = _coalesce_key(message)
+        if key is None:
+            return False
+        for idx in range(len(self._buffer) - 1, -1, -1):
+            queued = self._buffer[idx]
+            if _coalesce_key(queued) != key:
+                continue
+            # keep the queued action so an unseen "append" is not downgraded to "update"
+            self._buffer[idx] = {**message, "action": queued.get("action", message.get("action"))}
+            return True
+        return False
+
+
+class JobEventHub:
+    """Fans job events out to every subscriber without letting them compete for messages.
+
+    Every published event is stamped with a monotonically increasing ``seq`` and kept
+    in a bounded log so reconnecting clients can resume from their last seen event.
+    """
+
+    def __init__(self, buffer_size: int = 256, policy: str = "drop_oldest", log_size: int = 1024):
+        if policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow consumer policy: {policy}")
+        self.buffer_size = buffer_size
+        self.policy = policy
+        self.last_seq = 0
+        self._log: deque[dict[str, Any]] = deque(maxlen=max(1, log_size))
+        self._subscribers: set[Subscription] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def backlog(self) -> tuple[dict[str, Any], ...]:
+        return tuple(self._log)
+
+    def events_since(self, since: int) -> list[dict[str, Any]] | None:
+        """Return the events after ``since``, or ``None`` when the log no longer covers the gap."""
+        if since > self.last_seq or since < 0:
+            return None
+        if since == self.last_seq:
+            return []
+        if not self._log or self._log[0]["seq"] > since + 1:
+            return None
+        return [message for message in self._log if message["seq"] > since]
+
+    def subscribe(
+        self,
+        since: int | None = None,
+        buffer_size: int | None = None,
+        policy: str | None = None,
+    ) -> tuple[Subscription, list[dict[str, Any]] | None]:
+        """Register a subscriber and return the events it missed since ``since``.
+
+        The missed list is ``None`` when the caller has to fall back to a snapshot.
+        ``buffer_size`` and ``policy`` override the hub defaults for internal consumers.
+        """
+        subscription = Subscription(buffer_size or self.buffer_size, policy or self.policy)
+        self._subscribers.add(subscription)
+        missed = self.events_since(since) if since is not None else None
+        return subscription, missed
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def publish(self, message: dict[str, Any], seq: int | None = None) -> None:
+        """Stamp and fan out ``message``; ``seq`` is given when relaying another worker's event."""
+        self.last_seq = self.last_seq + 1 if seq is None else max(seq, self.last_seq + 1)
+        message = {**message, "seq": self.last_seq}
+        self._log.append(message)
+        for subscription in list(self._subscribers):
+            subscription.offer(message)
+            if subscription.closed:
+                self._subscribers.discard(subscription)
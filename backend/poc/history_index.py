@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import time
+from typing import Any, Callable
+
+from .archive_format import ARCHIVE_SUFFIX, is_archive_key
+
+ARCHIVE_PREFIX = "poc/"
+MANIFEST_KEY = "poc-index/manifest.json"
+# one small object per recorded job; merged over the manifest on read and folded into it by rebuild()
+ENTRY_PREFIX = "poc-index/jobs/"
+MANIFEST_VERSION = 1
+PREVIEW_CHARS = 80
+
+
+def encode_cursor(entry: dict[str, Any]) -> str:
+    raw = json.dumps([entry.get("completed_at") or "", entry["job_id"]], ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    try:
+        completed_at, job_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("cursor が不正です") from exc
+    return str(completed_at), str(job_id)
+
+
+def _sort_key(entry: dict[str, Any]) -> tuple[str, str]:
+    return entry.get("completed_at") or "", entry["job_id"]
+
+
+class ArchiveHistoryIndex:
+    """Compact manifest of archived PoC jobs stored next to the archives themselves.
+
+    Holds only what the history list needs (key, completed_at, preview, counts), so listing
+    and job_id → key lookups never download or parse the archives. It is bootstrapped once
+    from the ``poc/`` prefix when the manifest does not exist yet. ``storage`` is an
+    :class:`~services.s3_storage.AsyncS3Storage`, so no call blocks the event loop.
+
+    Workers never rewrite the shared manifest to add a job: :meth:`record` writes one object
+    per job under ``entry_prefix``, so concurrent writers cannot drop each other's entries.
+    Reads merge those objects over the manifest, and :meth:`rebuild` folds them back into it.
+    """
+
+    def __init__(
+        self,
+        storage: Any,
+        load_archive: Callable[[str, bytes], dict[str, Any]],
+        manifest_key: str = MANIFEST_KEY,
+        max_age: float | None = None,
+        entry_prefix: str = ENTRY_PREFIX,
+    ):
+        self.storage = storage
+        self.load_archive = load_archive
+        self.manifest_key = manifest_key
+        self.entry_prefix = entry_prefix
+        # cached entries are re-read after ``max_age`` seconds, picking up other workers' jobs
+        # and keys rewritten by scripts/migrate_poc_archives.py
+        self.max_age = max_age
+        self.logger = logging.getLogger(__name__)
+        self._entries: dict[str, dict[str, Any]] | None = None
+        self._ordered: list[dict[str, Any]] | None = None
+        self._loaded_at = 0.0
+
+    @staticmethod
+    def entry_for(key: str, data: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "job_id": data.get("job_id"),
+            "key": key,
+            "completed_at": data.get("completed_at"),
+            "archive_name": data.get("archive_name") or "",
+            "agenda_preview": (data.get("agenda_text") or "")[:PREVIEW_CHARS],
+            "transcript_count": len(data.get("transcripts") or []),
+            "classified_count": len(data.get("classified_segments") or []),
+        }
+
+    async def record(self, entry: dict[str, Any]) -> None:
+        await self.storage.write_json(self._entry_key(entry["job_id"]), entry)
+        if self._entries is not None:
+            self._entries[entry["job_id"]] = entry
+            self._ordered = None
+
+    def invalidate(self) -> None:
+        """Drop the cached entries so the next call re-reads them from storage."""
+        self._entries = None
+        self._ordered = None
+
+    async def lookup(self, job_id: str) -> str | None:
+        entry = (await self._load()).get(job_id)
+        return entry["key"] if entry else None
+
+    async def page(self, limit: int = 20, cursor: str | None = None) -> tuple[list[dict[str, Any]], str | None]:
+        ordered = await self._ordered_entries()
+        start = 0
+        if cursor:
+            boundary = decode_cursor(cursor)
+            start = next((idx for idx, entry in enumerate(ordered) if _sort_key(entry) < boundary), len(ordered))
+        items = ordered[start : start + limit]
+        has_more = start + limit < len(ordered)
+        return [dict(item) for item in items], (encode_cursor(items[-1]) if items and has_more else None)
+
+    async def rebuild(self) -> None:
+        # fold the per-job entries in (the archive scan wins for the same job); entries
+        # recorded after this listing stay as separate objects
+        recorded_keys = await self.storage.list_objects(self.entry_prefix)
+        entries = await self._recorded_entries(recorded_keys)
+        keys = [key for key in await self.storage.list_objects(ARCHIVE_PREFIX) if is_archive_key(key)]
+        # compressed archives sort last so they win over a leftover legacy copy of the same job
+        keys.sort(key=lambda key: key.endswith(ARCHIVE_SUFFIX))
+        objects = await self.storage.read_many(keys)
+        for key in keys:
+            if key not in objects:
+                continue
+            try:
+                data = self.load_archive(key, objects[key])
+            except (ValueError, OSError):
+                continue
+            if data.get("job_id"):
+                entries[data["job_id"]] = self.entry_for(key, data)
+        self._entries = entries
+        self._ordered = None
+        await self._save()
+        for key in recorded_keys:
+            await self.storage.delete(key)
+        self.logger.info("Rebuilt PoC history index with %s entries", len(entries))
+
+    async def _load(self) -> dict[str, dict[str, Any]]:
+        if self._entries is not None and self.max_age is not None and time.monotonic() - self._loaded_at > self.max_age:
+            self._entries = None
+        if self._entries is None:
+            try:
+                manifest = json.loads(await self.storage.read_text(self.manifest_key))
+                entries = {entry["job_id"]: entry for entry in manifest.get("entries", [])}
+            except (FileNotFoundError, json.JSONDecodeError, KeyError):
+                await self.rebuild()
+            else:
+                entries.update(await self._recorded_entries(await self.storage.list_objects(self.entry_prefix)))
+                self._entries = entries
+            self._ordered = None
+            self._loaded_at = time.monotonic()
+        return self._entries
+
+    async def _ordered_entries(self) -> list[dict[str, Any]]:
+        if self._ordered is None:
+            self._ordered = sorted((await self._load()).values(), key=_sort_key, reverse=True)
+        return self._ordered
+
+    async def _recorded_entries(self, keys: list[str]) -> dict[str, dict[str, Any]]:
+        entries: dict[str, dict[str, Any]] = {}
+        for raw in (await self.storage.read_many(keys)).values():
+            try:
+                entry = json.loads(raw)
+            except json.JSONDecodeError:
+                continue
+            if entry.get("job_id"):
+                entries[entry["job_id"]] = entry
+        return entries
+
+    def _entry_key(self, job_id: str) -> str:
+        return f"{self.entry_prefix}{job_id}.json"
+
+    async def _save(self) -> None:
+        await self.storage.write_json(
+            self.manifest_key,
+            {"version": MANIFEST_VERSION, "entries": list((self._entries or {}).values())},
+        )
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+try:  # optional: only needed for POC_JOB_BUS=redis
+    import redis.asyncio as redis_asyncio
+except ImportError:  # pragma: no cover - depends on the environment
+    redis_asyncio = None
+
+JOB_BUS_BACKENDS = ("local", "sqlite", "redis")
+STATE_TTL_SECONDS = 24 * 60 * 60
+POLL_SECONDS = 0.1
+
+
+class LocalJobBus:
+    """Single-process bus: every job lives in this worker, so nothing is shared."""
+
+    name = "local"
+    shared = False
+
+    async def put_state(self, job_id: str, state: dict[str, Any]) -> None:
+        return None
+
+    async def get_state(self, job_id: str) -> dict[str, Any] | None:
+        return None
+
+    async def append(self, job_id: str, message: dict[str, Any]) -> None:
+        return None
+
+    async def read(self, job_id: str, after_seq: int, timeout: float) -> list[dict[str, Any]]:
+        return []
+
+    async def send_to_owner(self, owner: str, job_id: str, message: dict[str, Any]) -> None:
+        return None
+
+    async def read_inbox(self, owner: str, timeout: float) -> list[tuple[str, dict[str, Any]]]:
+        await asyncio.sleep(timeout)
+        return []
+
+    async def close(self) -> None:
+        return None
+
+
+class SqliteJobBus:
+    """Job registry and event log shared by the workers of one host through a SQLite (WAL) file.
+
+    Readers poll, which keeps the implementation dependency-free; ``POLL_SECONDS`` bounds the
+    extra latency a viewer on a non-owner worker sees.
+    """
+
+    name = "sqlite"
+    shared = True
+
+    def __init__(self, db_path: Path, log_size: int = 1024, poll_seconds: float = POLL_SECONDS):
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.log_size = max(1, log_size)
+        self.poll_seconds = poll_seconds
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS poc_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS poc_events (
+                    job_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    message TEXT NOT NULL,
+                    PRIMARY KEY (job_id, seq)
+                );
+                CREATE TABLE IF NOT EXISTS poc_inbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    owner TEXT NOT NULL,
+                    job_id TEXT NOT NULL,
+                    message TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_poc_inbox_owner ON poc_inbox (owner, id);
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    async def put_state(self, job_id: str, state: dict[str, Any]) -> None:
+        await asyncio.to_thread(self._put_state, job_id, state)
+
+    async def get_state(self, job_id: str) -> dict[str, Any] | None:
+        return await asyncio.to_thread(self._get_state, job_id)
+
+    async def append(self, job_id: str, message: dict[str, Any]) -> None:
+        await asyncio.to_thread(self._append, job_id, message)
+
+    async def read(self, job_id: str, after_seq: int, timeout: float) -> list[dict[str, Any]]:
+        deadline = time.monotonic() + timeout
+        while True:
+            messages = await asyncio.to_thread(self._read, job_id, after_seq)
+            if messages or time.monotonic() >= deadline:
+                return messages
+            await asyncio.sleep(self.poll_seconds)
+
+    async def send_to_owner(self, owner: str, job_id: str, message: dict[str, Any]) -> None:
+        await asyncio.to_thread(self._send_to_owner, owner, job_id, message)
+
+    async def read_inbox(self, owner: str, timeout: float) -> list[tuple[str, dict[str, Any]]]:
+        deadline = time.monotonic() + timeout
+        while True:
+            items = await asyncio.to_thread(self._take_inbox, owner)
+            if items or time.monotonic() >= deadline:
+                return items
+            await asyncio.sleep(self.poll_seconds)
+
+    async def close(self) -> None:
+        return None
+
+    def _put_state(self, job_id: str, state: dict[str, Any]) -> None:
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT INTO poc_jobs (job_id, state, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(job_id) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at",
+                (job_id, json.dumps(state, ensure_ascii=False), now),
+            )
+            conn.execute(
+                "DELETE FROM poc_events WHERE job_id = ? AND seq <= ?",
+                (job_id, int(state.get("seq", 0)) - self.log_size),
+            )
+            expired = [row[0] for row in conn.execute("SELECT job_id FROM poc_jobs WHERE updated_at < ?", (now - STATE_TTL_SECONDS,))]
+            for expired_id in expired:
+                conn.execute("DELETE FROM poc_jobs WHERE job_id = ?", (expired_id,))
+                conn.execute("DELETE FROM poc_events WHERE job_id = ?", (expired_id,))
+
+    def _get_state(self, job_id: str) -> dict[str, Any] | None:
+        row = self._connect().execute("SELECT state FROM poc_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _append(self, job_id: str, message: dict[str, Any]) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO poc_events (job_id, seq, message) VALUES (?, ?, ?)",
+                (job_id, message["seq"], json.dumps(message, ensure_ascii=False)),
+            )
+
+    def _read(self, job_id: str, after_seq: int) -> list[dict[str, Any]]:
+        rows = self._connect().execute(
+            "SELECT message FROM poc_events WHERE job_id = ? AND seq > ? ORDER BY seq", (job_id, after_seq)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def _send_to_owner(self, owner: str, job_id: str, message: dict[str, Any]) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT INTO poc_inbox (owner, job_id, message) VALUES (?, ?, ?)",
+                (owner, job_id, json.dumps(message, ensure_ascii=False)),
+            )
+
+    def _take_inbox(self, owner: str) -> list[tuple[str, dict[str, Any]]]:
+        conn = self._connect()
+        with conn:
+            rows = conn.execute("SELECT id, job_id, message FROM poc_inbox WHERE owner = ? ORDER BY id", (owner,)).fetchall()
+            if rows:
+                conn.execute("DELETE FROM poc_inbox WHERE owner = ? AND id <= ?", (owner, rows[-1][0]))
+        return [(job_id, json.loads(message)) for _, job_id, message in rows]
+
+
+class RedisJobBus:
+    """Job registry and event log in Redis, for workers spread over several hosts.
+
+    Events go to one stream per job whose entry IDs are ``0-<seq>``, so a reader can resume
+    from any seq with a blocking ``XREAD``; the owner's inbox is a plain list.
+    """
+
+    name = "redis"
+    shared = True
+
+    def __init__(self, url: str, log_size: int = 1024):
+        if redis_asyncio is None:
+            raise RuntimeError("POC_JOB_BUS=redis requires the redis package")
+        self.client = redis_asyncio.from_url(url or "redis://localhost:6379/0")
+        self.log_size = max(1, log_size)
+
+    async def put_state(self, job_id: str, state: dict[str, Any]) -> None:
+        await self.client.set(f"poc:job:{job_id}", json.dumps(state, ensure_ascii=False), ex=STATE_TTL_SECONDS)
+
+    async def get_state(self, job_id: str) -> dict[str, Any] | None:
+        raw = await self.client.get(f"poc:job:{job_id}")
+        return json.loads(raw) if raw else None
+
+    async def append(self, job_id: str, message: dict[str, Any]) -> None:
+        key = f"poc:events:{job_id}"
+        await self.client.xadd(
+            key,
+            {"m": json.dumps(message, ensure_ascii=False)},
+            id=f"0-{message['seq']}",
+            maxlen=self.log_size,
+            approximate=True,
+        )
+        await self.client.expire(key, STATE_TTL_SECONDS)
+
+    async def read(self, job_id: str, after_seq: int, timeout: float) -> list[dict[str, Any]]:
+        response = await self.client.xread({f"poc:events:{job_id}": f"0-{after_seq}"}, block=max(1, int(timeout * 1000)))
+        return [json.loads(fields[b"m"]) for _, entries in response or [] for _, fields in entries]
+
+    async def send_to_owner(self, owner: str, job_id: str, message: dict[str, Any]) -> None:
+        await self.client.rpush(f"poc:inbox:{owner}", json.dumps([job_id, message], ensure_ascii=False))
+
+    async def read_inbox(self, owner: str, timeout: float) -> list[tuple[str, dict[str, Any]]]:
+        item = await self.client.blpop([f"poc:inbox:{owner}"], timeout=timeout)
+        if not item:
+            return []
+        job_id, message = json.loads(item[1])
+        return [(job_id, message)]
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def create_job_bus(backend: str, url: str = "", log_size: int = 1024) -> LocalJobBus | SqliteJobBus | RedisJobBus:
+    if backend not in JOB_BUS_BACKENDS:
+        raise ValueError(f"Unknown job bus backend: {backend}")
+    if backend == "sqlite":
+        path = Path(url) if url else Path(__file__).resolve().parents[1] / "data" / "poc_bus.db"
+        return SqliteJobBus(path, log_size=log_size)
+    if backend == "redis":
+        return RedisJobBus(url, log_size=log_size)
+    return LocalJobBus()
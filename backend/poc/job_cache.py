@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Generic, Iterator, TypeVar
+
+JobT = TypeVar("JobT")
+
+
+def deep_sizeof(obj: Any, _seen: set[int] | None = None) -> int:
+    """Approximate memory held by ``obj`` and the containers/strings it references."""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+class JobCache(Generic[JobT]):
+    """Resident jobs keyed by job_id, with LRU/TTL eviction of jobs that can be reloaded.
+
+    Only jobs accepted by ``evictable`` (completed and archived) are ever evicted; jobs that
+    are still queued or streaming stay resident regardless of size or age. A miss falls back
+    to the async ``loader``, which rehydrates the job from its archive.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], Awaitable[JobT | None]],
+        evictable: Callable[[JobT], bool],
+        size_of: Callable[[JobT], int],
+        max_resident: int = 32,
+        ttl_seconds: float = 900,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.loader = loader
+        self.evictable = evictable
+        self.size_of = size_of
+        self.max_resident = max(1, max_resident)
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._jobs: OrderedDict[str, JobT] = OrderedDict()
+        self._last_access: dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.rehydrated = 0
+        self.evicted = 0
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._jobs
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def __iter__(self) -> Iterator[JobT]:
+        return iter(list(self._jobs.values()))
+
+    def __setitem__(self, job_id: str, job: JobT) -> None:
+        self.put(job_id, job)
+
+    def put(self, job_id: str, job: JobT) -> None:
+        self._jobs[job_id] = job
+        self._touch(job_id)
+        self.sweep()
+
+    def peek(self, job_id: str) -> JobT | None:
+        """Resident job without touching it or falling back to the loader."""
+        return self._jobs.get(job_id)
+
+    async def get(self, job_id: str) -> JobT | None:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            self.hits += 1
+            self._touch(job_id)
+            self.sweep()
+            return job
+        self.misses += 1
+        self.sweep()
+        job = await self.loader(job_id)
+        if job_id in self._jobs:
+            # another request rehydrated it while we were waiting on storage
+            return self._jobs[job_id]
+        if job is not None:
+            self.rehydrated += 1
+            self.put(job_id, job)
+        return job
+
+    def discard(self, job_id: str) -> None:
+        """Forget a job without counting it as an eviction (e.g. a stale mirror of a remote job)."""
+        self._jobs.pop(job_id, None)
+        self._last_access.pop(job_id, None)
+
+    def sweep(self) -> None:
+        now = self._clock()
+        for job_id, job in list(self._jobs.items()):
+            if now - self._last_access[job_id] > self.ttl_seconds and self.evictable(job):
+                self._evict(job_id)
+        # OrderedDict keeps least recently used first
+        for job_id, job in list(self._jobs.items()):
+            if len(self._jobs) <= self.max_resident:
+                break
+            if self.evictable(job):
+                self._evict(job_id)
+
+    def stats(self) -> dict[str, Any]:
+        self.sweep()
+        by_status: dict[str, int] = {}
+        total_bytes = 0
+        for job in self._jobs.values():
+            status = getattr(job, "status", "unknown")
+            by_status[status] = by_status.get(status, 0) + 1
+            total_bytes += self.size_of(job)
+        return {
+            "resident": len(self._jobs),
+            "max_resident": self.max_resident,
+            "ttl_seconds": self.ttl_seconds,
+            "by_status": by_status,
+            "approx_bytes": total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "rehydrated": self.rehydrated,
+            "evicted": self.evicted,
+        }
+
+    def _touch(self, job_id: str) -> None:
+        self._jobs.move_to_end(job_id)
+        self._last_access[job_id] = self._clock()
+
+    def _evict(self, job_id: str) -> None:
+        self._jobs.pop(job_id, None)
+        self._last_access.pop(job_id, None)
+        self.evicted += 1
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from .sentences import link_context, sentence_segments
+
+Classify = Callable[[list[dict[str, Any]], str], Awaitable[list[dict[str, Any]]]]
+
+
+class LiveClassifier:
+    """Classifies a job's sentences while it streams, in micro-batches.
+
+    Finalized transcript rows are split into sentences (numbered exactly like
+    :func:`~poc.sentences.sentence_segments_from_transcripts`) and queued. A batch is sent
+    once ``batch_size`` sentences are waiting or the oldest has waited ``max_delay`` seconds,
+    together with up to ``context`` earlier sentences so the model sees the conversation
+    leading into it. Only one batch per job is in flight, so deltas arrive in order.
+    """
+
+    def __init__(
+        self,
+        classify: Classify,
+        agenda_text: str,
+        on_delta: Callable[[list[dict[str, Any]]], None],
+        batch_size: int = 8,
+        max_delay: float = 3.0,
+        context: int = 2,
+    ):
+        self.classify = classify
+        self.agenda_text = agenda_text
+        self.on_delta = on_delta
+        self.batch_size = max(1, batch_size)
+        self.max_delay = max_delay
+        self.context = max(0, context)
+        self.logger = logging.getLogger(__name__)
+        self.batches = 0
+        self.failed_batches = 0
+        self._sentences: list[dict[str, Any]] = []
+        self._next_pending = 0
+        self._oldest_pending_at: float | None = None
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        self._task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._sentences) - self._next_pending
+
+    def add(self, transcript: dict[str, Any]) -> None:
+        segments = sentence_segments(transcript, len(self._sentences) + 1)
+        if not segments or self._closing:
+            return
+        self._sentences.extend(segments)
+        if self._oldest_pending_at is None:
+            self._oldest_pending_at = time.monotonic()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        self._wakeup.set()
+
+    async def close(self) -> None:
+        """Classify whatever is still queued and wait for it."""
+        self._closing = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+
+    def cancel(self) -> None:
+        self._closing = True
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _run(self) -> None:
+        while True:
+            if not self.pending:
+                if self._closing:
+                    return
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            if not self._closing and self.pending < self.batch_size:
+                remaining = (self._oldest_pending_at or time.monotonic()) + self.max_delay - time.monotonic()
+                if remaining > 0:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+            await self._classify_next_batch()
+
+    async def _classify_next_batch(self) -> None:
+        start = self._next_pending
+        end = min(len(self._sentences), start + self.batch_size)
+        self._next_pending = end
+        self._oldest_pending_at = time.monotonic() if self.pending else None
+        # copies, so context links do not leak into the sentence log
+        window = [dict(segment) for segment in self._sentences[max(0, start - self.context) : end]]
+        wanted = {segment["index"] for segment in self._sentences[start:end]}
+        self.batches += 1
+        try:
+            classified = await self.classify(link_context(window), self.agenda_text)
+        except Exception:
+            self.logger.exception("Live classification batch failed")
+            classified = []
+        delta = [item for item in classified if item.get("index") in wanted]
+        if not delta:
+            self.failed_batches += 1
+            return
+        self.on_delta(delta)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+# Transcribe streaming recommends audio events between 50 and 200 ms long.
+MIN_CHUNK_MS = 50
+MAX_CHUNK_MS = 200
+# A send that blocks longer than this is treated as flow-control pushback from Transcribe.
+PUSHBACK_SECONDS = 0.05
+
+
+@dataclass(frozen=True)
+class PacingPolicy:
+    """How fast uploaded audio is fed to Transcribe: ``realtime``, a multiplier such as ``4x``, or ``max``."""
+
+    mode: str = "realtime"
+    speed: float = 1.0
+
+    @classmethod
+    def parse(cls, value: str | None) -> PacingPolicy:
+        text = (value or "realtime").strip().lower()
+        if text in ("realtime", "1x"):
+            return cls()
+        if text == "max":
+            return cls(mode="max", speed=0.0)
+        if text.endswith("x"):
+            try:
+                speed = float(text[:-1])
+            except ValueError:
+                speed = 0.0
+            if speed > 0:
+                return cls(mode="multiplier", speed=speed)
+        raise ValueError(f"pacing は realtime / <倍率>x / max のいずれかを指定してください: {value}")
+
+    def __str__(self) -> str:
+        if self.mode == "multiplier":
+            return f"{self.speed:g}x"
+        return self.mode
+
+
+class AudioPacer:
+    """Decides the next chunk size and how long to wait after each audio event.
+
+    Paced modes sleep until the wall clock catches up with ``audio_sent / speed``, so time
+    spent blocked in ``send_audio_event`` is not slept again. ``max`` mode never sleeps on a
+    schedule: it grows chunks while sends are fast and halves them, then backs off for as
+    long as the send blocked, when Transcribe applies flow control.
+    """
+
+    def __init__(
+        self,
+        policy: PacingPolicy,
+        sample_rate: int,
+        sample_width: int = 2,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], object] = asyncio.sleep,
+    ):
+        self.policy = policy
+        self.bytes_per_second = sample_rate * sample_width
+        self.chunk_ms = MIN_CHUNK_MS if policy.mode != "max" else MAX_CHUNK_MS // 2
+        self.audio_seconds = 0.0
+        self.pushbacks = 0
+        self._clock = clock
+        self._sleep = sleep
+        self._started: float | None = None
+        self._frame = sample_width
+
+    def chunk_bytes(self) -> int:
+        size = int(self.bytes_per_second * self.chunk_ms / 1000)
+        return max(self._frame, size - size % self._frame)
+
+    def start(self) -> None:
+        self._started = self._clock()
+
+    @property
+    def elapsed(self) -> float:
+        return self._clock() - self._started if self._started is not None else 0.0
+
+    async def after_send(self, chunk_len: int, send_seconds: float) -> None:
+        if self._started is None:
+            self.start()
+        self.audio_seconds += chunk_len / self.bytes_per_second
+        if self.policy.mode == "max":
+            if send_seconds > PUSHBACK_SECONDS:
+                self.pushbacks += 1
+                self.chunk_ms = max(MIN_CHUNK_MS, self.chunk_ms // 2)
+                await self._sleep(send_seconds)
+            else:
+                self.chunk_ms = min(MAX_CHUNK_MS, self.chunk_ms + MIN_CHUNK_MS // 2)
+            return
+        delay = self.audio_seconds / self.policy.speed - self.elapsed
+        if delay > 0:
+            await self._sleep(delay)
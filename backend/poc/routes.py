@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, File, HTTPException, UploadFile, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, File, Form, HTTPException, Query, UploadFile, WebSocket, WebSocketDisconnect
 
+from .audio import AudioTooLargeError
 from .controller import POCController
+from .events import SlowConsumerError
+from .scheduler import QueueFullError
 
 router = APIRouter()
 controller = POCController()
@@ -12,21 +15,42 @@ controller = POCController()
 async def start_poc_run(
     agenda: UploadFile | None = File(None),
     audio: UploadFile | None = File(None),
+    pacing: str | None = Form(None),
+    priority: int = Form(0),
+    live_classification: bool | None = Form(None),
 ):
     if audio is None:
         raise HTTPException(status_code=400, detail="音声ファイルを指定してください")
 
     agenda_bytes = await agenda.read() if agenda else b""
-    audio_bytes = await audio.read()
     agenda_text = agenda_bytes.decode("utf-8", errors="ignore")
-    job_id = await controller.start_transcription(agenda_text=agenda_text, audio_filename=audio.filename or "audio", audio_bytes=audio_bytes)
+    try:
+        job_id = await controller.start_transcription(
+            agenda_text=agenda_text,
+            audio_filename=audio.filename or "audio",
+            audio=audio,
+            pacing=pacing,
+            priority=priority,
+            live_classification=live_classification,
+        )
+    except QueueFullError as exc:
+        raise HTTPException(status_code=429, detail=str(exc), headers={"Retry-After": str(exc.retry_after)}) from exc
+    except AudioTooLargeError as exc:
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     return {"job_id": job_id}
 
 
+@router.get("/stats")
+async def get_poc_stats():
+    return controller.stats()
+
+
 @router.get("/jobs/{job_id}")
 async def get_poc_job(job_id: str):
     try:
-        return controller.get_job_payload(job_id)
+        return await controller.get_job_payload(job_id)
     except KeyError as exc:
         raise HTTPException(status_code=404, detail="ジョブが見つかりません") from exc
 
@@ -55,14 +79,41 @@ async def classify_poc_job(job_id: str, refresh: bool = False):
 
 
 @router.get("/history")
-async def list_poc_history():
-    return controller.list_archived_jobs()
+async def list_poc_history(limit: int = Query(20, ge=1, le=100), cursor: str | None = None):
+    try:
+        return await controller.list_archived_jobs(limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.get("/search")
+async def search_poc_history(q: str = Query(..., min_length=1), limit: int = Query(10, ge=1, le=50)):
+    try:
+        return await controller.search_archived_jobs(q, limit=limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except RuntimeError as exc:
+        raise HTTPException(status_code=502, detail=str(exc)) from exc
+
+
+@router.get("/history/search")
+async def search_poc_history_text(
+    q: str = Query(..., min_length=1),
+    speaker: str | None = None,
+    category: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    try:
+        return await controller.search_history(q, speaker=speaker, category=category, limit=limit, offset=offset)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @router.get("/history/{job_id}")
 async def get_archived_job(job_id: str):
     try:
-        return controller.get_archived_job(job_id)
+        return await controller.get_archived_job(job_id)
     except KeyError as exc:
         raise HTTPException(status_code=404, detail="ジョブが見つかりません") from exc
 
@@ -81,43 +132,39 @@ async def classify_archived_job(job_id: str):
 
 
 @router.websocket("/ws/{job_id}")
-async def poc_stream(websocket: WebSocket, job_id: str):
+async def poc_stream(websocket: WebSocket, job_id: str, since: int | None = None):
     await websocket.accept()
-    job = controller.get_job(job_id)
+    job = await controller.get_job(job_id)
     if not job:
         await websocket.send_json({"type": "error", "message": "ジョブが見つかりません"})
         await websocket.close(code=4404)
         return
 
-    # Send backlog
-    for payload in job.transcripts:
-        payload = dict(payload)
-        payload.setdefault("raw_speaker", payload.get("speaker", "spk_unk"))
-        payload.setdefault("result_id", f"historical-{payload.get('index', 0)}")
-        await websocket.send_json({"type": "transcript", "action": "append", "payload": payload})
-    for entry in sorted(job.pending_results.values(), key=lambda item: item["index"]):
-        payload = {
-            "index": entry["index"],
-            "speaker": entry["speaker"],
-            "raw_speaker": entry.get("raw_speaker", entry["speaker"]),
-            "text": entry["text"],
-            "timestamp": entry["timestamp"],
-            "result_id": entry.get("result_id"),
-        }
-        await websocket.send_json({"type": "transcript", "action": "append", "payload": payload})
-    if job.classified_segments:
-        await websocket.send_json({"type": "classification", "payload": job.classified_segments})
-    if job.status == "completed":
-        await websocket.send_json({"type": "complete"})
-        await websocket.close()
-        return
-
+    # Subscribe and read the missed events in one step so nothing published meanwhile is lost.
+    subscription, missed = job.events.subscribe(since)
     try:
+        if missed is None:
+            await websocket.send_json(controller.job_snapshot(job))
+            missed = []
+        for message in missed:
+            await websocket.send_json(message)
+            if message.get("type") == "complete":
+                await websocket.close()
+                return
+        if job.status == "completed":
+            await websocket.send_json({"type": "complete", "seq": job.events.last_seq})
+            await websocket.close()
+            return
+
         while True:
-            message = await job.queue.get()
+            message = await subscription.get()
             await websocket.send_json(message)
             if message.get("type") == "complete":
                 await websocket.close()
                 break
+    except SlowConsumerError:
+        await websocket.close(code=1013)
     except WebSocketDisconnect:
         return
+    finally:
+        job.events.unsubscribe(subscription)
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+from collections import deque
+from typing import Awaitable, Callable
+
+QUEUE_POLICIES = ("fifo", "priority")
+DEFAULT_JOB_SECONDS = 60.0
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a job cannot be admitted; ``retry_after`` is a hint in seconds."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("文字起こしジョブが混み合っています。しばらくしてから再試行してください")
+        self.retry_after = retry_after
+
+
+class Reservation:
+    """A slot held by :meth:`TranscriptionScheduler.reserve` until the job is submitted or released."""
+
+    def __init__(self, scheduler: "TranscriptionScheduler"):
+        self._scheduler = scheduler
+        self.active = True
+
+    def release(self) -> bool:
+        """Give the slot back; returns whether it was still held (safe to call repeatedly)."""
+        if not self.active:
+            return False
+        self.active = False
+        self._scheduler._reserved -= 1
+        return True
+
+
+class TranscriptionScheduler:
+    """Runs at most ``max_concurrency`` jobs at once and queues up to ``max_queued`` more.
+
+    With the ``priority`` policy higher priorities start first; ties (and every job under
+    ``fifo``) start in submission order. A slot can be reserved before the job exists (e.g.
+    while its upload is read), so the job is not rejected after the upload has been paid for.
+    """
+
+    def __init__(self, max_concurrency: int = 2, max_queued: int = 8, policy: str = "fifo"):
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"Unknown queue policy: {policy}")
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queued = max(0, max_queued)
+        self.policy = policy
+        self.logger = logging.getLogger(__name__)
+        self._queue: list[tuple[int, int, str, Callable[[], Awaitable[None]]]] = []
+        self._running: dict[str, asyncio.Task] = {}
+        self._counter = itertools.count()
+        self._durations: deque[float] = deque(maxlen=20)
+        self._reserved = 0
+
+    @property
+    def queued_count(self) -> int:
+        return len(self._queue)
+
+    @property
+    def running_count(self) -> int:
+        return len(self._running)
+
+    @property
+    def reserved_count(self) -> int:
+        return self._reserved
+
+    def has_capacity(self) -> bool:
+        # a reserved slot will either start or wait; the queue only fills once every running slot is taken
+        occupied = self.running_count + self.queued_count + self._reserved
+        return occupied < self.max_concurrency + self.max_queued
+
+    def ensure_capacity(self) -> None:
+        if not self.has_capacity():
+            raise QueueFullError(self.retry_after())
+
+    def retry_after(self) -> int:
+        average = sum(self._durations) / len(self._durations) if self._durations else DEFAULT_JOB_SECONDS
+        waves = math.ceil((self.queued_count + self._reserved + 1) / self.max_concurrency)
+        return max(1, int(average * waves))
+
+    def reserve(self) -> Reservation:
+        """Hold a slot for a job that is about to be submitted; raises ``QueueFullError`` when saturated."""
+        self.ensure_capacity()
+        self._reserved += 1
+        return Reservation(self)
+
+    def submit(
+        self,
+        job_id: str,
+        factory: Callable[[], Awaitable[None]],
+        priority: int = 0,
+        reservation: Reservation | None = None,
+    ) -> int:
+        """Queue ``factory()`` to run under the concurrency limit; returns the queue position (0 = started).
+
+        A held ``reservation`` is used up instead of checking capacity.
+        """
+        if reservation is None or not reservation.release():
+            self.ensure_capacity()
+        rank = -priority if self.policy == "priority" else 0
+        heapq.heappush(self._queue, (rank, next(self._counter), job_id, factory))
+        self._pump()
+        return self.position(job_id) or 0
+
+    def position(self, job_id: str) -> int | None:
+        """1-based position among waiting jobs, or ``None`` when the job is not waiting."""
+        for position, entry in enumerate(sorted(self._queue), start=1):
+            if entry[2] == job_id:
+                return position
+        return None
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "policy": self.policy,
+            "max_concurrency": self.max_concurrency,
+            "max_queued": self.max_queued,
+            "running": self.running_count,
+            "queued": self.queued_count,
+            "reserved": self.reserved_count,
+            "retry_after": self.retry_after(),
+        }
+
+    def _pump(self) -> None:
+        while self._queue and self.running_count < self.max_concurrency:
+            _, _, job_id, factory = heapq.heappop(self._queue)
+            started = time.monotonic()
+            task = asyncio.create_task(factory())
+            self._running[job_id] = task
+            task.add_done_callback(lambda done, job_id=job_id, started=started: self._finished(job_id, started, done))
+
+    def _finished(self, job_id: str, started: float, task: asyncio.Task) -> None:
+        self._running.pop(job_id, None)
+        self._durations.append(time.monotonic() - started)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error("Scheduled job %s failed", job_id, exc_info=task.exception())
+        self._pump()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import re
+from typing import Any
+
+SENTENCE_RE = re.compile(r"[^。！？!?]+[。！？!?]?")
+
+
+def split_sentences(text: str) -> list[str]:
+    if not text:
+        return []
+    matches = SENTENCE_RE.findall(text)
+    sentences = [match.strip() for match in matches if match.strip()]
+    if not sentences and text.strip():
+        sentences = [text.strip()]
+    return sentences
+
+
+def sentence_segments(transcript: dict[str, Any], start_index: int) -> list[dict[str, Any]]:
+    """Sentences of one transcript row, numbered from ``start_index``, without context yet."""
+    speaker = transcript.get("speaker", "")
+    return [
+        {"index": start_index + offset, "speaker": speaker, "text": sentence, "context_before": "", "context_after": ""}
+        for offset, sentence in enumerate(split_sentences(transcript.get("text", "")))
+    ]
+
+
+def link_context(segments: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    for i, segment in enumerate(segments):
+        if i > 0:
+            segment["context_before"] = segments[i - 1]["text"]
+        if i + 1 < len(segments):
+            segment["context_after"] = segments[i + 1]["text"]
+    return segments
+
+
+def sentence_segments_from_transcripts(transcripts: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    segments: list[dict[str, Any]] = []
+    for transcript in transcripts:
+        segments.extend(sentence_segments(transcript, len(segments) + 1))
+    return link_context(segments)
+
+
+def merge_classified(existing: list[dict[str, Any]], delta: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Overlay ``delta`` on ``existing`` by sentence index, keeping the result ordered by index."""
+    by_index = {item.get("index"): item for item in existing}
+    by_index.update({item.get("index"): item for item in delta})
+    return sorted(by_index.values(), key=lambda item: item.get("index") or 0)
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import html
+import sqlite3
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Any
+
+from .sentences import sentence_segments_from_transcripts
+
+SNIPPET_CHARS = 60
+
+
+def normalize_text(text: str) -> str:
+    """NFKC + lowercase, character by character, so offsets still match the original text."""
+    chars = []
+    for char in text or "":
+        folded = unicodedata.normalize("NFKC", char).lower()
+        chars.append(folded if len(folded) == 1 else char)
+    return "".join(chars)
+
+
+def bigrams(text: str) -> set[str]:
+    """Character bigrams of normalized text; whitespace never joins a gram."""
+    grams: set[str] = set()
+    for word in text.split():
+        grams.update(word[idx : idx + 2] for idx in range(len(word) - 1))
+    return grams
+
+
+def highlight(text: str, terms: list[str], snippet_chars: int = SNIPPET_CHARS) -> tuple[str, list[list[int]]]:
+    """HTML-escaped snippet around the first hit with ``<mark>`` around every hit, plus hit ranges."""
+    normalized = normalize_text(text)
+    ranges: list[list[int]] = []
+    for term in terms:
+        start = normalized.find(term)
+        while start != -1:
+            ranges.append([start, start + len(term)])
+            start = normalized.find(term, start + len(term))
+    ranges.sort()
+    merged: list[list[int]] = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+
+    window_start = max(0, merged[0][0] - snippet_chars // 2) if merged else 0
+    window_end = min(len(text), window_start + snippet_chars + (merged[0][1] - merged[0][0] if merged else 0))
+    pieces = ["…"] if window_start else []
+    cursor = window_start
+    for start, end in merged:
+        if end <= window_start or start >= window_end:
+            continue
+        start, end = max(start, window_start), min(end, window_end)
+        pieces.append(html.escape(text[cursor:start]))
+        pieces.append(f"<mark>{html.escape(text[start:end])}</mark>")
+        cursor = end
+    pieces.append(html.escape(text[cursor:window_end]))
+    if window_end < len(text):
+        pieces.append("…")
+    return "".join(pieces), merged
+
+
+class TranscriptSearchIndex:
+    """Inverted index of character bigrams over archived agendas and transcript sentences.
+
+    Lives in a SQLite (WAL) file so every worker sees the same index. Each archived job is
+    re-indexed as a whole when it is archived again (for example after classification), so
+    the index is maintained incrementally and never needs a full rebuild. Candidates come
+    from the bigram postings; ``instr`` on the normalized text then confirms the exact term,
+    so bigrams that occur apart do not produce false hits.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        # opened on first use, so building a controller (e.g. importing the router) touches no files
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._schema_lock:
+                if not self._schema_ready:
+                    self._create_schema(conn)
+                    self._schema_ready = True
+        return conn
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection) -> None:
+        with conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS search_documents (
+                    doc_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    segment_index INTEGER,
+                    speaker TEXT NOT NULL DEFAULT '',
+                    category TEXT NOT NULL DEFAULT '',
+                    text TEXT NOT NULL,
+                    normalized TEXT NOT NULL,
+                    archive_name TEXT NOT NULL DEFAULT '',
+                    completed_at TEXT NOT NULL DEFAULT ''
+                );
+                CREATE INDEX IF NOT EXISTS idx_search_documents_job ON search_documents (job_id);
+                CREATE TABLE IF NOT EXISTS search_postings (
+                    gram TEXT NOT NULL,
+                    doc_id INTEGER NOT NULL,
+                    PRIMARY KEY (gram, doc_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_search_postings_doc ON search_postings (doc_id);
+                """
+            )
+
+    def index_job(self, data: dict[str, Any]) -> int:
+        """Replace everything indexed for ``data['job_id']``; returns the number of documents."""
+        job_id = data.get("job_id")
+        if not job_id:
+            return 0
+        categories = {item.get("index"): item.get("category") or "" for item in data.get("classified_segments") or []}
+        documents = []
+        agenda = (data.get("agenda_text") or "").strip()
+        if agenda:
+            documents.append(("agenda", None, "", "", agenda))
+        for segment in sentence_segments_from_transcripts(data.get("transcripts") or []):
+            documents.append(("segment", segment["index"], segment["speaker"] or "", categories.get(segment["index"], ""), segment["text"]))
+
+        conn = self._connect()
+        with conn:
+            self._delete_job(conn, job_id)
+            for kind, segment_index, speaker, category, text in documents:
+                normalized = normalize_text(text)
+                cursor = conn.execute(
+                    "INSERT INTO search_documents (job_id, kind, segment_index, speaker, category, text, normalized, archive_name, completed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, kind, segment_index, speaker, category, text, normalized, data.get("archive_name") or "", data.get("completed_at") or ""),
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO search_postings (gram, doc_id) VALUES (?, ?)",
+                    [(gram, cursor.lastrowid) for gram in bigrams(normalized)],
+                )
+        return len(documents)
+
+    def has_job(self, job_id: str) -> bool:
+        return self._connect().execute("SELECT 1 FROM search_documents WHERE job_id = ? LIMIT 1", (job_id,)).fetchone() is not None
+
+    def search(
+        self,
+        query: str,
+        speaker: str | None = None,
+        category: str | None = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Documents containing every whitespace-separated term, newest meeting first.
+
+        ``speaker`` and ``category`` only match transcript sentences. Returns the page of
+        hits (with ``highlight`` and hit ``ranges``) and the total number of hits.
+        """
+        terms = [term for term in normalize_text(query).split() if term]
+        if not terms:
+            raise ValueError("検索語を指定してください")
+        clauses = ["instr(d.normalized, ?) > 0" for _ in terms]
+        params: list[Any] = list(terms)
+        grams = sorted(set().union(*(bigrams(term) for term in terms)))
+        if grams:
+            # every gram of every term must be posted for the document
+            clauses.append(
+                "d.doc_id IN (SELECT doc_id FROM search_postings WHERE gram IN ({}) GROUP BY doc_id HAVING COUNT(*) = ?)".format(
+                    ", ".join("?" for _ in grams)
+                )
+            )
+            params.extend(grams)
+            params.append(len(grams))
+        if speaker:
+            clauses.append("d.speaker = ?")
+            params.append(speaker)
+        if category:
+            clauses.append("d.category = ?")
+            params.append(category)
+        where = " AND ".join(clauses)
+
+        conn = self._connect()
+        total = conn.execute(f"SELECT COUNT(*) FROM search_documents d WHERE {where}", params).fetchone()[0]
+        rows = conn.execute(
+            "SELECT d.job_id, d.kind, d.segment_index, d.speaker, d.category, d.text, d.archive_name, d.completed_at "
+            f"FROM search_documents d WHERE {where} "
+            "ORDER BY d.completed_at DESC, d.job_id, d.kind = 'segment', d.segment_index LIMIT ? OFFSET ?",
+            [*params, limit, offset],
+        ).fetchall()
+        items = []
+        for job_id, kind, segment_index, row_speaker, row_category, text, archive_name, completed_at in rows:
+            snippet, ranges = highlight(text, terms)
+            items.append(
+                {
+                    "job_id": job_id,
+                    "kind": kind,
+                    "index": segment_index,
+                    "speaker": row_speaker,
+                    "category": row_category,
+                    "archive_name": archive_name,
+                    "completed_at": completed_at,
+                    "text": text,
+                    "highlight": snippet,
+                    "ranges": ranges,
+                }
+            )
+        return items, total
+
+    @staticmethod
+    def _delete_job(conn: sqlite3.Connection, job_id: str) -> None:
+        conn.execute(
+            "DELETE FROM search_postings WHERE doc_id IN (SELECT doc_id FROM search_documents WHERE job_id = ?)", (job_id,)
+        )
+        conn.execute("DELETE FROM search_documents WHERE job_id = ?", (job_id,))
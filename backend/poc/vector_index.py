@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional, search is disabled without it
+    np = None
+
+INDEX_VERSION = 1
+PASSAGE_CHARS = 400
+# rows scored per block: int8 rows are upcast one cache-sized slice at a time
+SCORE_BLOCK_ROWS = 4096
+
+
+def transcript_passages(transcripts: list[dict[str, Any]], max_chars: int = PASSAGE_CHARS) -> list[dict[str, Any]]:
+    """Group consecutive transcript rows into passages of about ``max_chars`` characters."""
+    passages: list[dict[str, Any]] = []
+    lines: list[str] = []
+    first: Any = None
+    last: Any = None
+    for row in transcripts:
+        text = (row.get("text") or "").strip()
+        if not text:
+            continue
+        line = f"{row.get('speaker') or ''}: {text}"
+        if lines and sum(len(item) for item in lines) + len(line) > max_chars:
+            passages.append({"start": first, "end": last, "text": "\n".join(lines)})
+            lines = []
+        if not lines:
+            first = row.get("index")
+        lines.append(line)
+        last = row.get("index")
+    if lines:
+        passages.append({"start": first, "end": last, "text": "\n".join(lines)})
+    return passages
+
+
+def archive_rows(data: dict[str, Any]) -> list[dict[str, Any]]:
+    """Index rows (the ID map entries) for one archived job, one per passage."""
+    return [
+        {
+            "job_id": data.get("job_id"),
+            "archive_name": data.get("archive_name") or "",
+            "completed_at": data.get("completed_at"),
+            **passage,
+        }
+        for passage in transcript_passages(data.get("transcripts") or [])
+    ]
+
+
+class VectorIndex:
+    """Append-only embedding matrix on disk, searched through a read-only memory map.
+
+    ``vectors.f32`` (or ``vectors.i8`` plus per-row ``scales.f32`` when ``quantize`` is on)
+    holds L2-normalized rows, ``rows.jsonl`` maps each row to its job and passage, and
+    ``meta.json`` records how many rows are complete. Appends take an ``flock`` and rewrite
+    ``meta.json`` last, so several workers can add jobs and readers never see a partial row;
+    readers re-map when ``meta.json`` changes.
+    """
+
+    def __init__(self, directory: Path, quantize: bool = False):
+        self.directory = directory
+        self.quantize = quantize
+        self._lock = threading.Lock()
+        self._meta_version: tuple[int, int] | None = None
+        self._meta: dict[str, Any] = {}
+        self._matrix: Any = None
+        self._scales: Any = None
+        self._rows: list[dict[str, Any]] = []
+        self._job_ids: set[str] = set()
+
+    @staticmethod
+    def available() -> bool:
+        return np is not None
+
+    @property
+    def count(self) -> int:
+        self._refresh()
+        return len(self._rows)
+
+    def has_job(self, job_id: str) -> bool:
+        self._refresh()
+        return job_id in self._job_ids
+
+    def add(self, rows: list[dict[str, Any]], vectors: list[list[float]]) -> int:
+        """Append ``rows`` (JSON metadata) with their embeddings; returns the number added.
+
+        Rows of jobs already in the index are skipped; the check is repeated under the file
+        lock, so two workers embedding the same job do not both append it.
+        """
+        if np is None:
+            raise RuntimeError("Vector search requires numpy")
+        if not rows:
+            return 0
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = matrix / np.where(norms == 0, 1, norms)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._lock, self._exclusive():
+            meta = self._read_meta() or {
+                "version": INDEX_VERSION,
+                "dim": int(matrix.shape[1]),
+                "dtype": "int8" if self.quantize else "float32",
+                "count": 0,
+                "rows_bytes": 0,
+            }
+            if matrix.shape[1] != meta["dim"]:
+                raise ValueError(f"Embedding dimension {matrix.shape[1]} does not match the index ({meta['dim']})")
+            indexed = self._committed_job_ids(meta)
+            keep = [idx for idx, row in enumerate(rows) if row.get("job_id") not in indexed]
+            if not keep:
+                return 0
+            if len(keep) < len(rows):
+                rows = [rows[idx] for idx in keep]
+                matrix = matrix[keep]
+            count = meta["count"]
+            # drop whatever a crashed writer left past the committed rows before appending
+            if meta["dtype"] == "int8":
+                scales = np.abs(matrix).max(axis=1) / 127
+                quantized = np.rint(matrix / np.where(scales == 0, 1, scales)[:, None]).astype(np.int8)
+                self._append(self._vectors_path(meta), count * meta["dim"], quantized.tobytes())
+                self._append(self.directory / "scales.f32", count * 4, scales.astype(np.float32).tobytes())
+            else:
+                self._append(self._vectors_path(meta), count * meta["dim"] * 4, matrix.tobytes())
+            encoded = "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows).encode("utf-8")
+            self._append(self.directory / "rows.jsonl", meta["rows_bytes"], encoded)
+            meta.update(count=count + len(rows), rows_bytes=meta["rows_bytes"] + len(encoded))
+            tmp_path = self.directory / f"meta.json.{os.getpid()}.tmp"
+            tmp_path.write_text(json.dumps(meta), encoding="utf-8")
+            tmp_path.replace(self.directory / "meta.json")
+        return len(rows)
+
+    def search(self, vector: list[float], limit: int = 10) -> list[dict[str, Any]]:
+        """Top-``limit`` rows by cosine similarity, best first, each with a ``score``."""
+        if np is None:
+            raise RuntimeError("Vector search requires numpy")
+        self._refresh()
+        if self._matrix is None or not len(self._rows):
+            return []
+        query = np.asarray(vector, dtype=np.float32)
+        if query.shape != (self._meta["dim"],):
+            raise ValueError(f"Query dimension {query.shape[0]} does not match the index ({self._meta['dim']})")
+        query /= np.linalg.norm(query) or 1.0
+        scores = np.empty(len(self._rows), dtype=np.float32)
+        for start in range(0, len(self._rows), SCORE_BLOCK_ROWS):
+            block = self._matrix[start : start + SCORE_BLOCK_ROWS]
+            scores[start : start + len(block)] = block.astype(np.float32, copy=False) @ query
+        if self._scales is not None:
+            scores *= self._scales
+        limit = min(limit, len(scores))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        return [{**self._rows[idx], "score": round(float(scores[idx]), 4)} for idx in top]
+
+    def _refresh(self) -> None:
+        if np is None:
+            return
+        try:
+            stat = (self.directory / "meta.json").stat()
+        except FileNotFoundError:
+            return
+        version = (stat.st_mtime_ns, stat.st_size)
+        if version == self._meta_version:
+            return
+        with self._lock:
+            meta = self._read_meta()
+            if not meta or meta.get("version") != INDEX_VERSION:
+                return
+            count, dim = meta["count"], meta["dim"]
+            dtype = np.int8 if meta["dtype"] == "int8" else np.float32
+            self._matrix = np.memmap(self._vectors_path(meta), dtype=dtype, mode="r", shape=(count, dim)) if count else None
+            self._scales = (
+                np.memmap(self.directory / "scales.f32", dtype=np.float32, mode="r", shape=(count,))
+                if count and meta["dtype"] == "int8"
+                else None
+            )
+            with (self.directory / "rows.jsonl").open("rb") as handle:
+                raw = handle.read(meta["rows_bytes"])
+            self._rows = [json.loads(line) for line in raw.decode("utf-8").splitlines()]
+            self._job_ids = {row.get("job_id") for row in self._rows}
+            self._meta = meta
+            self._meta_version = version
+
+    def _read_meta(self) -> dict[str, Any] | None:
+        try:
+            return json.loads((self.directory / "meta.json").read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _committed_job_ids(self, meta: dict[str, Any]) -> set[str]:
+        if meta == self._meta:
+            return self._job_ids
+        try:
+            with (self.directory / "rows.jsonl").open("rb") as handle:
+                raw = handle.read(meta["rows_bytes"])
+        except FileNotFoundError:
+            return set()
+        return {json.loads(line).get("job_id") for line in raw.decode("utf-8").splitlines()}
+
+    def _vectors_path(self, meta: dict[str, Any]) -> Path:
+        return self.directory / ("vectors.i8" if meta["dtype"] == "int8" else "vectors.f32")
+
+    @staticmethod
+    def _append(path: Path, committed: int, data: bytes) -> None:
+        with path.open("ab") as handle:
+            handle.truncate(committed)
+            handle.write(data)
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        with (self.directory / "index.lock").open("a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional, alignment scores are 0 without it
+    np = None
+
+from models.agenda_model import AgendaItem
+
+NGRAM_SIZES = (2, 3)
+# cosine similarity of character n-gram TF-IDF vectors at which a sentence counts as 100% on-agenda;
+# a sentence rarely shares more than a third of its n-grams with an agenda title
+FULL_ALIGNMENT_SIMILARITY = 0.35
+# the smoothed focus (0-100) below which the conversation is reported as off-topic
+OFF_TOPIC_ALIGNMENT = 15
+# weight of the previous focus when a new sentence arrives; short replies ("はい") then do not
+# immediately flip the active item or the off-topic flag
+TRACKER_DECAY = 0.7
+
+_PREFIX = re.compile(
+    r"^\s*(?:[-*・●○◆■□▶►•]|\d+[.．)）]|[（(]\d+[)）]|[①-⑳]|第[0-9一二三四五六七八九十]+[部章項]"
+    r"|\d{1,2}[:：]\d{2}(?:\s*[-~〜～]\s*\d{1,2}[:：]\d{2})?)\s*"
+)
+_LABEL = re.compile(r"^(?:議題|テーマ|agenda)\s*\d*\s*[:：]\s*", re.IGNORECASE)
+_HEADER = re.compile(r"^(?:本日の)?(?:アジェンダ|議題|agenda)\s*[:：]?$", re.IGNORECASE)
+_WORD = re.compile(r"\w+")
+
+
+def parse_agenda(agenda_text: str, meeting_id: str = "") -> list[AgendaItem]:
+    """One :class:`AgendaItem` per non-empty agenda line, without bullets, numbering or times."""
+    items: list[AgendaItem] = []
+    for line in (agenda_text or "").splitlines():
+        title = line.strip()
+        while (stripped := _LABEL.sub("", _PREFIX.sub("", title)).strip()) != title:
+            title = stripped
+        if not title or _HEADER.match(title):
+            continue
+        items.append(AgendaItem(agenda_id=f"agenda-{len(items) + 1}", meeting_id=meeting_id, title=title))
+    return items
+
+
+def char_ngrams(text: str) -> Counter:
+    normalized = unicodedata.normalize("NFKC", text or "").lower()
+    grams: Counter = Counter()
+    for word in _WORD.findall(normalized):
+        for size in NGRAM_SIZES:
+            grams.update(word[idx : idx + size] for idx in range(len(word) - size + 1))
+    return grams
+
+
+def alignment_percent(similarity: float) -> int:
+    return max(0, min(100, round(similarity / FULL_ALIGNMENT_SIMILARITY * 100)))
+
+
+class AgendaAligner:
+    """Scores sentences against agenda items by cosine similarity of character n-gram TF-IDF vectors.
+
+    The vocabulary is the agenda's own n-grams; n-grams a sentence has beyond it still count
+    towards the sentence's norm, so long sentences that merely mention a keyword score lower
+    than ones about the item. Works for Japanese without a morphological analyzer.
+    """
+
+    def __init__(self, items: list[AgendaItem]):
+        self.items = items
+        documents = [char_ngrams(item.title) for item in items]
+        self.vocabulary = {gram: idx for idx, gram in enumerate(sorted(set().union(*documents)))}
+        count = len(items)
+        # smoothed IDF; n-grams found in no agenda item get the highest weight
+        self.unknown_idf = math.log(1 + count) + 1
+        self.idf = {
+            gram: math.log((1 + count) / (1 + sum(gram in document for document in documents))) + 1
+            for gram in self.vocabulary
+        }
+        self.matrix = self._vectorize(documents) if np is not None and items else None
+
+    @classmethod
+    def from_text(cls, agenda_text: str, meeting_id: str = "") -> "AgendaAligner":
+        return cls(parse_agenda(agenda_text, meeting_id))
+
+    @property
+    def enabled(self) -> bool:
+        return self.matrix is not None and bool(self.vocabulary)
+
+    def score(self, texts: list[str]) -> Any:
+        """Cosine similarity of every text to every item, shape ``(len(texts), len(items))``."""
+        if not self.enabled or not texts:
+            return np.zeros((len(texts), len(self.items)), dtype=np.float32) if np is not None else None
+        return self._vectorize([char_ngrams(text) for text in texts]) @ self.matrix.T
+
+    def _vectorize(self, documents: list[Counter]) -> Any:
+        """L2-normalized TF-IDF rows over the agenda vocabulary (sublinear term frequency)."""
+        vectors = np.zeros((len(documents), len(self.vocabulary)), dtype=np.float32)
+        norms = np.zeros(len(documents), dtype=np.float32)
+        for row, grams in enumerate(documents):
+            total = 0.0
+            for gram, count in grams.items():
+                column = self.vocabulary.get(gram)
+                weight = (1 + math.log(count)) * (self.idf[gram] if column is not None else self.unknown_idf)
+                total += weight * weight
+                if column is not None:
+                    vectors[row, column] = weight
+            norms[row] = math.sqrt(total)
+        vectors /= np.where(norms == 0, 1, norms)[:, None]
+        return vectors
+
+
+class AgendaTracker:
+    """Follows which agenda item the conversation is on, one sentence at a time.
+
+    Keeps an exponentially decaying focus per item; the item with the highest focus is the
+    active one, and the meeting is off-topic while that focus stays below ``OFF_TOPIC_ALIGNMENT``.
+    """
+
+    def __init__(self, aligner: AgendaAligner, decay: float = TRACKER_DECAY):
+        self.aligner = aligner
+        self.decay = decay
+        self.sentences = 0
+        self.focus = np.zeros(len(aligner.items), dtype=np.float32) if np is not None else None
+        self.active_index: int | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.aligner.enabled
+
+    def observe(self, texts: list[str]) -> list[dict[str, Any]]:
+        """Score the next sentences in order.
+
+        Each result has the sentence's own ``alignment`` (0-100) and best ``agenda_id``, plus the
+        ``active_agenda_id`` / ``off_topic`` state of the tracker right after that sentence.
+        """
+        results = []
+        scores = self.aligner.score(texts)
+        for row in range(len(texts)):
+            self.sentences += 1
+            if not self.enabled:
+                results.append({"alignment": 0, "agenda_id": None, "active_agenda_id": None, "off_topic": False})
+                continue
+            similarities = scores[row]
+            self.focus = self.focus * self.decay + similarities * (1 - self.decay)
+            best = int(np.argmax(self.focus))
+            if self.focus[best] > 0:
+                self.active_index = best
+            state = self.state()
+            results.append(
+                {
+                    "alignment": alignment_percent(float(similarities.max())),
+                    "agenda_id": self.aligner.items[int(np.argmax(similarities))].agenda_id if similarities.max() > 0 else None,
+                    "active_agenda_id": state["active_agenda_id"],
+                    "off_topic": state["off_topic"],
+                }
+            )
+        return results
+
+    def state(self) -> dict[str, Any]:
+        active = self.aligner.items[self.active_index] if self.active_index is not None else None
+        focus = alignment_percent(float(self.focus[self.active_index])) if active is not None else 0
+        return {
+            "active_agenda_id": active.agenda_id if active else None,
+            "active_title": active.title if active else None,
+            "focus": focus,
+            "off_topic": self.enabled and focus < OFF_TOPIC_ALIGNMENT,
+        }
+
+
+def annotate_alignment(segments: list[dict[str, Any]], agenda_text: str) -> list[dict[str, Any]]:
+    """Add ``alignment`` / ``agenda_id`` and the running agenda state to ordered sentence segments."""
+    tracker = AgendaTracker(AgendaAligner.from_text(agenda_text))
+    results = tracker.observe([segment.get("text") or "" for segment in segments])
+    return [{**segment, **result} for segment, result in zip(segments, results)]
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+from botocore.config import Config
+
+from config import get_settings
+from utils.auth_aws import get_session
+
+# read timeouts per service; Bedrock generations can legitimately take tens of seconds
+READ_TIMEOUTS = {
+    "bedrock-runtime": "bedrock_read_timeout",
+    "comprehend": "comprehend_read_timeout",
+}
+
+_clients: dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def client_config(service: str) -> Config:
+    """botocore ``Config`` tuned for ``service``: pooled keep-alive connections and adaptive retries."""
+    settings = get_settings()
+    read_timeout = getattr(settings, READ_TIMEOUTS.get(service, ""), None) or settings.aws_read_timeout
+    return Config(
+        region_name=settings.aws_region,
+        connect_timeout=settings.aws_connect_timeout,
+        read_timeout=read_timeout,
+        max_pool_connections=settings.aws_max_pool_connections,
+        retries={"mode": "adaptive", "max_attempts": settings.aws_max_attempts},
+        tcp_keepalive=True,
+    )
+
+
+def get_client(service: str) -> Any:
+    """Return the process-wide client for ``service``, creating it on first use.
+
+    boto3 clients are thread-safe, so one client (and its connection pool) is shared by
+    every request and worker thread instead of paying client construction on each call.
+    """
+    client = _clients.get(service)
+    if client is None:
+        with _lock:
+            client = _clients.get(service)
+            if client is None:
+                client = get_session().client(service, config=client_config(service))
+                _clients[service] = client
+    return client
+
+
+def reset_clients() -> None:
+    """Drop cached clients, e.g. after credentials or settings change."""
+    with _lock:
+        _clients.clear()
@@ -2,12 +2,36 @@ from __future__ import annotations
 
 import json
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import Any
 
 from botocore.exceptions import BotoCoreError, ClientError
 
 from config import get_settings
-from utils.auth_aws import get_session
+from services.agenda_alignment import annotate_alignment
+from services.aws_clients import get_client
+from services.llm_cache import LLMResponseCache, get_llm_cache
+from services.model_router import model_for, token_counts, usage
+from services.rule_classifier import classify_sentence
+
+# bump when a prompt changes so cached responses for the old wording are no longer used
+SUMMARY_PROMPT_VERSION = "summary-v1"
+SUMMARY_CHUNK_PROMPT_VERSION = "summary-chunk-v1"
+SUMMARY_REDUCE_PROMPT_VERSION = "summary-reduce-v1"
+CLASSIFY_PROMPT_VERSION = "classify-v5"
+
+# output budget per classification window: {"index":N,"category":"...","confidence":N} is ~25 tokens
+CLASSIFY_BASE_TOKENS = 64
+CLASSIFY_TOKENS_PER_SEGMENT = 32
+CLASSIFY_MAX_OUTPUT_TOKENS = 4096
+
+SUMMARY_MAX_TOKENS = 256
+SUMMARY_CHUNK_MAX_TOKENS = 384
+SUMMARY_REDUCE_MAX_TOKENS = 512
+# characters of a chunk kept in place of its summary when the chunk call fails
+SUMMARY_EXCERPT_CHARS = 300
 
 CLASSIFICATION_LABELS = ["議事進行", "報告", "提案", "相談", "質問", "回答", "決定", "コメント", "無関係な雑談"]
 
@@ -15,8 +39,7 @@ CLASSIFICATION_LABELS = ["議事進行", "報告", "提案", "相談", "質問",
 def _bedrock_client(client: Any | None = None):
     if client:
         return client
-    session = get_session()
-    return session.client("bedrock-runtime", region_name=get_settings().aws_region)
+    return get_client("bedrock-runtime")
 
 
 def _load_json_body(response: dict[str, Any]) -> dict[str, Any]:
@@ -39,9 +62,10 @@ def _model_uses_messages(model_id: str) -> bool:
     return "claude-3" in (model_id or "").lower()
 
 
-def _invoke_text_model(prompt: str, max_tokens: int, temperature: float, client: Any | None = None) -> dict[str, Any]:
-    settings = get_settings()
-    model_id = settings.bedrock_model_id
+def _invoke_text_model(
+    prompt: str, max_tokens: int, temperature: float, client: Any | None = None, model_id: str | None = None
+) -> dict[str, Any]:
+    model_id = model_id or get_settings().bedrock_model_id
     if _model_uses_messages(model_id):
         payload = {
             "anthropic_version": "bedrock-2023-05-31",
@@ -65,14 +89,24 @@ def _invoke_text_model(prompt: str, max_tokens: int, temperature: float, client:
             "maxTokens": max_tokens,
             "temperature": temperature,
         }
+    return _invoke_model(model_id, payload, client)
 
-    response = _bedrock_client(client).invoke_model(
-        modelId=model_id,
-        contentType="application/json",
-        accept="application/json",
-        body=json.dumps(payload).encode("utf-8"),
-    )
-    return _load_json_body(response)
+
+def _invoke_model(model_id: str, payload: dict[str, Any], client: Any | None = None) -> dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        response = _bedrock_client(client).invoke_model(
+            modelId=model_id,
+            contentType="application/json",
+            accept="application/json",
+            body=json.dumps(payload).encode("utf-8"),
+        )
+        content = _load_json_body(response)
+    except (BotoCoreError, ClientError):
+        usage.record(model_id, time.perf_counter() - started, error=True)
+        raise
+    usage.record(model_id, time.perf_counter() - started, *token_counts(response, content))
+    return content
 
 
 def _extract_text_from_content(content: dict[str, Any]) -> str:
@@ -95,16 +129,8 @@ def _extract_text_from_content(content: dict[str, Any]) -> str:
 
 
 def create_embedding(text: str, client: Any | None = None) -> list[float]:
-    settings = get_settings()
-    payload = {"inputText": text}
     try:
-        response = _bedrock_client(client).invoke_model(
-            modelId=settings.bedrock_model_id,
-            contentType="application/json",
-            accept="application/json",
-            body=json.dumps(payload).encode("utf-8"),
-        )
-        content = _load_json_body(response)
+        content = _invoke_model(model_for("embed"), {"inputText": text}, client)
         embedding = content.get("embedding") or content.get("embeddings")
         if isinstance(embedding, list):
             # flatten nested arrays if needed
@@ -114,15 +140,149 @@ def create_embedding(text: str, client: Any | None = None) -> list[float]:
         return [hash(text) % 100 / 100 for _ in range(16)]
 
 
+def create_embeddings(texts: list[str], client: Any | None = None) -> list[list[float] | None]:
+    """Embed many texts with the embedding model, ``BEDROCK_EMBED_CONCURRENCY`` requests at a time.
+
+    Unlike :func:`create_embedding` there is no placeholder vector: a failed text yields
+    ``None`` so callers never index vectors that do not come from the model. Embeddings are
+    not put in the LLM response cache: the vector index already stores them, and thousands
+    of passages would evict the cached summaries and classifications.
+    """
+    model_id = model_for("embed")
+    options: dict[str, Any] = {}
+    if "titan-embed-text-v2" in model_id:
+        # v2 can return shorter vectors; 512 dimensions halve the index size and scan time
+        options = {"dimensions": get_settings().bedrock_embed_dimensions, "normalize": True}
+
+    def embed(text: str) -> list[float] | None:
+        try:
+            content = _invoke_model(model_id, {"inputText": text, **options}, client)
+        except (BotoCoreError, ClientError):
+            return None
+        embedding = content.get("embedding") or content.get("embeddings")
+        if isinstance(embedding, list) and embedding and isinstance(embedding[0], list):
+            embedding = embedding[0]
+        if not isinstance(embedding, list) or not embedding:
+            return None
+        return embedding
+
+    if not texts:
+        return []
+    workers = max(1, min(get_settings().bedrock_embed_concurrency, len(texts)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(embed, texts))
+
+
 def summarize_transcript(meeting_id: str, transcript_text: str, client: Any | None = None) -> dict[str, Any]:
-    prompt = f"以下は会議ID {meeting_id} の議事録です。日本語で簡潔に要約してください。\n{transcript_text[:4000]}"
+    """Summarize a transcript of any length.
+
+    Short transcripts are summarized in one call. Longer ones are split on line boundaries
+    into token-budgeted chunks that are summarized concurrently (map) and then combined,
+    recursively if needed, into a single summary (reduce). Chunk boundaries only depend on
+    the text before them, so when a transcript grows only the chunks at its tail miss the cache.
+    If some chunks cannot be summarized, an excerpt of each stands in for it and the result
+    carries ``partial: True`` with ``missing_chunks`` / ``total_chunks``.
+    """
+    settings = get_settings()
+    budget = max(1, settings.bedrock_summary_chunk_tokens)
+    if _estimate_tokens(transcript_text) <= budget:
+        prompt = f"以下は会議ID {meeting_id} の議事録です。日本語で簡潔に要約してください。\n{transcript_text}"
+        summary_text = _cached_summary(SUMMARY_PROMPT_VERSION, prompt, SUMMARY_MAX_TOKENS, client)
+        if summary_text is None:
+            summary_text = f"[mock-summary] {prompt[:200]}"
+        return {"meeting_id": meeting_id, "summary": summary_text}
+
+    chunks = _split_for_summary(transcript_text, budget)
+    # the chunk count is left out of the prompt so earlier chunks keep their cache keys as the transcript grows
+    prompts = [
+        f"以下は会議ID {meeting_id} の議事録の {idx} 番目の区間です。決定事項・課題・担当者を落とさずに日本語で要約してください。\n{chunk}"
+        for idx, chunk in enumerate(chunks, 1)
+    ]
+    results = _map_summaries(prompts, SUMMARY_CHUNK_PROMPT_VERSION, SUMMARY_CHUNK_MAX_TOKENS, client)
+    missing = [idx for idx, result in enumerate(results, 1) if result is None]
+    if len(missing) == len(chunks):
+        summary_text = f"[mock-summary] {transcript_text[:200]}"
+    else:
+        # a failed chunk keeps an excerpt of its text so the reduce step still covers that part
+        partials = [
+            result if result is not None else f"（{idx} 番目の区間は要約に失敗したため抜粋）{chunks[idx - 1][:SUMMARY_EXCERPT_CHARS]}"
+            for idx, result in enumerate(results, 1)
+        ]
+        summary_text = _reduce_summaries(meeting_id, partials, budget, client)
+    summary = {"meeting_id": meeting_id, "summary": summary_text}
+    if missing:
+        summary.update(partial=True, missing_chunks=len(missing), total_chunks=len(chunks))
+    return summary
+
+
+def _cached_summary(version: str, prompt: str, max_tokens: int, client: Any | None) -> str | None:
+    cache = get_llm_cache()
+    model_id = model_for("summarize")
+    key = LLMResponseCache.make_key(model_id, version, prompt)
+    summary_text = cache.get(key) if cache else None
+    if summary_text is not None:
+        return summary_text
     try:
-        content = _invoke_text_model(prompt, max_tokens=256, temperature=0.3, client=client)
-        summary_text = _extract_text_from_content(content) or json.dumps(content)
+        content = _invoke_text_model(prompt, max_tokens=max_tokens, temperature=0.3, client=client, model_id=model_id)
     except (BotoCoreError, ClientError):
-        summary_text = f"[mock-summary] {prompt[:200]}"
-
-    return {"meeting_id": meeting_id, "summary": summary_text}
+        return None
+    summary_text = _extract_text_from_content(content) or json.dumps(content)
+    if cache:
+        cache.put(key, summary_text)
+    return summary_text
+
+
+def _map_summaries(prompts: list[str], version: str, max_tokens: int, client: Any | None) -> list[str | None]:
+    """Summaries in prompt order; ``None`` where a call failed, so callers can tell what is missing."""
+    workers = max(1, min(get_settings().bedrock_summary_concurrency, len(prompts)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda prompt: _cached_summary(version, prompt, max_tokens, client), prompts))
+    return [result or None for result in results]
+
+
+def _reduce_summaries(meeting_id: str, partials: list[str], budget: int, client: Any | None) -> str:
+    while True:
+        if len(partials) == 1:
+            return partials[0]
+        groups = _split_for_summary("\n\n".join(partials), budget, separator="\n\n")
+        prompts = [
+            f"以下は会議ID {meeting_id} の議事録を前から順に分割して要約したものです。重複をまとめ、決定事項と次のアクションを含めて日本語で一つの要約にしてください。\n{group}"
+            for group in groups
+        ]
+        results = _map_summaries(prompts, SUMMARY_REDUCE_PROMPT_VERSION, SUMMARY_REDUCE_MAX_TOKENS, client)
+        if not any(results):
+            return "\n\n".join(partials)
+        # a group that could not be combined is carried over as is, so nothing is lost
+        reduced = [result if result is not None else group for result, group in zip(results, groups)]
+        if len(reduced) >= len(partials):
+            # summaries are not getting shorter; stop instead of looping
+            return "\n\n".join(reduced)
+        partials = reduced
+
+
+def _split_for_summary(text: str, budget_tokens: int, separator: str = "\n") -> list[str]:
+    pieces: list[str] = []
+    for piece in text.split(separator):
+        if _estimate_tokens(piece) <= budget_tokens:
+            pieces.append(piece)
+            continue
+        # an overlong line (e.g. a transcript without line breaks) is cut by characters,
+        # which at roughly one token per character keeps each cut near the budget
+        pieces.extend(piece[start : start + budget_tokens] for start in range(0, len(piece), budget_tokens))
+
+    chunks: list[str] = []
+    current: list[str] = []
+    used = 0
+    for piece in pieces:
+        cost = _estimate_tokens(piece)
+        if current and used + cost > budget_tokens:
+            chunks.append(separator.join(current))
+            current, used = [], 0
+        current.append(piece)
+        used += cost
+    if current:
+        chunks.append(separator.join(current))
+    return chunks
 
 
 def classify_transcript_segments(
@@ -130,6 +290,15 @@ def classify_transcript_segments(
     agenda_text: str = "",
     client: Any | None = None,
 ) -> list[dict[str, Any]]:
+    """Classify sentences, using Bedrock only for those the local rules are unsure about.
+
+    Sentences whose rule match (:mod:`services.rule_classifier`) reaches
+    ``CLASSIFY_RULE_MIN_CONFIDENCE`` are labelled locally. The rest are sent in token-budgeted,
+    overlapping windows to Bedrock concurrently: each sentence is owned by exactly one window,
+    the overlap only gives the model context across window boundaries, and results are merged
+    by index so the output does not depend on completion order. Agenda alignment is scored
+    locally (:mod:`services.agenda_alignment`). Returns ``[]`` when every window fails.
+    """
     clean_segments = []
     for segment in segments:
         text = (segment.get("text") or "").strip()
@@ -147,6 +316,122 @@ def classify_transcript_segments(
     if not clean_segments:
         return []
 
+    settings = get_settings()
+    classified: dict[int, dict[str, Any]] = {}
+    uncertain: list[dict[str, Any]] = []
+    for segment in clean_segments:
+        match = classify_sentence(segment["text"])
+        if match and match.confidence >= settings.classify_rule_min_confidence:
+            classified[segment["index"]] = {"index": segment["index"], "category": match.label, "source": "rules"}
+        else:
+            uncertain.append(segment)
+    if not uncertain:
+        return _merge_classifications(clean_segments, list(classified.values()), agenda_text)
+
+    fast_model = model_for("classify")
+    results, escalate, succeeded = _classify_with_model(uncertain, agenda_text, client, fast_model)
+    classified.update({idx: {**item, "source": "bedrock"} for idx, item in results.items()})
+
+    strong_model = model_for("classify_escalation")
+    if escalate and strong_model and strong_model != fast_model:
+        # a fast-model answer, if any, stays in place should the stronger model fail as well
+        results, _, escalated = _classify_with_model(escalate, agenda_text, client, strong_model)
+        classified.update({idx: {**item, "source": "escalated"} for idx, item in results.items()})
+        succeeded = succeeded or escalated
+    if not succeeded:
+        return []
+    return _merge_classifications(clean_segments, list(classified.values()), agenda_text)
+
+
+def _classify_with_model(
+    segments: list[dict[str, Any]], agenda_text: str, client: Any | None, model_id: str
+) -> tuple[dict[int, dict[str, Any]], list[dict[str, Any]], bool]:
+    """Classify ``segments`` with one model.
+
+    Returns the parsed results by index, the segments worth escalating (missing from the
+    answer, an unknown label or a confidence below ``BEDROCK_CLASSIFY_ESCALATION_CONFIDENCE``)
+    and whether any window succeeded.
+    """
+    settings = get_settings()
+    windows = _build_windows(segments, settings.bedrock_classify_window_tokens, settings.bedrock_classify_overlap)
+    workers = max(1, min(settings.bedrock_classify_concurrency, len(windows)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        parsed_windows = list(executor.map(lambda window: _classify_window(window, agenda_text, client, model_id), windows))
+
+    results: dict[int, dict[str, Any]] = {}
+    escalate: list[dict[str, Any]] = []
+    succeeded = False
+    for window, parsed in zip(windows, parsed_windows):
+        succeeded = succeeded or parsed is not None
+        answers = {item.get("index"): item for item in parsed or []}
+        for segment in window.owned:
+            item = answers.get(segment["index"])
+            if item is not None:
+                results[segment["index"]] = item
+            confidence = item.get("confidence") if item else None
+            if (
+                item is None
+                or item.get("category") not in CLASSIFICATION_LABELS
+                or (isinstance(confidence, (int, float)) and confidence < settings.bedrock_classify_escalation_confidence)
+            ):
+                escalate.append(segment)
+    return results, escalate, succeeded
+
+
+@dataclass
+class _Window:
+    owned: list[dict[str, Any]]
+    context: list[dict[str, Any]]
+
+
+def _estimate_tokens(text: str) -> int:
+    # roughly one token per Japanese character and per ~3 ASCII characters
+    return len(text.encode("utf-8")) // 3 + 1
+
+
+def _build_windows(segments: list[dict[str, Any]], budget_tokens: int, overlap: int) -> list[_Window]:
+    costs = [_estimate_tokens(json.dumps(segment, ensure_ascii=False)) for segment in segments]
+    windows: list[_Window] = []
+    start = 0
+    while start < len(segments):
+        end, used = start, 0
+        while end < len(segments) and (end == start or used + costs[end] <= budget_tokens):
+            used += costs[end]
+            end += 1
+        lo, hi = max(0, start - overlap), min(len(segments), end + overlap)
+        windows.append(_Window(owned=segments[start:end], context=segments[lo:hi]))
+        start = end
+    return windows
+
+
+def _classify_window(window: _Window, agenda_text: str, client: Any | None, model_id: str) -> list[dict[str, Any]] | None:
+    cache = get_llm_cache()
+    owned = {segment["index"] for segment in window.owned}
+    context = [segment for segment in window.context if segment["index"] not in owned]
+    key = LLMResponseCache.make_key(model_id, CLASSIFY_PROMPT_VERSION, agenda_text, window.owned, context)
+    cached = cache.get(key) if cache else None
+    if cached is not None:
+        return cached
+    max_tokens = min(CLASSIFY_MAX_OUTPUT_TOKENS, CLASSIFY_BASE_TOKENS + CLASSIFY_TOKENS_PER_SEGMENT * len(window.owned))
+    try:
+        content = _invoke_text_model(
+            _classification_prompt(window.owned, agenda_text, context),
+            max_tokens=max_tokens,
+            temperature=0.2,
+            client=client,
+            model_id=model_id,
+        )
+    except (BotoCoreError, ClientError):
+        return None
+    parsed = _coerce_classifications(content)
+    if parsed and cache:
+        cache.put(key, parsed)
+    return parsed or None
+
+
+def _classification_prompt(
+    clean_segments: list[dict[str, Any]], agenda_text: str, context: list[dict[str, Any]] | None = None
+) -> str:
     category_guidance = (
         "議事進行=会議の段取りや進め方/次の議題の指示、開始・終了宣言、アジェンダの提示\n"
         "報告=進捗や結果、現状共有。担当や出欠の自己紹介（「ヤマモトです」「開発の田中です」など）も含む\n"
@@ -161,9 +446,17 @@ def classify_transcript_segments(
         "               雑談内容に提案や質問が含まれていても、内容が明らかに雑談ならこのカテゴリを優先する。\n"
         "               会議の開始時挨拶や自己紹介、了解の返事などはここに含めない"
     )
+    # neighbouring sentences owned by other windows: shown for context, never labelled here
+    context_block = (
+        "以下は前後の文脈です。判断の参考にのみ使い、これらの index は出力に含めないでください:\n"
+        f"{json.dumps(context, ensure_ascii=False)}\n"
+        "\n"
+        if context
+        else ""
+    )
 
 
-    prompt = (
+    return (
         "あなたは日本語の議事録を文単位で分類するアシスタントです。\n"
         "必ず同じ基準で安定した判断を行い、文脈(context_before/context_after)も考慮してください。\n"
         "\n"
@@ -224,28 +517,18 @@ def classify_transcript_segments(
         "\n"
         "出力形式は JSON 配列のみで、各要素は {\"index\":番号,\"category\":\"分類名\"} です。\n"
         "未知のカテゴリは使わず、必ず上記ラベルのいずれか1つを割り当ててください。\n"
-        "各文が議題(アジェンダ)にどれだけ沿っているかも 0〜100% の整数で評価し、\"alignment\" として JSON に含めてください。\n"
+        "分類にどれだけ自信があるかを 0〜100 の整数で \"confidence\" として含めてください。\n"
         "アジェンダ概要:\n"
         f"{(agenda_text or '（アジェンダ未指定）')[:2000]}\n"
         "\n"
         "最後の出力には JSON 以外の文字は一切含めないでください。\n"
         "\n"
-        "以下の文一覧を分類してください:\n"
+        f"{context_block}"
+        "以下の文一覧を分類してください（出力はこの一覧の index のみ）:\n"
         f"{json.dumps(clean_segments, ensure_ascii=False)}"
     )
 
 
-    try:
-        content = _invoke_text_model(prompt, max_tokens=512, temperature=0.2, client=client)
-        parsed = _coerce_classifications(content)
-        if parsed:
-            return _merge_classifications(clean_segments, parsed)
-    except (BotoCoreError, ClientError):
-        pass
-
-    return []
-
-
 def _coerce_classifications(content: dict[str, Any]) -> list[dict[str, Any]]:
     candidates = content.get("classifications")
     if isinstance(candidates, list):
@@ -268,24 +551,25 @@ def _coerce_classifications(content: dict[str, Any]) -> list[dict[str, Any]]:
     return []
 
 
-def _merge_classifications(segments: list[dict[str, Any]], classified: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    index_to_result: dict[int, tuple[str, int]] = {}
+def _merge_classifications(
+    segments: list[dict[str, Any]], classified: list[dict[str, Any]], agenda_text: str = ""
+) -> list[dict[str, Any]]:
+    index_to_result: dict[int, tuple[str, str]] = {}
     for item in classified:
         idx = item.get("index")
         cat = item.get("category")
-        alignment = item.get("alignment")
         if isinstance(idx, int) and isinstance(cat, str):
-            score = int(alignment) if isinstance(alignment, (int, float)) else 0
-            index_to_result[idx] = (cat, max(0, min(100, score)))
+            index_to_result[idx] = (cat, item.get("source") or "bedrock")
 
     merged: list[dict[str, Any]] = []
     for segment in segments:
         idx = segment["index"]
-        category, alignment = index_to_result.get(idx, (_guess_category(segment["text"]), 0))
+        category, source = index_to_result.get(idx, (_guess_category(segment["text"]), "rules"))
         if category not in CLASSIFICATION_LABELS:
             category = "無関係な雑談"
-        merged.append({**segment, "category": category, "alignment": alignment})
-    return merged
+        merged.append({**segment, "category": category, "source": source})
+    # agenda alignment is scored locally rather than asked of the model for every sentence
+    return annotate_alignment(merged, agenda_text)
 
 
 def _fallback_classification(segments: list[dict[str, Any]]) -> list[dict[str, Any]]:
@@ -296,19 +580,5 @@ def _fallback_classification(segments: list[dict[str, Any]]) -> list[dict[str, A
 
 
 def _guess_category(text: str) -> str:
-    lowered = text.lower()
-    cues = [
-        ("議事進行", ["議題", "進行", "次に", "本題", "開始", "終了"]),
-        ("報告", ["報告", "共有", "アップデート", "結果", "進捗", "ステータス"]),
-        ("提案", ["提案", "アイデア", "案", "どうでしょう", "検討"]),
-        ("相談", ["相談", "一緒に", "助け", "サポート", "悩んで"]),
-        ("質問", ["?", "か?", "教えて", "でしょうか", "質問"]),
-        ("回答", ["回答", "説明します", "対応します", "お答え", "承知"]),
-        ("決定", ["決定", "合意", "確定", "承認", "決めましょう"]),
-        ("コメント", ["ありがとうございます", "すみません", "助かります", "うれしい", "心強い"]),
-        ("無関係な雑談", ["雑談", "世間話", "余談", "週末", "天気", "ランチ"]),
-    ]
-    for label, keywords in cues:
-        if any(keyword in text for keyword in keywords) or any(keyword in lowered for keyword in keywords):
-            return label
-    return "無関係な雑談"
+    match = classify_sentence(text)
+    return match.label if match else "無関係な雑談"
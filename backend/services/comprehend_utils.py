@@ -1,16 +1,120 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
 from botocore.exceptions import BotoCoreError, ClientError
 
 from config import get_settings
-from utils.auth_aws import get_session
+from services.aws_clients import get_client
+
+# BatchDetectSentiment accepts at most 25 documents of at most 5,000 UTF-8 bytes each
+BATCH_SIZE = 25
+MAX_DOCUMENT_BYTES = 5000
+SENTIMENT_LABELS = ("POSITIVE", "NEGATIVE", "NEUTRAL", "MIXED")
+NEUTRAL_SENTIMENT = {"Sentiment": "NEUTRAL", "SentimentScore": {"Positive": 0.3, "Negative": 0.2, "Neutral": 0.5, "Mixed": 0.0}}
 
 
-def analyze_sentiment(text: str) -> dict:
-    session = get_session()
-    client = session.client("comprehend", region_name=get_settings().aws_region)
+def analyze_sentiment(text: str, client: Any | None = None) -> dict:
+    client = client or get_client("comprehend")
     try:
         response = client.detect_sentiment(Text=text, LanguageCode=get_settings().comprehend_language)
         return response
     except (BotoCoreError, ClientError):
-        return {"Sentiment": "NEUTRAL", "SentimentScore": {"Positive": 0.3, "Negative": 0.2, "Neutral": 0.5, "Mixed": 0.0}}
+        return _neutral()
+
+
+def batch_sentiment(texts: list[str], client: Any | None = None) -> list[dict[str, Any]]:
+    """Sentiment for every text, sent in ``BatchDetectSentiment`` calls of up to 25 documents.
+
+    Batches run concurrently (``COMPREHEND_BATCH_CONCURRENCY``). Empty texts, documents
+    Comprehend rejects and batches that fail fall back to a neutral result, so the output
+    always lines up with ``texts``.
+    """
+    client = client or get_client("comprehend")
+    results: list[dict[str, Any]] = [_neutral() for _ in texts]
+    positions = [idx for idx, text in enumerate(texts) if text and text.strip()]
+    batches = [positions[start : start + BATCH_SIZE] for start in range(0, len(positions), BATCH_SIZE)]
+    if not batches:
+        return results
+
+    workers = max(1, min(get_settings().comprehend_batch_concurrency, len(batches)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        responses = list(executor.map(lambda batch: _detect_batch([texts[idx] for idx in batch], client), batches))
+    for batch, response in zip(batches, responses):
+        for item in response:
+            position = item.get("Index")
+            if isinstance(position, int) and 0 <= position < len(batch):
+                results[batch[position]] = {"Sentiment": item["Sentiment"], "SentimentScore": item["SentimentScore"]}
+    return results
+
+
+def analyze_segments_sentiment(segments: list[dict[str, Any]], client: Any | None = None) -> dict[str, Any]:
+    """Per-segment sentiment plus per-speaker and whole-meeting aggregates.
+
+    The top level keeps the ``detect_sentiment`` shape (``Sentiment`` / ``SentimentScore``)
+    for the whole meeting. Aggregated scores are averaged weighted by text length, so a
+    long statement counts for more than a one-word reply.
+    """
+    texts = [(segment.get("text") or "").strip() for segment in segments]
+    sentiments = batch_sentiment(texts, client=client)
+
+    per_segment: list[dict[str, Any]] = []
+    by_speaker: dict[str, list[tuple[int, dict[str, Any]]]] = {}
+    weighted: list[tuple[int, dict[str, Any]]] = []
+    for segment, text, sentiment in zip(segments, texts, sentiments):
+        speaker = segment.get("speaker") or ""
+        per_segment.append(
+            {
+                "index": segment.get("index"),
+                "speaker": speaker,
+                "sentiment": sentiment["Sentiment"],
+                "scores": sentiment["SentimentScore"],
+            }
+        )
+        if text:
+            weighted.append((len(text), sentiment))
+            by_speaker.setdefault(speaker, []).append((len(text), sentiment))
+
+    overall = _aggregate(weighted)
+    return {
+        "Sentiment": overall["sentiment"],
+        "SentimentScore": overall["scores"],
+        "counts": overall["counts"],
+        "speakers": {speaker: _aggregate(items) for speaker, items in by_speaker.items()},
+        "segments": per_segment,
+    }
+
+
+def _detect_batch(texts: list[str], client: Any) -> list[dict[str, Any]]:
+    documents = [_truncate_utf8(text, MAX_DOCUMENT_BYTES) for text in texts]
+    try:
+        response = client.batch_detect_sentiment(TextList=documents, LanguageCode=get_settings().comprehend_language)
+    except (BotoCoreError, ClientError):
+        return []
+    return response.get("ResultList") or []
+
+
+def _truncate_utf8(text: str, limit: int) -> str:
+    encoded = text.encode("utf-8")
+    if len(encoded) <= limit:
+        return text
+    return encoded[:limit].decode("utf-8", errors="ignore")
+
+
+def _aggregate(items: list[tuple[int, dict[str, Any]]]) -> dict[str, Any]:
+    counts = dict.fromkeys(SENTIMENT_LABELS, 0)
+    if not items:
+        return {"sentiment": "NEUTRAL", "scores": dict(NEUTRAL_SENTIMENT["SentimentScore"]), "counts": counts}
+    total = sum(weight for weight, _ in items)
+    scores = {key: 0.0 for key in ("Positive", "Negative", "Neutral", "Mixed")}
+    for weight, sentiment in items:
+        counts[sentiment["Sentiment"]] = counts.get(sentiment["Sentiment"], 0) + 1
+        for key in scores:
+            scores[key] += sentiment["SentimentScore"].get(key, 0.0) * weight / total
+    dominant = max(scores, key=scores.get).upper()
+    return {"sentiment": dominant, "scores": {key: round(value, 4) for key, value in scores.items()}, "counts": counts}
+
+
+def _neutral() -> dict[str, Any]:
+    return {"Sentiment": NEUTRAL_SENTIMENT["Sentiment"], "SentimentScore": dict(NEUTRAL_SENTIMENT["SentimentScore"])}
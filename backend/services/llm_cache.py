@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """Content-addressed cache for parsed LLM responses: an in-memory LRU over a disk tier.
+
+    Keys are hashes of everything that determines the answer (model, prompt version, inputs),
+    so a changed prompt or transcript simply misses instead of needing invalidation.
+    """
+
+    def __init__(self, directory: Path | None = None, max_entries: int = 1024):
+        self.directory = directory
+        self.max_entries = max(1, max_entries)
+        self._memory: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._remember(key, value)
+            self.writes += 1
+        self._write_disk(key, value)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            }
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> Path | None:
+        return self.directory / key[:2] / f"{key}.json" if self.directory is not None else None
+
+    def _read_disk(self, key: str) -> Any | None:
+        path = self._path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _write_disk(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(json.dumps(value, ensure_ascii=False), encoding="utf-8")
+            tmp_path.replace(path)
+        except OSError:
+            logger.warning("Failed to persist LLM cache entry %s", key, exc_info=True)
+
+
+_cache: LLMResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache | None:
+    """Process-wide cache built from settings, or ``None`` when ``LLM_CACHE_ENABLED`` is off."""
+    global _cache
+    settings = get_settings()
+    if not settings.llm_cache_enabled:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                directory = Path(settings.llm_cache_dir) if settings.llm_cache_dir else Path(__file__).resolve().parents[1] / "data" / "llm_cache"
+                _cache = LLMResponseCache(directory, max_entries=settings.llm_cache_max_entries)
+    return _cache
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Any
+
+from config import get_settings
+
+MODEL_TASKS = ("summarize", "classify", "classify_escalation", "embed")
+LATENCY_SAMPLES = 512
+
+
+def model_for(task: str) -> str:
+    """Bedrock model ID for ``task``; an empty per-task setting falls back to ``BEDROCK_MODEL_ID``.
+
+    ``classify_escalation`` returns ``""`` when no stronger model is configured, which turns
+    escalation off.
+    """
+    if task not in MODEL_TASKS:
+        raise ValueError(f"Unknown model task: {task}")
+    settings = get_settings()
+    if task == "classify_escalation":
+        return settings.bedrock_classify_escalation_model_id
+    return getattr(settings, f"bedrock_{task}_model_id") or settings.bedrock_model_id
+
+
+def token_counts(response: dict[str, Any], content: dict[str, Any]) -> tuple[int, int]:
+    """Input/output token counts from Bedrock's response headers, or the body if they are absent."""
+    headers = (response.get("ResponseMetadata") or {}).get("HTTPHeaders") or {}
+    input_tokens = headers.get("x-amzn-bedrock-input-token-count")
+    output_tokens = headers.get("x-amzn-bedrock-output-token-count")
+    if input_tokens is None:
+        usage = content.get("usage") if isinstance(content.get("usage"), dict) else {}
+        input_tokens = usage.get("input_tokens", content.get("inputTextTokenCount", 0))
+        results = content.get("results")
+        fallback_output = results[0].get("tokenCount", 0) if isinstance(results, list) and results and isinstance(results[0], dict) else 0
+        output_tokens = usage.get("output_tokens", fallback_output)
+    try:
+        return int(input_tokens or 0), int(output_tokens or 0)
+    except (TypeError, ValueError):
+        return 0, 0
+
+
+class ModelUsage:
+    """Per-model call, error, latency and token counters for ``GET /api/poc/stats``."""
+
+    def __init__(self, samples: int = LATENCY_SAMPLES):
+        self.samples = samples
+        self._lock = threading.Lock()
+        self._models: dict[str, dict[str, Any]] = {}
+
+    def record(self, model_id: str, seconds: float, input_tokens: int = 0, output_tokens: int = 0, error: bool = False) -> None:
+        with self._lock:
+            entry = self._models.setdefault(
+                model_id,
+                {"calls": 0, "errors": 0, "input_tokens": 0, "output_tokens": 0, "latencies": deque(maxlen=self.samples)},
+            )
+            entry["calls"] += 1
+            entry["errors"] += int(error)
+            entry["input_tokens"] += input_tokens
+            entry["output_tokens"] += output_tokens
+            entry["latencies"].append(seconds)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            report = {}
+            for model_id, entry in self._models.items():
+                latencies = sorted(entry["latencies"])
+                report[model_id] = {
+                    "calls": entry["calls"],
+                    "errors": entry["errors"],
+                    "input_tokens": entry["input_tokens"],
+                    "output_tokens": entry["output_tokens"],
+                    "latency_avg_ms": round(sum(latencies) / len(latencies) * 1000, 1) if latencies else 0.0,
+                    "latency_p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 1) if latencies else 0.0,
+                }
+            return report
+
+    def reset(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+
+usage = ModelUsage()
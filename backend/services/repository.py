@@ -1,19 +1,51 @@
 from __future__ import annotations
 
 import json
+import sqlite3
 import threading
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import List
 
+from config import get_settings
 from models.meeting_model import Meeting
 
+DATA_DIR = Path(__file__).resolve().parents[1] / 'data'
+MEETING_COLUMNS = ("meeting_id", "title", "status", "scheduled_for", "created_at", "summary_s3_key", "session_id")
+REPOSITORY_BACKENDS = ("json", "sqlite")
+
+
+def _normalize(item: dict) -> dict:
+    now = datetime.now(timezone.utc).isoformat()
+    return {
+        "meeting_id": item.get("meeting_id"),
+        "title": item.get("title", "Untitled meeting"),
+        "status": item.get("status", "scheduled"),
+        "scheduled_for": item.get("scheduled_for") or now,
+        "created_at": item.get("created_at") or item.get("scheduled_for") or now,
+        "summary_s3_key": item.get("summary_s3_key"),
+        "session_id": item.get("session_id"),
+    }
+
+
+def _new_meeting(title: str, scheduled_for: str | None) -> Meeting:
+    now = datetime.now(timezone.utc).isoformat()
+    return Meeting(
+        meeting_id=f"mtg-{int(datetime.now(timezone.utc).timestamp())}",
+        title=title,
+        status='scheduled',
+        scheduled_for=scheduled_for or now,
+        created_at=now,
+        session_id=None,
+        summary_s3_key=None,
+    )
+
 
 class MeetingRepository:
     """JSON-file backed store for meeting metadata."""
 
     def __init__(self, storage_path: Path | None = None):
-        self.storage_path = storage_path or Path(__file__).resolve().parents[1] / 'data' / 'meetings.json'
+        self.storage_path = storage_path or DATA_DIR / 'meetings.json'
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
         self._lock = threading.Lock()
 
@@ -26,30 +58,29 @@ class MeetingRepository:
             return []
 
     def _write_raw(self, payload: list[dict]) -> None:
-        self.storage_path.write_text(json.dumps(payload, indent=2))
-
-    def _normalize(self, item: dict) -> dict:
-        now = datetime.now(timezone.utc).isoformat()
-        return {
-            "meeting_id": item.get("meeting_id"),
-            "title": item.get("title", "Untitled meeting"),
-            "status": item.get("status", "scheduled"),
-            "scheduled_for": item.get("scheduled_for") or now,
-            "created_at": item.get("created_at") or item.get("scheduled_for") or now,
-            "summary_s3_key": item.get("summary_s3_key"),
-            "session_id": item.get("session_id"),
-        }
-
-    def list_meetings(self) -> List[Meeting]:
+        # write-then-rename so a crash never leaves a truncated file behind
+        tmp_path = self.storage_path.with_suffix('.json.tmp')
+        tmp_path.write_text(json.dumps(payload, indent=2))
+        tmp_path.replace(self.storage_path)
+
+    def _filtered(self, status: str | None) -> list[dict]:
         with self._lock:
-            payload = self._read_raw()
-        return [Meeting(**self._normalize(item)) for item in payload]
+            payload = [_normalize(item) for item in self._read_raw()]
+        return [item for item in payload if status is None or item["status"] == status]
+
+    def list_meetings(self, status: str | None = None, limit: int | None = None, offset: int = 0) -> List[Meeting]:
+        payload = self._filtered(status)
+        end = None if limit is None else offset + limit
+        return [Meeting(**item) for item in payload[offset:end]]
+
+    def count_meetings(self, status: str | None = None) -> int:
+        return len(self._filtered(status))
 
     def get_meeting(self, meeting_id: str) -> Meeting | None:
         with self._lock:
             for item in self._read_raw():
                 if item.get("meeting_id") == meeting_id:
-                    return Meeting(**self._normalize(item))
+                    return Meeting(**_normalize(item))
         return None
 
     def _upsert(self, meeting: Meeting) -> None:
@@ -72,15 +103,125 @@ class MeetingRepository:
         return updated
 
     def create_meeting(self, title: str, scheduled_for: str | None = None) -> Meeting:
-        now = datetime.now(timezone.utc).isoformat()
-        meeting = Meeting(
-            meeting_id=f"mtg-{int(datetime.now(timezone.utc).timestamp())}",
-            title=title,
-            status='scheduled',
-            scheduled_for=scheduled_for or now,
-            created_at=now,
-            session_id=None,
-            summary_s3_key=None,
+        meeting = _new_meeting(title, scheduled_for)
+        self._upsert(meeting)
+        return meeting
+
+
+class SqliteMeetingRepository:
+    """SQLite (WAL) backed store for meeting metadata with the same interface as MeetingRepository.
+
+    Reads and writes touch single rows through the primary key or the status index, and
+    every write is an atomic transaction, so cost no longer grows with the number of meetings.
+    """
+
+    def __init__(self, db_path: Path | None = None):
+        self.db_path = db_path or DATA_DIR / 'meetings.db'
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS meetings (
+                    meeting_id TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    scheduled_for TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    summary_s3_key TEXT,
+                    session_id TEXT
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_meetings_status ON meetings (status)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # one connection per thread: FastAPI runs sync handlers on a threadpool
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def list_meetings(self, status: str | None = None, limit: int | None = None, offset: int = 0) -> List[Meeting]:
+        query = f"SELECT {', '.join(MEETING_COLUMNS)} FROM meetings"
+        params: list = []
+        if status is not None:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY rowid LIMIT ? OFFSET ?"
+        params += [-1 if limit is None else limit, offset]
+        rows = self._connect().execute(query, params).fetchall()
+        return [Meeting(**dict(row)) for row in rows]
+
+    def count_meetings(self, status: str | None = None) -> int:
+        if status is None:
+            return self._connect().execute("SELECT COUNT(*) FROM meetings").fetchone()[0]
+        return self._connect().execute("SELECT COUNT(*) FROM meetings WHERE status = ?", (status,)).fetchone()[0]
+
+    def get_meeting(self, meeting_id: str) -> Meeting | None:
+        row = self._connect().execute(
+            f"SELECT {', '.join(MEETING_COLUMNS)} FROM meetings WHERE meeting_id = ?", (meeting_id,)
+        ).fetchone()
+        return Meeting(**dict(row)) if row else None
+
+    def _upsert(self, meeting: Meeting) -> None:
+        data = meeting.dict()
+        assignments = ", ".join(f"{column} = excluded.{column}" for column in MEETING_COLUMNS[1:])
+        sql = (
+            f"INSERT INTO meetings ({', '.join(MEETING_COLUMNS)}) VALUES ({', '.join('?' * len(MEETING_COLUMNS))}) "
+            f"ON CONFLICT(meeting_id) DO UPDATE SET {assignments}"
         )
+        conn = self._connect()
+        with conn:
+            conn.execute(sql, [data[column] for column in MEETING_COLUMNS])
+
+    def update_meeting(self, meeting_id: str, **updates) -> Meeting:
+        current = self.get_meeting(meeting_id)
+        if not current:
+            raise KeyError(f"Meeting {meeting_id} not found")
+        updated = current.copy(update=updates)
+        self._upsert(updated)
+        return updated
+
+    def create_meeting(self, title: str, scheduled_for: str | None = None) -> Meeting:
+        meeting = _new_meeting(title, scheduled_for)
         self._upsert(meeting)
         return meeting
+
+    def import_json(self, json_path: Path) -> int:
+        """Copy meetings from a MeetingRepository JSON file; existing meeting_ids are kept. Returns rows added."""
+        items = MeetingRepository(json_path)._read_raw()
+        rows = [_normalize(item) for item in items if item.get("meeting_id")]
+        conn = self._connect()
+        with conn:
+            before = conn.total_changes
+            conn.executemany(
+                f"INSERT OR IGNORE INTO meetings ({', '.join(MEETING_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(MEETING_COLUMNS))})",
+                [[row[column] for column in MEETING_COLUMNS] for row in rows],
+            )
+            return conn.total_changes - before
+
+
+def create_meeting_repository() -> MeetingRepository | SqliteMeetingRepository:
+    """Repository selected by ``MEETING_REPOSITORY_BACKEND``.
+
+    A freshly created SQLite database imports the legacy ``meetings.json`` once, so switching
+    backends keeps existing meetings.
+    """
+    settings = get_settings()
+    if settings.meeting_repository_backend not in REPOSITORY_BACKENDS:
+        raise ValueError(f"Unknown meeting repository backend: {settings.meeting_repository_backend}")
+    if settings.meeting_repository_backend == "json":
+        return MeetingRepository()
+    db_path = Path(settings.meeting_db_path) if settings.meeting_db_path else DATA_DIR / 'meetings.db'
+    is_new = not db_path.exists()
+    repository = SqliteMeetingRepository(db_path)
+    legacy_path = DATA_DIR / 'meetings.json'
+    if is_new and legacy_path.exists():
+        repository.import_json(legacy_path)
+    return repository
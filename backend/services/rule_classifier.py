@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+# Rule tables for the local first tier of sentence classification. They mirror the rules in
+# the Bedrock classification prompt; a sentence whose best rule is confident enough (and not
+# contradicted by a rule for another label) is labelled here and never sent to the model.
+#
+# Each entry is (rule name, label, pattern, confidence). Patterns run against the normalized
+# sentence (see ``normalize``), so ``^``/``$`` anchor the whole sentence without its final
+# punctuation.
+_NAME = r"[\u30A0-\u30FF\u4E00-\u9FFF]{1,8}"
+_ACKNOWLEDGEMENTS = r"(?:了解(?:しました|です)?|承知(?:しました|いたしました)|大丈夫です|わかりました|分かりました|かしこまりました|お願いします|お願いいたします)"
+# kanji-only predicates that look like a name followed by です
+_NOT_NAMES = r"(?:以上|大丈夫|了解|問題|結構|賛成|反対|同感|同意|未定|不明|本当|無理|可能|必要|不要|十分|心配|残念|完了|対応中|確認中)"
+# last characters of dates, times and documents (「金曜日です」「資料です」), which are never names
+_NOT_NAME_ENDINGS = r"[日週月年時分頃件点案書料題表]"
+# time words and demonstratives that look like an affiliation (「来週の金曜日です」「次の議題です」)
+_NOT_AFFILIATIONS = r"(?:今日|本日|明日|昨日|来週|今週|先週|来月|今月|先月|次|今回|前回|次回|最初|最後|最新|今度|例)"
+
+RULES: list[tuple[str, str, str, float]] = [
+    # 判定ルール 2: お礼・謝罪・あいさつ
+    (
+        "greeting",
+        "コメント",
+        r"^(?:ありがとうございま(?:す|した)|すみません(?:でした)?|申し訳ありません(?:でした)?|失礼(?:しました|いたしました)"
+        r"|お疲れ(?:さま|様)(?:です|でした)|おはようございます|こんにちは|こんばんは|よろしくお願い(?:します|いたします))$",
+        0.97,
+    ),
+    # 判定ルール 2: 固有名詞を含まない短い返事
+    ("acknowledgement", "回答", rf"^(?:(?:はい|ええ)(?:、?{_ACKNOWLEDGEMENTS})?|{_ACKNOWLEDGEMENTS})$", 0.95),
+    # 判定ルール 1: 名乗り・自己紹介（「開発の田中です」）。所属の付いた形だけを確信して扱う
+    (
+        "self_introduction",
+        "報告",
+        rf"^(?!{_NOT_AFFILIATIONS}の)[\u30A0-\u30FF\u4E00-\u9FFFA-Za-z]{{1,10}}の(?!{_NOT_NAMES}です$){_NAME}(?<!{_NOT_NAME_ENDINGS})です$",
+        0.9,
+    ),
+    # 「サトウです」の形は「来週です」「資料です」のような回答と区別できないのでモデルに回す
+    ("bare_introduction", "報告", rf"^(?!{_NOT_NAMES}です$){_NAME}(?<!{_NOT_NAME_ENDINGS})です$", 0.6),
+    # 判定ルール 10: 氏名だけの呼びかけ
+    ("address", "議事進行", rf"^{_NAME}(?:さん|様|くん)$", 0.9),
+    # 開始・終了宣言
+    (
+        "opening_closing",
+        "議事進行",
+        r"^(?:それでは|では)?、?(?:本日の)?(?:会議|ミーティング|定例)?(?:を|は)?(?:始めます|開始します|始めましょう|終わります|終了します|ここまでにします)$",
+        0.95,
+    ),
+    ("agenda", "議事進行", r"(?:本日|今日|きょう)の(?:アジェンダ|議題|テーマ)は", 0.85),
+    # 判定ルール 9: 方針の確定
+    ("decision", "決定", r"(?:で|に)(?:決定|確定)(?:します|しました|です)|この方針で(?:進めます|行きましょう|いきましょう)", 0.9),
+    # 判定ルール 7: 新しい方針の持ちかけ
+    ("proposal", "提案", r"(?:てはどうでしょうか|てはいかがでしょうか|したいと考えています|できればと思います)$", 0.85),
+    # 判定ルール 6: 「か」で終わる文、情報や行動を求める文
+    ("question", "質問", r"(?:ですか|ますか|でしょうか|ませんか|いただけますか|？)$", 0.85),
+    ("request", "質問", r"(?:教えて|確認して)(?:ください|いただけますか)$", 0.85),
+    # keyword cues: too weak to skip the model alone, but used when Bedrock is unavailable
+    ("cue_progress", "議事進行", r"議題|進行|次に|本題|開始|終了", 0.4),
+    ("cue_report", "報告", r"報告|共有|アップデート|結果|進捗|ステータス", 0.4),
+    ("cue_proposal", "提案", r"提案|アイデア|どうでしょう|検討", 0.4),
+    ("cue_consultation", "相談", r"相談|一緒に|助け|サポート|悩んで|迷って", 0.4),
+    ("cue_question", "質問", r"教えて|質問", 0.4),
+    ("cue_answer", "回答", r"回答|説明します|対応します|お答え|承知", 0.4),
+    ("cue_decision", "決定", r"決定|合意|確定|承認|決めましょう", 0.4),
+    ("cue_comment", "コメント", r"ありがとうございます|すみません|助かります|うれしい|心強い", 0.4),
+    # 判定ルール 11: 雑談の話題は質問・提案の形でも雑談を優先するので、他のルールと競合させてモデルに回す
+    ("cue_chatter", "無関係な雑談", r"雑談|世間話|余談|週末|天気|ランチ|カフェ|ケーキ|旅行", 0.5),
+]
+
+# one pattern for all rules: every rule sits in its own optional lookahead, so a single ``finditer``
+# pass reports each rule that matches at each position instead of stopping at the first alternative
+_COMBINED = re.compile("".join(f"(?=(?P<r{idx}>{pattern})?)" for idx, (_, _, pattern, _) in enumerate(RULES)))
+_TRAILING = re.compile(r"[。．.！!、,\s]+$")
+
+
+@dataclass(frozen=True)
+class RuleMatch:
+    label: str
+    confidence: float
+    rule: str
+
+
+def normalize(text: str) -> str:
+    return _TRAILING.sub("", (text or "").strip()).replace("?", "？")
+
+
+def classify_sentence(text: str) -> RuleMatch | None:
+    """Best rule for one sentence, or ``None`` when nothing matches.
+
+    When rules for different labels match, the winner's confidence is reduced by half of the
+    runner-up's, so conflicting evidence (e.g. a question about the weekend) falls below the
+    threshold and is left to the model.
+    """
+    sentence = normalize(text)
+    if not sentence:
+        return None
+    best: dict[str, tuple[float, str]] = {}
+    for match in _COMBINED.finditer(sentence):
+        for group, value in match.groupdict().items():
+            if value is None:
+                continue
+            name, label, _, confidence = RULES[int(group[1:])]
+            if confidence > best.get(label, (0.0, ""))[0]:
+                best[label] = (confidence, name)
+    if not best:
+        return None
+    ranked = sorted(best.items(), key=lambda item: item[1][0], reverse=True)
+    label, (confidence, name) = ranked[0]
+    if len(ranked) > 1:
+        confidence -= ranked[1][1][0] / 2
+    return RuleMatch(label=label, confidence=round(confidence, 3), rule=name)
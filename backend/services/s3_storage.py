@@ -1,54 +1,269 @@
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, TypeVar
 
+from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
 
 from config import get_settings
 from utils.auth_aws import get_session
 
+T = TypeVar("T")
+# returned by S3Storage._call when the local fallback should serve the request
+_FALLBACK: Any = object()
+
+# Errors that prove S3 answered; they should not trip the breaker.
+_NOT_FOUND_CODES = {"NoSuchKey", "404", "NotFound"}
+
+
+class CircuitBreaker:
+    """Stops calling a failing backend after ``failure_threshold`` consecutive failures.
+
+    While open, calls are rejected immediately. After ``reset_timeout`` seconds a single
+    half-open probe is allowed through; its result closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self.last_error: str | None = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self, error: BaseException | None = None) -> None:
+        with self._lock:
+            self._failures += 1
+            self.last_error = repr(error) if error else None
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._probing = False
+
+    def end_probe(self) -> None:
+        """Let another half-open probe through when this one ended without a recorded result."""
+        with self._lock:
+            self._probing = False
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._state(),
+                "consecutive_failures": self._failures,
+                "last_error": self.last_error,
+                "retry_in": (
+                    max(0.0, self.reset_timeout - (self._clock() - self._opened_at)) if self._opened_at is not None else 0.0
+                ),
+            }
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
 
 class S3Storage:
-    """Wrapper that prefers S3 but falls back to local disk for dev."""
+    """Wrapper that prefers S3 but falls back to local disk for dev.
+
+    A circuit breaker remembers that S3 is unreachable, so once it has tripped every call
+    goes straight to the local fallback instead of waiting out connect timeouts and retries.
+    """
 
-    def __init__(self, bucket: str | None = None, client: Any | None = None):
+    def __init__(
+        self,
+        bucket: str | None = None,
+        client: Any | None = None,
+        breaker: CircuitBreaker | None = None,
+        max_pool_connections: int | None = None,
+    ):
         self.settings = get_settings()
         self.bucket = bucket or self.settings.s3_bucket_name
         session = get_session()
-        self.client = client or session.client("s3")
+        self.client = client or session.client(
+            "s3",
+            config=Config(
+                connect_timeout=self.settings.s3_connect_timeout,
+                read_timeout=self.settings.s3_read_timeout,
+                retries={"max_attempts": self.settings.s3_max_attempts, "mode": "standard"},
+                max_pool_connections=max_pool_connections or self.settings.s3_max_pool_connections,
+            ),
+        )
+        self.breaker = breaker or CircuitBreaker(
+            failure_threshold=self.settings.s3_breaker_failure_threshold,
+            reset_timeout=self.settings.s3_breaker_reset_seconds,
+        )
         self._fallback_dir = Path(__file__).resolve().parents[1] / "data" / "s3"
         self._fallback_dir.mkdir(parents=True, exist_ok=True)
 
+    @property
+    def backend(self) -> str:
+        return {"open": "local", "half_open": "s3-half-open"}.get(self.breaker.state, "s3")
+
+    def health(self) -> dict[str, Any]:
+        return {"backend": self.backend, "bucket": self.bucket, **self.breaker.snapshot()}
+
     def list_objects(self, prefix: str = "") -> list[str]:
-        try:
+        def list_keys() -> list[str]:
             paginator = self.client.get_paginator("list_objects_v2")
             keys: list[str] = []
             for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
                 keys.extend(obj["Key"] for obj in page.get("Contents", []))
             return keys
-        except (BotoCoreError, ClientError):
-            base = self._fallback_dir / prefix
-            if not base.exists():
-                return []
-            return [str(path.relative_to(self._fallback_dir)) for path in base.rglob("*") if path.is_file()]
+
+        keys = self._call(list_keys)
+        if keys is not _FALLBACK:
+            return keys
+        base = self._fallback_dir / prefix
+        if not base.exists():
+            return []
+        return [str(path.relative_to(self._fallback_dir)) for path in base.rglob("*") if path.is_file()]
+
+    def read_bytes(self, key: str) -> bytes:
+        data = self._call(lambda: self.client.get_object(Bucket=self.bucket, Key=key)["Body"].read())
+        if data is not _FALLBACK:
+            return data
+        path = self._fallback_dir / key
+        if not path.exists():
+            raise FileNotFoundError(key)
+        return path.read_bytes()
 
     def read_text(self, key: str) -> str:
-        try:
-            response = self.client.get_object(Bucket=self.bucket, Key=key)
-            return response["Body"].read().decode("utf-8")
-        except (BotoCoreError, ClientError):
-            path = self._fallback_dir / key
-            if not path.exists():
-                raise FileNotFoundError(key)
-            return path.read_text(encoding="utf-8")
+        return self.read_bytes(key).decode("utf-8")
+
+    def write_bytes(self, key: str, payload: bytes, content_type: str = "application/octet-stream") -> None:
+        def put() -> None:
+            self.client.put_object(Bucket=self.bucket, Key=key, Body=payload, ContentType=content_type)
+
+        if self._call(put) is not _FALLBACK:
+            return
+        path = self._fallback_dir / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(payload)
 
     def write_json(self, key: str, data: dict) -> None:
-        payload = json.dumps(data, indent=2).encode("utf-8")
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.write_bytes(key, payload, content_type="application/json")
+
+    def delete(self, key: str) -> None:
+        self._call(lambda: self.client.delete_object(Bucket=self.bucket, Key=key))
+        (self._fallback_dir / key).unlink(missing_ok=True)
+
+    def _call(self, operation: Callable[[], T]) -> T:
+        """Run ``operation`` against S3 through the breaker; ``_FALLBACK`` means use the local copy.
+
+        Any exception counts as a failure, and a half-open probe always ends, so an unexpected
+        error cannot leave the breaker waiting for a probe result forever.
+        """
+        if not self.breaker.allow():
+            return _FALLBACK
         try:
-            self.client.put_object(Bucket=self.bucket, Key=key, Body=payload, ContentType="application/json")
-        except (BotoCoreError, ClientError):
-            path = self._fallback_dir / key
-            path.parent.mkdir(parents=True, exist_ok=True)
-            path.write_bytes(payload)
+            result = operation()
+        except (BotoCoreError, ClientError) as exc:
+            self._record_error(exc)
+            return _FALLBACK
+        except Exception as exc:
+            self.breaker.record_failure(exc)
+            raise
+        else:
+            self.breaker.record_success()
+            return result
+        finally:
+            self.breaker.end_probe()
+
+    def _record_error(self, exc: BotoCoreError | ClientError) -> None:
+        if isinstance(exc, ClientError) and exc.response.get("Error", {}).get("Code") in _NOT_FOUND_CODES:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure(exc)
+
+
+class AsyncS3Storage:
+    """Non-blocking facade over :class:`S3Storage` for use from ``async def`` code.
+
+    Calls run on a dedicated thread pool whose size matches the botocore connection pool,
+    so concurrent requests neither block the event loop nor queue for HTTP connections.
+    """
+
+    def __init__(self, storage: S3Storage | None = None, max_workers: int | None = None, bucket: str | None = None):
+        workers = max_workers or get_settings().s3_max_pool_connections
+        self.storage = storage or S3Storage(bucket=bucket, max_pool_connections=workers)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="s3-storage")
+
+    @property
+    def backend(self) -> str:
+        return self.storage.backend
+
+    def health(self) -> dict[str, Any]:
+        return self.storage.health()
+
+    async def list_objects(self, prefix: str = "") -> list[str]:
+        return await self._run(self.storage.list_objects, prefix)
+
+    async def read_bytes(self, key: str) -> bytes:
+        return await self._run(self.storage.read_bytes, key)
+
+    async def read_text(self, key: str) -> str:
+        return await self._run(self.storage.read_text, key)
+
+    async def write_bytes(self, key: str, payload: bytes, content_type: str = "application/octet-stream") -> None:
+        await self._run(self.storage.write_bytes, key, payload, content_type)
+
+    async def write_json(self, key: str, data: dict) -> None:
+        await self._run(self.storage.write_json, key, data)
+
+    async def delete(self, key: str) -> None:
+        await self._run(self.storage.delete, key)
+
+    async def read_many(self, keys: Iterable[str]) -> dict[str, bytes]:
+        """Fetch several objects concurrently; keys that do not exist are left out."""
+        keys = list(keys)
+        results = await asyncio.gather(*(self.read_bytes(key) for key in keys), return_exceptions=True)
+        objects: dict[str, bytes] = {}
+        for key, result in zip(keys, results):
+            if isinstance(result, FileNotFoundError):
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            objects[key] = result
+        return objects
+
+    async def write_many(self, items: dict[str, dict]) -> None:
+        await asyncio.gather(*(self.write_json(key, data) for key, data in items.items()))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
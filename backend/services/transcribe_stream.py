@@ -5,8 +5,7 @@ from typing import Iterable, Iterator, Any
 
 from botocore.exceptions import BotoCoreError, ClientError
 
-from utils.auth_aws import get_session
-from config import get_settings
+from services.aws_clients import get_client
 
 
 class _AudioStream:
@@ -20,9 +19,8 @@ class _AudioStream:
 
 class TranscribeStream:
     def __init__(self, client: Any | None = None):
-        session = get_session()
         # `transcribe-streaming` is not a standalone boto3 service; streaming APIs live under the `transcribe` client.
-        self.client = client or session.client("transcribe", region_name=get_settings().aws_region)
+        self.client = client or get_client("transcribe")
 
     async def start(self, audio_stream: Iterable[bytes] | None = None) -> str:
         chunks = audio_stream or self._silence_chunks()
@@ -9,15 +9,15 @@ from starlette.websockets import WebSocketDisconnect, WebSocketState
 from services.vonage_client import VonageClient
 from services.transcribe_stream import TranscribeStream
 from services.comprehend_utils import analyze_sentiment
-from services.repository import MeetingRepository
+from services.repository import MeetingRepository, SqliteMeetingRepository, create_meeting_repository
 from utils.time_utils import now_iso
 
 
 class SessionController:
-    def __init__(self, repository: MeetingRepository | None = None):
+    def __init__(self, repository: MeetingRepository | SqliteMeetingRepository | None = None):
         self.vonage = VonageClient()
         self.transcribe = TranscribeStream()
-        self.repository = repository or MeetingRepository()
+        self.repository = repository or create_meeting_repository()
 
     def create_session_token(self, meeting_id: str) -> dict:
         meeting = self.repository.get_meeting(meeting_id)
@@ -50,7 +50,7 @@ class SessionController:
         try:
             for idx in range(10):
                 text = f"Sample utterance {idx} for {meeting_id}"
-                sentiment = analyze_sentiment(text)
+                sentiment = await asyncio.to_thread(analyze_sentiment, text)
                 payload = {
                     "meeting_id": meeting_id,
                     "timestamp": now_iso(),
@@ -1,12 +1,14 @@
 import { FormEvent, useEffect, useRef, useState } from 'react';
 import { Layout } from '../components/Layout';
 import type {
+  PocAgendaState,
   PocAnalysisResult,
   PocClassifiedSegment,
   PocCategory,
   PocTranscript,
   PocArchivedJob,
   PocHistoryItem,
+  PocSearchResult,
 } from '../types';
 import {
   analyzePocJob,
@@ -15,6 +17,7 @@ import {
   fetchArchivedJob,
   fetchPocHistory,
   fetchPocJob,
+  searchPocHistory,
   startPocRun,
 } from '../services/api';
 
@@ -31,6 +34,11 @@ const buildWsUrl = (path: string) => {
   return `${origin}${base}${path}`;
 };
 
+// Reconnect with exponential backoff (1s, 2s, 4s, ... capped at 30s) and give up after a few tries.
+const WS_RECONNECT_BASE_MS = 1000;
+const WS_RECONNECT_MAX_MS = 30000;
+const WS_MAX_RECONNECTS = 6;
+
 const CATEGORY_STYLES: Record<PocCategory, string> = {
   議事進行: 'category-agenda',
   報告: 'category-report',
@@ -47,6 +55,8 @@ export function PocPage() {
   const [agendaFile, setAgendaFile] = useState<File | null>(null);
   const [audioFile, setAudioFile] = useState<File | null>(null);
   const [audioPreviewUrl, setAudioPreviewUrl] = useState<string | null>(null);
+  const [pacing, setPacing] = useState<string>('realtime');
+  const [liveClassification, setLiveClassification] = useState(false);
   const [jobId, setJobId] = useState<string | null>(null);
   const [transcripts, setTranscripts] = useState<PocTranscript[]>([]);
   const [status, setStatus] = useState<'idle' | 'streaming' | 'complete'>('idle');
@@ -54,16 +64,28 @@ export function PocPage() {
   const [analysis, setAnalysis] = useState<PocAnalysisResult | null>(null);
   const [jobAgenda, setJobAgenda] = useState<string>('');
   const [classifiedSegments, setClassifiedSegments] = useState<PocClassifiedSegment[]>([]);
+  const [agendaState, setAgendaState] = useState<PocAgendaState>({});
   const [classificationLoading, setClassificationLoading] = useState(false);
   const [history, setHistory] = useState<PocHistoryItem[]>([]);
   const [historyLoading, setHistoryLoading] = useState(false);
+  const [historyCursor, setHistoryCursor] = useState<string | null>(null);
   const [historyPreview, setHistoryPreview] = useState<PocArchivedJob | null>(null);
+  const [searchQuery, setSearchQuery] = useState('');
+  const [searchCategory, setSearchCategory] = useState('');
+  const [searchResult, setSearchResult] = useState<PocSearchResult | null>(null);
   const wsRef = useRef<WebSocket | null>(null);
+  const lastSeqRef = useRef<number | null>(null);
+  const reconnectTimerRef = useRef<number | null>(null);
+  const reconnectAttemptsRef = useRef(0);
   const audioRef = useRef<HTMLAudioElement | null>(null);
 
   useEffect(() => {
     return () => {
+      if (reconnectTimerRef.current !== null) {
+        window.clearTimeout(reconnectTimerRef.current);
+      }
       if (wsRef.current) {
+        wsRef.current.onclose = null;
         wsRef.current.close();
       }
     };
@@ -104,8 +126,9 @@ export function PocPage() {
     const loadHistory = async () => {
       setHistoryLoading(true);
       try {
-        const items = await fetchPocHistory();
-        setHistory(items);
+        const page = await fetchPocHistory();
+        setHistory(page.items);
+        setHistoryCursor(page.next_cursor);
       } catch (err) {
         console.error(err);
       } finally {
@@ -121,6 +144,7 @@ export function PocPage() {
     setAnalysis(null);
     setJobAgenda('');
     setClassifiedSegments([]);
+    setAgendaState({});
     if (!audioFile) {
       setMessage('音声ファイルを選択してください。');
       return;
@@ -130,11 +154,15 @@ export function PocPage() {
       formData.append('agenda', agendaFile);
     }
     formData.append('audio', audioFile);
+    formData.append('pacing', pacing);
+    formData.append('live_classification', String(liveClassification));
     try {
       const response = await startPocRun(formData);
       setJobId(response.job_id);
       setTranscripts([]);
       setStatus('streaming');
+      lastSeqRef.current = null;
+      reconnectAttemptsRef.current = 0;
       connectWebSocket(response.job_id);
       if (audioRef.current && audioPreviewUrl) {
         audioRef.current.currentTime = 0;
@@ -150,14 +178,38 @@ export function PocPage() {
   };
 
   const connectWebSocket = (id: string) => {
+    if (reconnectTimerRef.current !== null) {
+      window.clearTimeout(reconnectTimerRef.current);
+      reconnectTimerRef.current = null;
+    }
     if (wsRef.current) {
+      wsRef.current.onclose = null;
       wsRef.current.close();
     }
-    const ws = new WebSocket(buildWsUrl(`/poc/ws/${id}`));
+    // Resume from the last seen event so a reconnect only receives what was missed.
+    const since = lastSeqRef.current !== null ? `?since=${lastSeqRef.current}` : '';
+    const ws = new WebSocket(buildWsUrl(`/poc/ws/${id}${since}`));
+    let finished = false;
     wsRef.current = ws;
+    ws.onopen = () => {
+      reconnectAttemptsRef.current = 0;
+    };
     ws.onmessage = (event) => {
       const data = JSON.parse(event.data);
-      if (data.type === 'transcript') {
+      if (typeof data.seq === 'number') {
+        lastSeqRef.current = data.seq;
+      }
+      if (data.type === 'snapshot') {
+        const snapshot = data.payload as {
+          status: string;
+          transcripts: PocTranscript[];
+          classified_segments: PocClassifiedSegment[];
+          agenda?: PocAgendaState;
+        };
+        setTranscripts(snapshot.transcripts ?? []);
+        setClassifiedSegments(snapshot.classified_segments ?? []);
+        setAgendaState(snapshot.agenda ?? {});
+      } else if (data.type === 'transcript') {
         const payload = data.payload as PocTranscript;
         const action = (data.action as 'append' | 'update' | undefined) ?? 'append';
         setTranscripts((prev) => {
@@ -181,18 +233,49 @@ export function PocPage() {
           return prev;
         });
       } else if (data.type === 'classification') {
-        setClassifiedSegments(data.payload as PocClassifiedSegment[]);
+        const payload = data.payload as PocClassifiedSegment[];
+        if (data.action === 'delta') {
+          setClassifiedSegments((prev) => {
+            const byIndex = new Map(prev.map((segment) => [segment.index, segment]));
+            payload.forEach((segment) => byIndex.set(segment.index, segment));
+            return Array.from(byIndex.values()).sort((a, b) => a.index - b.index);
+          });
+        } else {
+          setClassifiedSegments(payload);
+        }
+      } else if (data.type === 'agenda') {
+        const { sentences: _sentences, ...state } = data.payload as PocAgendaState & { sentences?: unknown };
+        setAgendaState(state);
+      } else if (data.type === 'resync') {
+        // The server had to drop events we have not seen; reconnect and replay them from data.seq.
+        connectWebSocket(id);
       } else if (data.type === 'complete') {
+        finished = true;
         setStatus('complete');
         setMessage('文字起こしが完了しました。');
         ws.close();
       } else if (data.type === 'error') {
+        finished = true;
         setMessage(data.message);
       }
     };
     ws.onerror = () => setMessage('WebSocket への接続に失敗しました。');
-    ws.onclose = () => {
+    ws.onclose = (event) => {
       wsRef.current = null;
+      if (finished) return;
+      // 4000-4999 are application close codes (e.g. 4404 = unknown job); retrying cannot help.
+      if (event.code >= 4000 && event.code < 5000) {
+        setMessage(event.code === 4404 ? 'ジョブが見つかりません。' : 'WebSocket 接続が終了しました。');
+        return;
+      }
+      const attempt = reconnectAttemptsRef.current + 1;
+      if (attempt > WS_MAX_RECONNECTS) {
+        setMessage('WebSocket に再接続できませんでした。ページを再読み込みしてください。');
+        return;
+      }
+      reconnectAttemptsRef.current = attempt;
+      const delay = Math.min(WS_RECONNECT_BASE_MS * 2 ** (attempt - 1), WS_RECONNECT_MAX_MS);
+      reconnectTimerRef.current = window.setTimeout(() => connectWebSocket(id), delay);
     };
   };
 
@@ -225,8 +308,23 @@ export function PocPage() {
   const refreshHistory = async () => {
     setHistoryLoading(true);
     try {
-      const items = await fetchPocHistory();
-      setHistory(items);
+      const page = await fetchPocHistory();
+      setHistory(page.items);
+      setHistoryCursor(page.next_cursor);
+    } catch (err) {
+      console.error(err);
+    } finally {
+      setHistoryLoading(false);
+    }
+  };
+
+  const loadMoreHistory = async () => {
+    if (!historyCursor) return;
+    setHistoryLoading(true);
+    try {
+      const page = await fetchPocHistory(historyCursor);
+      setHistory((prev) => [...prev, ...page.items]);
+      setHistoryCursor(page.next_cursor);
     } catch (err) {
       console.error(err);
     } finally {
@@ -245,6 +343,20 @@ export function PocPage() {
     }
   };
 
+  const handleSearch = async (event: FormEvent) => {
+    event.preventDefault();
+    if (!searchQuery.trim()) {
+      setSearchResult(null);
+      return;
+    }
+    try {
+      setSearchResult(await searchPocHistory(searchQuery, { category: searchCategory || undefined }));
+    } catch (err) {
+      const text = err instanceof Error ? err.message : '履歴の検索に失敗しました';
+      setMessage(text);
+    }
+  };
+
   const classifyHistory = async (id: string) => {
     setClassificationLoading(true);
     setMessage(null);
@@ -275,9 +387,27 @@ export function PocPage() {
               </label>
               <label className="upload-field">
                 <span>音声ファイル（必須）</span>
-                <input type="file" accept="audio/*" onChange={(event) => setAudioFile(event.target.files?.[0] ?? null)} required />
+                <input type="file" accept=".wav,audio/wav" onChange={(event) => setAudioFile(event.target.files?.[0] ?? null)} required />
                 {audioFile && <small>{audioFile.name}</small>}
               </label>
+              <label className="upload-field">
+                <span>送信速度</span>
+                <select value={pacing} onChange={(event) => setPacing(event.target.value)}>
+                  <option value="realtime">リアルタイム</option>
+                  <option value="4x">4 倍速</option>
+                  <option value="max">最大スループット</option>
+                </select>
+              </label>
+              <label className="upload-field">
+                <span>
+                  <input
+                    type="checkbox"
+                    checked={liveClassification}
+                    onChange={(event) => setLiveClassification(event.target.checked)}
+                  />{' '}
+                  文字起こし中に分類する
+                </span>
+              </label>
               <button type="submit" disabled={status === 'streaming'}>
                 {status === 'streaming' ? '文字起こし中…' : '文字起こしを開始'}
               </button>
@@ -339,6 +469,47 @@ export function PocPage() {
                 {historyLoading ? '更新中…' : '履歴を更新'}
               </button>
             </div>
+            <form className="history-search" onSubmit={handleSearch}>
+              <input
+                type="search"
+                value={searchQuery}
+                placeholder="発言・アジェンダを検索"
+                onChange={(event) => setSearchQuery(event.target.value)}
+              />
+              <select value={searchCategory} onChange={(event) => setSearchCategory(event.target.value)}>
+                <option value="">すべての分類</option>
+                {(Object.keys(CATEGORY_STYLES) as PocCategory[]).map((category) => (
+                  <option key={category} value={category}>
+                    {category}
+                  </option>
+                ))}
+              </select>
+              <button type="submit" className="ghost">
+                検索
+              </button>
+            </form>
+            {searchResult && (
+              <div className="history-list">
+                <p className="label">「{searchResult.query}」の検索結果 {searchResult.total} 件</p>
+                {searchResult.items.map((hit) => (
+                  <article key={`${hit.job_id}-${hit.kind}-${hit.index}`} className="history-item">
+                    <div>
+                      <strong>{hit.archive_name || hit.job_id}</strong>
+                      <p className="label">
+                        {hit.kind === 'agenda' ? 'アジェンダ' : `#${hit.index} ${hit.speaker}`}
+                        {hit.category && ` / ${hit.category}`}
+                      </p>
+                      <p dangerouslySetInnerHTML={{ __html: hit.highlight }} />
+                    </div>
+                    <div className="history-actions">
+                      <button type="button" className="ghost" onClick={() => loadHistoryPreview(hit.job_id)}>
+                        表示
+                      </button>
+                    </div>
+                  </article>
+                ))}
+              </div>
+            )}
             {history.length === 0 && <p className="faded">これまでのアーカイブはまだありません。</p>}
             {history.length > 0 && (
               <div className="history-list">
@@ -362,6 +533,11 @@ export function PocPage() {
                 ))}
               </div>
             )}
+            {historyCursor && (
+              <button type="button" className="ghost" onClick={loadMoreHistory} disabled={historyLoading}>
+                {historyLoading ? '読み込み中…' : 'さらに表示'}
+              </button>
+            )}
             {historyPreview && (
               <div className="history-preview">
                 <p className="label">選択中のアジェンダ</p>
@@ -391,6 +567,11 @@ export function PocPage() {
               <div>
                 <p className="label">リアルタイム文字起こし</p>
                 <h2>{transcripts.length} 行</h2>
+                {agendaState.active_title && (
+                  <p className={`agenda-focus${agendaState.off_topic ? ' off-topic' : ''}`}>
+                    {agendaState.off_topic ? '議題から脱線しています' : `議題: ${agendaState.active_title}`}
+                  </p>
+                )}
               </div>
               {status === 'complete' && (
                 <button type="button" className="ghost" onClick={runAnalysis}>
@@ -431,7 +612,7 @@ export function PocPage() {
             {classificationLoading && <p className="faded">Bedrock にリクエスト中です…</p>}
             {!classificationLoading && (
               <p className="faded">
-                ボタンを押すと、現在までに確定した文字起こしを Bedrock に送り、カテゴリ（議事進行/報告/提案/相談/質問/回答/決定/コメント/無関係な雑談）と議事への適合度(%)を表示します。
+                ボタンを押すと、現在までに確定した文字起こしを Bedrock に送り、カテゴリ（議事進行/報告/提案/相談/質問/回答/決定/コメント/無関係な雑談）を表示します。議事への適合度(%)はアジェンダとの文字 n-gram 類似度からローカルで算出します。
               </p>
             )}
             {classifiedSegments.length > 0 && (
@@ -4,7 +4,8 @@ import type {
   PocClassifiedSegment,
   PocJobDetail,
   PocArchivedJob,
-  PocHistoryItem,
+  PocHistoryPage,
+  PocSearchResult,
 } from '../types';
 
 const API_BASE = import.meta.env.VITE_API_BASE ?? '/api';
@@ -100,8 +101,19 @@ export async function classifyPocJob(
   );
 }
 
-export async function fetchPocHistory(): Promise<PocHistoryItem[]> {
-  return request<PocHistoryItem[]>(`/poc/history`);
+export async function fetchPocHistory(cursor?: string | null): Promise<PocHistoryPage> {
+  const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+  return request<PocHistoryPage>(`/poc/history${query}`);
+}
+
+export async function searchPocHistory(
+  query: string,
+  filters: { speaker?: string; category?: string } = {},
+): Promise<PocSearchResult> {
+  const params = new URLSearchParams({ q: query });
+  if (filters.speaker) params.set('speaker', filters.speaker);
+  if (filters.category) params.set('category', filters.category);
+  return request<PocSearchResult>(`/poc/history/search?${params.toString()}`);
 }
 
 export async function fetchArchivedJob(jobId: string): Promise<PocArchivedJob> {
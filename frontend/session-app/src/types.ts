@@ -47,6 +47,17 @@ export type PocClassifiedSegment = {
   text: string;
   category: PocCategory;
   alignment?: number;
+  agenda_id?: string | null;
+  active_agenda_id?: string | null;
+  off_topic?: boolean;
+  source?: 'rules' | 'bedrock' | 'escalated';
+};
+
+export type PocAgendaState = {
+  active_agenda_id?: string | null;
+  active_title?: string | null;
+  focus?: number;
+  off_topic?: boolean;
 };
 
 export type PocJobDetail = {
@@ -71,9 +82,34 @@ export type PocHistoryItem = {
   completed_at: string;
   agenda_preview: string;
   transcript_count: number;
+  classified_count?: number;
   archive_name?: string;
 };
 
+export type PocHistoryPage = {
+  items: PocHistoryItem[];
+  next_cursor: string | null;
+};
+
+export type PocSearchHit = {
+  job_id: string;
+  kind: 'agenda' | 'segment';
+  index: number | null;
+  speaker: string;
+  category: string;
+  archive_name: string;
+  completed_at: string;
+  text: string;
+  highlight: string;
+  ranges: [number, number][];
+};
+
+export type PocSearchResult = {
+  query: string;
+  items: PocSearchHit[];
+  total: number;
+};
+
 export type PocAnalysisResult = {
   job_id: string;
   agenda_text: string;
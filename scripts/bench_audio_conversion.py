@@ -0,0 +1,54 @@
+"""Compare PoC audio conversion backends in seconds of audio converted per CPU second."""
+import argparse
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'backend'))
+
+from poc.audio import PcmStreamConverter, available_backends  # noqa: E402
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--seconds', type=int, default=120, help='length of the synthetic recording')
+parser.add_argument('--rates', default='44100,48000,8000', help='comma separated source sample rates')
+parser.add_argument('--channels', type=int, default=2)
+parser.add_argument('--width', type=int, default=2, choices=[1, 2, 3, 4])
+parser.add_argument('--repeat', type=int, default=3)
+parser.add_argument('--block-ms', type=int, default=100, help='conversion block size used by the PoC pipeline')
+args = parser.parse_args()
+
+
+def write_wav(path: Path, rate: int) -> None:
+    rng = np.random.default_rng(0)
+    frames = rate * args.seconds
+    signal = rng.normal(0, 0.2, size=(frames, args.channels)).clip(-1, 1)
+    scale = 2 ** (8 * args.width - 1) - 1
+    ints = (signal * scale).astype('<i4')
+    if args.width == 1:
+        data = (ints + 128).astype(np.uint8).tobytes()
+    else:
+        data = ints.view(np.uint8).reshape(-1, 4)[:, : args.width].tobytes()
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(args.channels)
+        wav.setsampwidth(args.width)
+        wav.setframerate(rate)
+        wav.writeframes(data)
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    print(f"{'rate':>6} {'backend':>8} {'cpu_s':>8} {'audio_s/cpu_s':>14}")
+    for rate in (int(value) for value in args.rates.split(',')):
+        path = Path(tmp) / f'bench-{rate}.wav'
+        write_wav(path, rate)
+        for backend in available_backends():
+            best = float('inf')
+            for _ in range(args.repeat):
+                started = time.process_time()
+                for _block in PcmStreamConverter(path, block_ms=args.block_ms, backend=backend).iter_blocks():
+                    pass
+                best = min(best, time.process_time() - started)
+            print(f'{rate:>6} {backend:>8} {best:>8.3f} {args.seconds / best:>14.1f}')
@@ -0,0 +1,61 @@
+"""Per-call latency of a fresh boto3 client per call (old behaviour) vs the shared client registry.
+
+Offline (default) the calls are stubbed, so the numbers isolate client construction cost;
+with --live they hit Comprehend DetectSentiment and also include connection reuse.
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from botocore.stub import Stubber
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'backend'))
+
+from config import get_settings  # noqa: E402
+from services.aws_clients import client_config, get_client, reset_clients  # noqa: E402
+from utils.auth_aws import get_session  # noqa: E402
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--calls', type=int, default=50)
+parser.add_argument('--live', action='store_true', help='call the real Comprehend API (needs credentials)')
+args = parser.parse_args()
+
+TEXT = 'The meeting went well and we agreed on the budget.'
+RESPONSE = {'Sentiment': 'POSITIVE', 'SentimentScore': {'Positive': 0.9, 'Negative': 0.0, 'Neutral': 0.1, 'Mixed': 0.0}}
+
+
+def call(client):
+    if args.live:
+        return client.detect_sentiment(Text=TEXT, LanguageCode='en')
+    with Stubber(client) as stubber:
+        stubber.add_response('detect_sentiment', RESPONSE)
+        return client.detect_sentiment(Text=TEXT, LanguageCode='en')
+
+
+def per_call_client():
+    return get_session().client('comprehend', region_name=get_settings().aws_region)
+
+
+def shared_client():
+    return get_client('comprehend')
+
+
+def measure(factory):
+    samples = []
+    for _ in range(args.calls):
+        started = time.perf_counter()
+        call(factory())
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return statistics.mean(samples), samples[len(samples) // 2], samples[int(len(samples) * 0.95) - 1]
+
+
+reset_clients()
+client_config('comprehend')  # import botocore data files before timing
+get_session().client('comprehend', region_name=get_settings().aws_region)
+print(f"{'mode':>16} {'mean_ms':>8} {'p50_ms':>8} {'p95_ms':>8}")
+for name, factory in (('client per call', per_call_client), ('shared client', shared_client)):
+    mean, p50, p95 = measure(factory)
+    print(f'{name:>16} {mean:>8.2f} {p50:>8.2f} {p95:>8.2f}')
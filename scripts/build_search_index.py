@@ -0,0 +1,43 @@
+"""Add PoC archives created before the full-text search index existed to it (new archives are indexed on write)."""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'backend'))
+
+from config import get_settings  # noqa: E402
+from poc.archive_format import decode_archive  # noqa: E402
+from poc.history_index import ArchiveHistoryIndex  # noqa: E402
+from poc.text_index import TranscriptSearchIndex  # noqa: E402
+from services.s3_storage import AsyncS3Storage  # noqa: E402
+
+settings = get_settings()
+parser = argparse.ArgumentParser()
+parser.add_argument('--bucket', default='meetingpolice-test', help='bucket holding the PoC archives')
+parser.add_argument(
+    '--db',
+    type=Path,
+    default=Path(settings.poc_search_db_path) if settings.poc_search_db_path else Path(__file__).resolve().parents[1] / 'backend' / 'data' / 'poc_search.db',
+)
+args = parser.parse_args()
+
+
+async def main() -> None:
+    storage = AsyncS3Storage(bucket=args.bucket)
+    history = ArchiveHistoryIndex(storage, lambda key, raw: decode_archive(raw))
+    index = TranscriptSearchIndex(args.db)
+    keys, cursor = [], None
+    while True:
+        page, cursor = await history.page(limit=100, cursor=cursor)
+        keys.extend(entry['key'] for entry in page if not index.has_job(entry['job_id']))
+        if not cursor:
+            break
+    documents = 0
+    for key, raw in (await storage.read_many(keys)).items():
+        documents += index.index_job(decode_archive(raw))
+    print(f'indexed {len(keys)} archives ({documents} documents) into {args.db}')
+    storage.close()
+
+
+asyncio.run(main())
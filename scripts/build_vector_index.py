@@ -0,0 +1,60 @@
+"""Backfill the PoC semantic search index from the archived poc/ transcripts."""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'backend'))
+
+from config import get_settings  # noqa: E402
+from poc.archive_format import decode_archive  # noqa: E402
+from poc.history_index import ArchiveHistoryIndex  # noqa: E402
+from poc.vector_index import VectorIndex, archive_rows  # noqa: E402
+from services.bedrock_utils import create_embeddings  # noqa: E402
+from services.s3_storage import AsyncS3Storage  # noqa: E402
+
+settings = get_settings()
+parser = argparse.ArgumentParser()
+parser.add_argument('--bucket', default='meetingpolice-test', help='bucket holding the PoC archives')
+parser.add_argument(
+    '--index-dir',
+    type=Path,
+    default=Path(settings.poc_vector_index_dir) if settings.poc_vector_index_dir else Path(__file__).resolve().parents[1] / 'backend' / 'data' / 'poc_vectors',
+)
+parser.add_argument('--batch-jobs', type=int, default=20, help='archives whose passages are embedded together')
+parser.add_argument('--quantize', action='store_true', default=settings.poc_vector_quantize, help='store int8 vectors (new index only)')
+args = parser.parse_args()
+
+
+async def main() -> None:
+    storage = AsyncS3Storage(bucket=args.bucket)
+    history = ArchiveHistoryIndex(storage, lambda key, raw: decode_archive(raw))
+    index = VectorIndex(args.index_dir, quantize=args.quantize)
+    entries, cursor = [], None
+    while True:
+        page, cursor = await history.page(limit=100, cursor=cursor)
+        entries.extend(entry for entry in page if not index.has_job(entry['job_id']))
+        if not cursor:
+            break
+    print(f'{len(entries)} archives to index')
+
+    added = 0
+    for start in range(0, len(entries), args.batch_jobs):
+        batch = entries[start : start + args.batch_jobs]
+        objects = await storage.read_many([entry['key'] for entry in batch])
+        jobs = [archive_rows(decode_archive(objects[entry['key']])) for entry in batch if entry['key'] in objects]
+        texts = [row['text'] for rows in jobs for row in rows]
+        vectors = await asyncio.to_thread(create_embeddings, texts)
+        offset = 0
+        for rows in jobs:
+            job_vectors = vectors[offset : offset + len(rows)]
+            offset += len(rows)
+            if rows and all(vector is not None for vector in job_vectors):
+                added += index.add(rows, job_vectors)
+            elif rows:
+                print(f'skip {rows[0]["job_id"]}: embedding failed')
+        print(f'{min(start + args.batch_jobs, len(entries))}/{len(entries)} archives, {added} passages added')
+    storage.close()
+
+
+asyncio.run(main())
@@ -0,0 +1,19 @@
+"""One-shot import of backend/data/meetings.json into the SQLite meeting repository."""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'backend'))
+
+from services.repository import DATA_DIR, SqliteMeetingRepository  # noqa: E402
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--source', type=Path, default=DATA_DIR / 'meetings.json', help='MeetingRepository JSON file')
+parser.add_argument('--db', type=Path, default=DATA_DIR / 'meetings.db', help='SQLite database to import into')
+args = parser.parse_args()
+
+if not args.source.exists():
+    sys.exit(f'{args.source} not found')
+repository = SqliteMeetingRepository(args.db)
+added = repository.import_json(args.source)
+print(f'imported {added} meetings into {args.db} ({repository.count_meetings()} total)')
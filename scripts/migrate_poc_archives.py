@@ -0,0 +1,48 @@
+"""Convert legacy poc/*.json archives to the compressed poc/*.json.gz format and rebuild the history index."""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'backend'))
+
+from poc.archive_format import ARCHIVE_CONTENT_TYPE, ARCHIVE_SUFFIX, LEGACY_SUFFIX, decode_archive, encode_archive  # noqa: E402
+from poc.history_index import ARCHIVE_PREFIX, ArchiveHistoryIndex  # noqa: E402
+from services.s3_storage import AsyncS3Storage, S3Storage  # noqa: E402
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--bucket', default='meetingpolice-test', help='bucket holding the PoC archives')
+parser.add_argument('--dry-run', action='store_true', help='report sizes without writing anything')
+parser.add_argument('--keep-source', action='store_true', help='do not delete the legacy .json objects')
+args = parser.parse_args()
+
+storage = S3Storage(bucket=args.bucket)
+legacy_keys = [key for key in storage.list_objects(ARCHIVE_PREFIX) if key.endswith(LEGACY_SUFFIX)]
+before = after = 0
+for key in legacy_keys:
+    raw = storage.read_bytes(key)
+    try:
+        data = decode_archive(raw)
+    except ValueError as exc:
+        print(f'skip {key}: {exc}')
+        continue
+    encoded = encode_archive(data)
+    if decode_archive(encoded) != data:
+        print(f'skip {key}: round trip mismatch')
+        continue
+    target = key[: -len(LEGACY_SUFFIX)] + ARCHIVE_SUFFIX
+    before += len(raw)
+    after += len(encoded)
+    print(f'{key} -> {target}: {len(raw):,} -> {len(encoded):,} bytes')
+    if args.dry_run:
+        continue
+    storage.write_bytes(target, encoded, ARCHIVE_CONTENT_TYPE)
+    if not args.keep_source:
+        storage.delete(key)
+
+if before:
+    print(f'total: {before:,} -> {after:,} bytes ({after / before:.1%})')
+if not args.dry_run:
+    index = ArchiveHistoryIndex(AsyncS3Storage(storage), lambda key, raw: decode_archive(raw))
+    asyncio.run(index.rebuild())
+    print('history index rebuilt')
@@ -16,3 +16,10 @@ def _aws_env(monkeypatch):
     monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
     monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
     monkeypatch.setenv("BEDROCK_MODEL_ID", "anthropic.claude-v2")
+
+
+@pytest.fixture(autouse=True)
+def _isolated_llm_cache(monkeypatch, tmp_path):
+    from services import llm_cache
+
+    monkeypatch.setattr(llm_cache, "_cache", llm_cache.LLMResponseCache(tmp_path / "llm_cache"))
@@ -0,0 +1,48 @@
+from services.agenda_alignment import AgendaAligner, AgendaTracker, annotate_alignment, parse_agenda
+
+AGENDA = "本日の議題\n1. リリース準備の確認\n・10:30-10:45 テスト計画の見直し\n\n- 来期の採用計画\n"
+
+
+def test_parse_agenda_strips_headers_bullets_and_times():
+    items = parse_agenda(AGENDA, "m-1")
+    assert [(item.agenda_id, item.title) for item in items] == [
+        ("agenda-1", "リリース準備の確認"),
+        ("agenda-2", "テスト計画の見直し"),
+        ("agenda-3", "来期の採用計画"),
+    ]
+    assert {item.meeting_id for item in items} == {"m-1"}
+    assert parse_agenda("") == []
+
+
+def test_scores_pick_the_matching_item():
+    scores = AgendaAligner.from_text(AGENDA).score(["リリース準備の状況を確認します。", "採用計画の話です。", "週末はカフェに行きました。"])
+    assert scores.shape == (3, 3)
+    assert scores[0].argmax() == 0 and scores[1].argmax() == 2
+    assert scores[2].max() == 0
+
+
+def test_tracker_follows_the_active_item_and_flags_off_topic():
+    tracker = AgendaTracker(AgendaAligner.from_text(AGENDA))
+    results = tracker.observe(
+        [
+            "それではリリース準備の状況を確認します。",
+            "はい。",
+            "テスト計画ですが、結合テストを見直したいです。",
+            "週末はカフェに行きました。",
+            "ケーキがおいしかったです。",
+            "天気も良くて最高でした。",
+        ]
+    )
+    assert [item["active_agenda_id"] for item in results[:3]] == ["agenda-1", "agenda-1", "agenda-2"]
+    assert results[0]["alignment"] == 100 and results[1]["alignment"] == 0
+    assert results[1]["agenda_id"] is None and not results[1]["off_topic"]
+    assert results[-1]["off_topic"]
+    assert tracker.state()["active_title"] == "テスト計画の見直し"
+    assert tracker.sentences == 6
+
+
+def test_annotate_without_agenda_is_neutral():
+    segments = [{"index": 1, "text": "おはようございます。"}]
+    assert annotate_alignment(segments, "") == [
+        {"index": 1, "text": "おはようございます。", "alignment": 0, "agenda_id": None, "active_agenda_id": None, "off_topic": False}
+    ]
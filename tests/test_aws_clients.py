@@ -0,0 +1,14 @@
+from services import aws_clients
+
+
+def test_clients_are_shared_and_tuned():
+    aws_clients.reset_clients()
+    client = aws_clients.get_client("comprehend")
+
+    assert aws_clients.get_client("comprehend") is client
+    config = client.meta.config
+    assert config.retries["mode"] == "adaptive"
+    assert config.tcp_keepalive is True
+    assert config.max_pool_connections == 16
+    assert aws_clients.client_config("bedrock-runtime").read_timeout > config.read_timeout
+    aws_clients.reset_clients()
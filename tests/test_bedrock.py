@@ -62,3 +62,191 @@ def test_classify_transcript_segments_returns_empty_on_error():
     ]
     results = bedrock_utils.classify_transcript_segments(inputs, client=ErrorClient())
     assert results == []
+
+
+def test_classify_transcript_segments_windows_long_meetings():
+    class WindowClient:
+        def __init__(self):
+            self.calls = []
+            self.contexts = {}
+
+        def invoke_model(self, **kwargs):
+            payload = json.loads(kwargs["body"])
+            prompt = payload.get("prompt") or payload["messages"][0]["content"][0]["text"]
+            segments = json.loads(prompt.rsplit("\n", 1)[-1])
+            context = json.loads(prompt.split("文脈です。", 1)[1].split("\n")[1]) if "文脈です。" in prompt else []
+            self.calls.append((payload.get("maxTokens") or payload.get("max_tokens"), [item["index"] for item in segments]))
+            self.contexts[segments[0]["index"]] = [item["index"] for item in context]
+            body = {"classifications": [{"index": item["index"], "category": "報告"} for item in segments]}
+            return {"body": BytesIO(json.dumps(body).encode("utf-8"))}
+
+    inputs = [{"index": idx, "speaker": "A", "text": "議題とは関係のない内容を話しています" * 5} for idx in range(1, 401)]
+    client = WindowClient()
+    results = bedrock_utils.classify_transcript_segments(inputs, client=client)
+
+    assert [item["index"] for item in results] == list(range(1, 401))
+    assert all(item["category"] == "報告" for item in results)
+    assert len(client.calls) > 1
+    covered = sorted(idx for _, indexes in client.calls for idx in indexes)
+    assert covered == list(range(1, 401))
+    # overlapping neighbours are sent as context only, never as sentences to label
+    for _, indexes in client.calls:
+        context = client.contexts[indexes[0]]
+        assert context and not set(context) & set(indexes)
+        assert {min(indexes) - 1, max(indexes) + 1} & set(context)
+    assert all(max_tokens < 4096 for max_tokens, _ in client.calls)
+
+
+def test_long_transcripts_are_summarized_per_chunk_and_reused(monkeypatch):
+    settings = bedrock_utils.get_settings()
+    monkeypatch.setattr(settings, "bedrock_summary_chunk_tokens", 40)
+
+    class RecordingClient:
+        def __init__(self):
+            self.prompts = []
+
+        def invoke_model(self, **kwargs):
+            payload = json.loads(kwargs["body"])
+            prompt = payload.get("prompt") or payload["messages"][0]["content"][0]["text"]
+            self.prompts.append(prompt)
+            body = {"outputText": f"要約{len(self.prompts)}"}
+            return {"body": BytesIO(json.dumps(body).encode("utf-8"))}
+
+    lines = [f"話者{idx % 2}: 議題{idx}について確認しました" for idx in range(12)]
+    client = RecordingClient()
+    result = bedrock_utils.summarize_transcript("mtg-1", "\n".join(lines), client=client)
+
+    chunk_prompts = [prompt for prompt in client.prompts if "番目の区間" in prompt]
+    assert len(chunk_prompts) > 1
+    assert "議題11" in "".join(chunk_prompts)
+    assert result["summary"].startswith("要約")
+
+    client.prompts.clear()
+    lines.append("話者0: 最後に追加された発言です")
+    bedrock_utils.summarize_transcript("mtg-1", "\n".join(lines), client=client)
+    resent = [prompt for prompt in client.prompts if "番目の区間" in prompt]
+    assert len(resent) < len(chunk_prompts)
+    assert "最後に追加された発言" in resent[-1]
+
+
+def test_confident_rule_matches_skip_bedrock():
+    class SelectiveClient:
+        def __init__(self):
+            self.sent = []
+
+        def invoke_model(self, **kwargs):
+            payload = json.loads(kwargs["body"])
+            prompt = payload.get("prompt") or payload["messages"][0]["content"][0]["text"]
+            segments = json.loads(prompt.rsplit("\n", 1)[-1])
+            self.sent.extend(item["text"] for item in segments)
+            body = {"classifications": [{"index": item["index"], "category": "無関係な雑談"} for item in segments]}
+            return {"body": BytesIO(json.dumps(body).encode("utf-8"))}
+
+    inputs = [
+        {"index": 1, "speaker": "A", "text": "おはようございます。"},
+        {"index": 2, "speaker": "B", "text": "開発のサトウです。"},
+        {"index": 3, "speaker": "A", "text": "ありがとうございます。"},
+        {"index": 4, "speaker": "B", "text": "雑談ですが週末はどうでしたか"},
+        {"index": 5, "speaker": "A", "text": "はい、承知しました。"},
+        # short answers shaped like a bare self-introduction are left to the model
+        {"index": 6, "speaker": "B", "text": "来週です。"},
+        {"index": 7, "speaker": "B", "text": "金曜日です"},
+        {"index": 8, "speaker": "B", "text": "資料です"},
+        {"index": 9, "speaker": "B", "text": "ミーティングです"},
+        {"index": 10, "speaker": "B", "text": "サトウです。"},
+    ]
+    client = SelectiveClient()
+    results = bedrock_utils.classify_transcript_segments(inputs, client=client)
+
+    assert client.sent == ["雑談ですが週末はどうでしたか", "来週です。", "金曜日です", "資料です", "ミーティングです", "サトウです。"]
+    assert [item["category"] for item in results][:5] == ["コメント", "報告", "コメント", "無関係な雑談", "回答"]
+    assert [item["source"] for item in results] == ["rules", "rules", "rules"] + ["bedrock", "rules"] + ["bedrock"] * 5
+
+
+def test_low_confidence_sentences_escalate_to_the_strong_model(monkeypatch):
+    from services.model_router import usage
+
+    settings = bedrock_utils.get_settings()
+    monkeypatch.setattr(settings, "bedrock_classify_model_id", "fast-model")
+    monkeypatch.setattr(settings, "bedrock_classify_escalation_model_id", "strong-model")
+    usage.reset()
+
+    class RoutingClient:
+        def __init__(self):
+            self.calls = []
+
+        def invoke_model(self, **kwargs):
+            payload = json.loads(kwargs["body"])
+            segments = json.loads(payload["prompt"].rsplit("\n", 1)[-1])
+            self.calls.append((kwargs["modelId"], [item["index"] for item in segments]))
+            if kwargs["modelId"] == "fast-model":
+                answers = [
+                    {"index": 1, "category": "報告", "confidence": 90},
+                    {"index": 2, "category": "提案", "confidence": 30},
+                ]
+            else:
+                answers = [{"index": item["index"], "category": "相談", "confidence": 80} for item in segments]
+            body = {"classifications": answers, "usage": {"input_tokens": 100, "output_tokens": 20}}
+            return {"body": BytesIO(json.dumps(body).encode("utf-8"))}
+
+    inputs = [
+        {"index": 1, "speaker": "A", "text": "進捗を共有します"},
+        {"index": 2, "speaker": "B", "text": "この件でどうするか迷っています"},
+        {"index": 3, "speaker": "A", "text": "別の担当とも話しておきます"},
+    ]
+    client = RoutingClient()
+    results = bedrock_utils.classify_transcript_segments(inputs, client=client)
+
+    assert client.calls == [("fast-model", [1, 2, 3]), ("strong-model", [2, 3])]
+    assert [(item["category"], item["source"]) for item in results] == [
+        ("報告", "bedrock"),
+        ("相談", "escalated"),
+        ("相談", "escalated"),
+    ]
+    stats = usage.stats()
+    assert stats["fast-model"]["calls"] == 1
+    assert stats["strong-model"]["input_tokens"] == 100
+
+
+def test_failed_summary_chunks_mark_the_summary_partial(monkeypatch):
+    settings = bedrock_utils.get_settings()
+    monkeypatch.setattr(settings, "bedrock_summary_chunk_tokens", 40)
+
+    class FlakyClient:
+        def __init__(self):
+            self.reduce_prompts = []
+
+        def invoke_model(self, **kwargs):
+            payload = json.loads(kwargs["body"])
+            prompt = payload.get("prompt") or payload["messages"][0]["content"][0]["text"]
+            if "の 1 番目の区間です" in prompt:
+                raise ClientError({"Error": {"Code": "Throttling", "Message": "slow down"}}, "InvokeModel")
+            if "番目の区間です" not in prompt:
+                self.reduce_prompts.append(prompt)
+            return {"body": BytesIO(json.dumps({"outputText": "要約"}).encode("utf-8"))}
+
+    lines = [f"話者{idx % 2}: 議題{idx}について確認しました" for idx in range(12)]
+    client = FlakyClient()
+    result = bedrock_utils.summarize_transcript("mtg-1", "\n".join(lines), client=client)
+
+    assert result["partial"] is True
+    assert result["missing_chunks"] == 1 and result["total_chunks"] > 1
+    assert "議題0" in "".join(client.reduce_prompts)
+    assert "partial" not in bedrock_utils.summarize_transcript("mtg-1", "hello", client=FakeBedrockClient())
+
+
+def test_embeddings_stay_out_of_the_llm_cache():
+    from services.llm_cache import get_llm_cache
+
+    class EmbeddingClient:
+        def __init__(self):
+            self.calls = 0
+
+        def invoke_model(self, **kwargs):
+            self.calls += 1
+            return {"body": BytesIO(json.dumps({"embedding": [0.1, 0.2, 0.3]}).encode("utf-8"))}
+
+    client = EmbeddingClient()
+    assert bedrock_utils.create_embeddings(["議題1", "議題2"], client=client) == [[0.1, 0.2, 0.3]] * 2
+    assert client.calls == 2
+    assert get_llm_cache().stats()["writes"] == 0
@@ -1,2 +1,43 @@
 def test_placeholder():
     assert True
+
+
+class BatchClient:
+    def __init__(self):
+        self.batches = []
+
+    def batch_detect_sentiment(self, TextList, LanguageCode):
+        self.batches.append(list(TextList))
+        results = []
+        for idx, text in enumerate(TextList):
+            positive = "良い" in text
+            results.append(
+                {
+                    "Index": idx,
+                    "Sentiment": "POSITIVE" if positive else "NEGATIVE",
+                    "SentimentScore": {
+                        "Positive": 0.9 if positive else 0.1,
+                        "Negative": 0.1 if positive else 0.9,
+                        "Neutral": 0.0,
+                        "Mixed": 0.0,
+                    },
+                }
+            )
+        return {"ResultList": results, "ErrorList": []}
+
+
+def test_segments_are_batched_and_aggregated():
+    from services.comprehend_utils import analyze_segments_sentiment
+
+    segments = [{"index": idx, "speaker": "A" if idx % 2 else "B", "text": "良い案です" if idx % 2 else "困ります"} for idx in range(60)]
+    segments.append({"index": 60, "speaker": "B", "text": "  "})
+    client = BatchClient()
+    result = analyze_segments_sentiment(segments, client=client)
+
+    assert sorted(len(batch) for batch in client.batches) == [10, 25, 25]
+    assert len(result["segments"]) == 61
+    assert result["segments"][1]["sentiment"] == "POSITIVE"
+    assert result["segments"][60]["sentiment"] == "NEUTRAL"
+    assert result["speakers"]["A"]["sentiment"] == "POSITIVE"
+    assert result["speakers"]["B"]["counts"]["NEGATIVE"] == 30
+    assert result["counts"] == {"POSITIVE": 30, "NEGATIVE": 30, "NEUTRAL": 0, "MIXED": 0}
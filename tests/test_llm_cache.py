@@ -0,0 +1,38 @@
+import json
+from io import BytesIO
+
+from services import bedrock_utils, llm_cache
+from services.llm_cache import LLMResponseCache
+
+
+class CountingClient:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke_model(self, **kwargs):
+        self.calls += 1
+        return {"body": BytesIO(json.dumps({"outputText": "要約です"}).encode("utf-8"))}
+
+
+def test_repeated_summaries_are_served_from_cache():
+    client = CountingClient()
+    first = bedrock_utils.summarize_transcript("job1", "A: こんにちは", client=client)
+    second = bedrock_utils.summarize_transcript("job1", "A: こんにちは", client=client)
+    bedrock_utils.summarize_transcript("job1", "A: こんばんは", client=client)
+
+    assert first == second
+    assert client.calls == 2
+    stats = llm_cache._cache.stats()
+    assert (stats["memory_hits"], stats["misses"], stats["writes"]) == (1, 2, 2)
+
+
+def test_disk_tier_survives_a_new_process(tmp_path):
+    cache = LLMResponseCache(tmp_path, max_entries=1)
+    cache.put("a" * 64, [{"index": 1, "category": "報告"}])
+    cache.put("b" * 64, "summary")
+
+    fresh = LLMResponseCache(tmp_path)
+    assert fresh.get("a" * 64) == [{"index": 1, "category": "報告"}]
+    assert fresh.get("c" * 64) is None
+    assert fresh.stats()["disk_hits"] == 1
+    assert len(cache._memory) == 1
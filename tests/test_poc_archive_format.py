@@ -0,0 +1,51 @@
+import gzip
+import json
+
+import pytest
+
+from poc.archive_format import decode_archive, encode_archive
+
+
+def _payload(rows=200):
+    return {
+        "job_id": "job1",
+        "agenda_text": "1. 予算\n2. 採用",
+        "completed_at": "2024-01-01 10:00:00",
+        "transcripts": [
+            {
+                "index": idx,
+                "speaker": f"話者{idx % 3 + 1}",
+                "raw_speaker": f"spk_{idx % 3}",
+                "result_id": f"result-{idx}",
+                "text": "来期の予算について確認します。",
+                "timestamp": "2024-01-01 10:00:00",
+            }
+            for idx in range(1, rows + 1)
+        ],
+        "classified_segments": [],
+        "archive_name": "予算",
+    }
+
+
+def test_compact_archive_round_trips_and_is_smaller():
+    payload = _payload()
+    payload["transcripts"][3].pop("raw_speaker")
+    payload["transcripts"][4]["raw_speaker"] = None
+    encoded = encode_archive(payload)
+
+    assert decode_archive(encoded) == payload
+    legacy = json.dumps(payload, indent=2).encode("utf-8")
+    assert len(encoded) * 10 < len(legacy)
+    assert encode_archive(payload) == encoded
+
+
+def test_legacy_archives_are_read_transparently():
+    payload = _payload(rows=2)
+    assert decode_archive(json.dumps(payload, indent=2).encode("utf-8")) == payload
+    assert decode_archive(json.dumps(payload)) == payload
+
+
+def test_unknown_future_format_is_rejected():
+    raw = gzip.compress(json.dumps({"format": 99, "transcripts": {}}).encode("utf-8"))
+    with pytest.raises(ValueError):
+        decode_archive(raw)
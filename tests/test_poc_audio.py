@@ -0,0 +1,115 @@
+import io
+import math
+import struct
+import wave
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from poc.audio import AudioValidationError, NumpyBlockConverter, PcmStreamConverter, WavInfo, parse_wav_header
+from poc.routes import router
+
+
+def _wav_bytes(channels=2, rate=44100, width=2, frames=441):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(width)
+        wav.setframerate(rate)
+        wav.writeframes(b"\x01\x00" * channels * frames * (width // 2 or 1))
+    return buffer.getvalue()
+
+
+def test_parse_wav_header_reads_format():
+    info = parse_wav_header(_wav_bytes()[:64])
+    assert (info.channels, info.sample_rate, info.sample_width) == (2, 44100, 2)
+    assert info.data_offset == 44
+    assert info.data_size == 441 * 4
+
+
+@pytest.mark.parametrize("payload", [b"", b"ID3\x03" + b"\x00" * 60, b"RIFF\x00\x00\x00\x00AVI " + b"\x00" * 40])
+def test_parse_wav_header_rejects_non_wav(payload):
+    with pytest.raises(AudioValidationError):
+        parse_wav_header(payload)
+
+
+def test_start_rejects_invalid_audio_before_creating_job():
+    app = FastAPI()
+    app.include_router(router, prefix="/api/poc")
+    client = TestClient(app)
+    response = client.post("/api/poc/start", files={"audio": ("clip.mp3", b"ID3\x03" + b"\x00" * 128, "audio/mpeg")})
+    assert response.status_code == 400
+
+
+def _write_tone(path, rate=44100, frames=44100, freq=440):
+    samples = [int(8000 * math.sin(2 * math.pi * freq * n / rate)) for n in range(frames)]
+    raw = b"".join(struct.pack("<hh", value, -value // 2) for value in samples)
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(raw)
+    return raw
+
+
+def test_stream_converter_matches_whole_file_conversion(tmp_path):
+    path = tmp_path / "tone.wav"
+    raw = _write_tone(path)
+    audioop = pytest.importorskip("audioop")
+
+    expected, _ = audioop.ratecv(audioop.tomono(raw, 2, 0.5, 0.5), 2, 1, 44100, 16000, None)
+    converter = PcmStreamConverter(path, block_ms=37, backend="audioop")
+    chunks = list(converter.iter_chunks(1600))
+
+    assert converter.sample_rate == 16000
+    assert all(len(chunk) == 1600 for chunk in chunks[:-1])
+    assert b"".join(chunks) == expected
+
+
+def test_numpy_backend_resamples_blockwise_like_whole_file(tmp_path):
+    path = tmp_path / "tone.wav"
+    _write_tone(path)
+
+    blockwise = b"".join(PcmStreamConverter(path, block_ms=37, backend="numpy").iter_blocks())
+    whole = b"".join(PcmStreamConverter(path, block_ms=2000, backend="numpy").iter_blocks())
+    output = np.frombuffer(blockwise, dtype="<i2")
+
+    assert output.size == 16000
+    assert np.abs(output.astype(np.int32) - np.frombuffer(whole, dtype="<i2")).max() <= 1
+    spectrum = np.abs(np.fft.rfft(output))
+    assert abs(int(spectrum.argmax()) - 440) <= 1
+
+
+@pytest.mark.parametrize("width", [1, 3, 4])
+def test_numpy_backend_width_conversion_matches_audioop(width):
+    audioop = pytest.importorskip("audioop")
+    raw = bytes(range(256)) * width * 3
+    info = WavInfo(channels=1, sample_rate=16000, sample_width=width, data_offset=44, data_size=len(raw))
+    source = audioop.bias(raw, 1, -128) if width == 1 else raw
+    assert NumpyBlockConverter(info).convert(raw) == audioop.lin2lin(source, width, 2)
+
+
+def test_auto_backend_prefers_numpy_and_falls_back_to_audioop(monkeypatch):
+    from poc import audio
+
+    assert audio.resolve_backend("auto") == "numpy"
+    pytest.importorskip("audioop")
+    monkeypatch.setattr(audio, "np", None)
+    assert audio.resolve_backend("auto") == "audioop"
+
+
+@pytest.mark.parametrize("rate", [8000, 44100, 44099, 48000])
+def test_resampler_output_does_not_depend_on_block_sizes(rate):
+    from poc.audio import PolyphaseResampler
+
+    rng = np.random.default_rng(rate)
+    signal = (rng.standard_normal(rate) * 3000).astype(np.float32)
+    whole = PolyphaseResampler(rate, 16000).process(signal)
+    resampler = PolyphaseResampler(rate, 16000)
+    cuts = np.cumsum(rng.integers(1, 3000, size=rate // 1000))
+    pieces = [resampler.process(piece) for piece in np.split(signal, cuts[cuts < signal.size])]
+
+    assert whole.size == 16000
+    assert np.allclose(np.concatenate(pieces), whole, atol=0.01)
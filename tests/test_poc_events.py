@@ -0,0 +1,111 @@
+import pytest
+
+from poc.events import JobEventHub, SlowConsumerError
+
+
+def _transcript(result_id, text, action="update"):
+    return {"type": "transcript", "action": action, "payload": {"result_id": result_id, "text": text}}
+
+
+@pytest.mark.asyncio
+async def test_every_subscriber_receives_every_event():
+    hub = JobEventHub(buffer_size=8)
+    first, _ = hub.subscribe()
+    second, _ = hub.subscribe()
+    hub.publish({"type": "transcript", "payload": {"index": 1}})
+    hub.publish({"type": "complete"})
+
+    for subscription in (first, second):
+        assert (await subscription.get())["type"] == "transcript"
+        assert (await subscription.get())["type"] == "complete"
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_only_drops_superseded_updates():
+    hub = JobEventHub(buffer_size=3, policy="drop_oldest")
+    subscription, _ = hub.subscribe()
+    hub.publish(_transcript("r1", "こん", action="append"))
+    await subscription.get()
+    hub.publish(_transcript("r1", "こんに"))
+    hub.publish(_transcript("r1", "こんにちは"))
+    hub.publish(_transcript("r2", "はい", action="append"))
+    hub.publish(_transcript("r2", "はい、どうぞ"))
+    hub.publish(_transcript("r3", "次", action="append"))
+
+    assert subscription.dropped == 2
+    messages = [await subscription.get() for _ in range(3)]
+    assert [(message["action"], message["payload"]["text"]) for message in messages] == [
+        ("update", "こんにちは"),
+        ("append", "はい、どうぞ"),
+        ("append", "次"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_asks_for_resync_instead_of_dropping_appends():
+    hub = JobEventHub(buffer_size=2, policy="drop_oldest")
+    subscription, _ = hub.subscribe()
+    hub.publish({"type": "status", "status": "processing"})
+    await subscription.get()
+    hub.publish(_transcript("r1", "a", action="append"))
+    hub.publish({"type": "classification", "action": "delta", "payload": []})
+    hub.publish(_transcript("r2", "b", action="append"))
+
+    assert hub.subscriber_count == 0
+    assert await subscription.get() == {"type": "resync", "seq": 1}
+    with pytest.raises(SlowConsumerError):
+        await subscription.get()
+    assert [message["seq"] for message in hub.events_since(1)] == [2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_merges_updates_for_same_result():
+    hub = JobEventHub(buffer_size=4, policy="coalesce")
+    subscription, _ = hub.subscribe()
+    hub.publish(_transcript("r1", "こん", action="append"))
+    hub.publish(_transcript("r1", "こんにち"))
+    hub.publish(_transcript("r1", "こんにちは"))
+
+    assert len(subscription) == 1
+    message = await subscription.get()
+    assert message["action"] == "append"
+    assert message["payload"]["text"] == "こんにちは"
+
+
+@pytest.mark.asyncio
+async def test_disconnect_policy_cuts_off_slow_subscriber():
+    hub = JobEventHub(buffer_size=1, policy="disconnect")
+    slow, _ = hub.subscribe()
+    hub.publish({"type": "transcript", "payload": {"index": 1}})
+    hub.publish({"type": "transcript", "payload": {"index": 2}})
+
+    assert hub.subscriber_count == 0
+    with pytest.raises(SlowConsumerError):
+        await slow.get()
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        JobEventHub(policy="block")
+
+
+def test_events_are_sequenced_and_resumable():
+    hub = JobEventHub(log_size=8)
+    for idx in range(5):
+        hub.publish({"type": "transcript", "payload": {"index": idx}})
+
+    _, missed = hub.subscribe(since=3)
+    assert [message["seq"] for message in missed] == [4, 5]
+    _, missed = hub.subscribe(since=5)
+    assert missed == []
+
+
+def test_resume_beyond_log_requires_snapshot():
+    hub = JobEventHub(log_size=2)
+    for idx in range(5):
+        hub.publish({"type": "transcript", "payload": {"index": idx}})
+
+    _, missed = hub.subscribe(since=1)
+    assert missed is None
+    _, missed = hub.subscribe(since=99)
+    assert missed is None
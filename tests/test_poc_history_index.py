@@ -0,0 +1,122 @@
+import asyncio
+import json
+
+import pytest
+
+from poc.archive_format import decode_archive, encode_archive
+from poc.history_index import ENTRY_PREFIX, MANIFEST_KEY, ArchiveHistoryIndex
+from services.s3_storage import AsyncS3Storage
+
+
+class MemoryStorage:
+    def __init__(self):
+        self.objects = {}
+        self.reads = []
+
+    def list_objects(self, prefix=""):
+        return [key for key in self.objects if key.startswith(prefix)]
+
+    def read_bytes(self, key):
+        self.reads.append(key)
+        if key not in self.objects:
+            raise FileNotFoundError(key)
+        return self.objects[key]
+
+    def read_text(self, key):
+        return self.read_bytes(key).decode("utf-8")
+
+    def write_bytes(self, key, payload, content_type=None):
+        self.objects[key] = payload
+
+    def write_json(self, key, data):
+        self.objects[key] = json.dumps(data).encode("utf-8")
+
+    def delete(self, key):
+        self.objects.pop(key, None)
+
+
+def _archive(job_id, completed_at):
+    return {"job_id": job_id, "completed_at": completed_at, "agenda_text": "議題" * 100, "transcripts": [{"text": "a"}]}
+
+
+def _index(storage, max_age=None):
+    return ArchiveHistoryIndex(AsyncS3Storage(storage, max_workers=2), lambda key, raw: decode_archive(raw), max_age=max_age)
+
+
+@pytest.mark.asyncio
+async def test_index_bootstraps_from_existing_archives():
+    storage = MemoryStorage()
+    storage.write_json("poc/a-job1.json", _archive("job1", "2024-01-01 10:00:00"))
+    storage.write_json("poc/b-job2.json", _archive("job2", "2024-01-01 09:00:00"))
+    # a migrated copy of job2 must win over the leftover legacy object
+    storage.write_bytes("poc/b-job2.json.gz", encode_archive(_archive("job2", "2024-01-02 10:00:00")))
+
+    index = _index(storage)
+    items, cursor = await index.page(limit=10)
+
+    assert [item["job_id"] for item in items] == ["job2", "job1"]
+    assert items[0]["agenda_preview"] == ("議題" * 100)[:80]
+    assert cursor is None
+    assert MANIFEST_KEY in storage.objects
+    assert await index.lookup("job1") == "poc/a-job1.json"
+    assert await index.lookup("job2") == "poc/b-job2.json.gz"
+
+
+@pytest.mark.asyncio
+async def test_cursor_pagination_and_lookup_do_not_read_archives():
+    storage = MemoryStorage()
+    index = _index(storage)
+    await index.page()
+    for day in range(1, 6):
+        data = _archive(f"job{day}", f"2024-01-0{day} 10:00:00")
+        await index.record(ArchiveHistoryIndex.entry_for(f"poc/job{day}.json", data))
+
+    storage.reads.clear()
+    first, cursor = await index.page(limit=2)
+    second, cursor = await index.page(limit=2, cursor=cursor)
+    third, cursor = await index.page(limit=2, cursor=cursor)
+
+    assert [item["job_id"] for item in first + second + third] == ["job5", "job4", "job3", "job2", "job1"]
+    assert cursor is None
+    assert await index.lookup("job3") == "poc/job3.json"
+    assert storage.reads == []
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_is_rejected():
+    index = _index(MemoryStorage())
+    with pytest.raises(ValueError):
+        await index.page(cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writers_keep_each_others_entries():
+    storage = MemoryStorage()
+    first, second = _index(storage, max_age=0), _index(storage, max_age=0)
+    await first.page()
+    await second.page()
+
+    await asyncio.gather(
+        first.record(ArchiveHistoryIndex.entry_for("poc/job1.json", _archive("job1", "2024-01-01 10:00:00"))),
+        second.record(ArchiveHistoryIndex.entry_for("poc/job2.json", _archive("job2", "2024-01-02 10:00:00"))),
+    )
+
+    assert await first.lookup("job2") == "poc/job2.json"
+    assert [item["job_id"] for item in (await _index(storage).page())[0]] == ["job2", "job1"]
+
+
+@pytest.mark.asyncio
+async def test_rebuild_after_migration_replaces_recorded_keys():
+    storage = MemoryStorage()
+    worker = _index(storage, max_age=0)
+    await worker.page()
+    storage.write_json("poc/job1.json", _archive("job1", "2024-01-01 10:00:00"))
+    await worker.record(ArchiveHistoryIndex.entry_for("poc/job1.json", _archive("job1", "2024-01-01 10:00:00")))
+
+    # what scripts/migrate_poc_archives.py does
+    storage.write_bytes("poc/job1.json.gz", encode_archive(_archive("job1", "2024-01-01 10:00:00")))
+    storage.delete("poc/job1.json")
+    await _index(storage).rebuild()
+
+    assert not [key for key in storage.objects if key.startswith(ENTRY_PREFIX)]
+    assert await worker.lookup("job1") == "poc/job1.json.gz"
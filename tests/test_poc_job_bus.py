@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from poc.controller import POCController, PocJob
+from poc.job_bus import SqliteJobBus
+
+
+@pytest.mark.asyncio
+async def test_sqlite_bus_round_trips_state_events_and_inbox(tmp_path):
+    bus = SqliteJobBus(tmp_path / "bus.db", log_size=2, poll_seconds=0.01)
+    for seq in range(1, 5):
+        await bus.append("job1", {"type": "transcript", "seq": seq})
+    await bus.put_state("job1", {"owner": "a", "seq": 4})
+
+    assert (await bus.get_state("job1"))["owner"] == "a"
+    assert [message["seq"] for message in await bus.read("job1", 1, timeout=0)] == [3, 4]
+    assert await bus.read("job1", 4, timeout=0.05) == []
+
+    await bus.send_to_owner("a", "job1", {"type": "classification", "payload": []})
+    assert await bus.read_inbox("a", timeout=0) == [("job1", {"type": "classification", "payload": []})]
+    assert await bus.read_inbox("a", timeout=0) == []
+
+
+def _worker(tmp_path, bus, worker_id):
+    controller = POCController(storage_dir=tmp_path / worker_id)
+    controller.bus = bus
+    controller.worker_id = worker_id
+    return controller
+
+
+@pytest.mark.asyncio
+async def test_other_worker_serves_a_live_job_through_a_mirror(tmp_path):
+    bus = SqliteJobBus(tmp_path / "bus.db", poll_seconds=0.01)
+    owner = _worker(tmp_path, bus, "owner")
+    viewer = _worker(tmp_path, bus, "viewer")
+    job = PocJob(job_id="job1", agenda_text="予算", audio_filename="a.wav", events=owner._new_event_hub())
+    owner.jobs["job1"] = job
+    entry = {"index": 1, "speaker": "話者1", "raw_speaker": "spk_0", "result_id": "r1", "text": "こんにち", "timestamp": "t"}
+    job.transcripts.append(entry)
+    job.events.publish({"type": "transcript", "action": "append", "payload": entry})
+    forwarder = owner._spawn(owner._forward_events(job))
+    await asyncio.sleep(0.05)
+
+    mirror = await viewer.get_job("job1")
+    assert mirror is not None and mirror.owner == "owner"
+    assert mirror.transcripts == [entry]
+    subscription, _ = mirror.events.subscribe()
+
+    updated = {**entry, "text": "こんにちは"}
+    job.transcripts[0] = updated
+    job.events.publish({"type": "transcript", "action": "update", "payload": updated})
+    job.status = "completed"
+    job.events.publish({"type": "complete"})
+
+    first = await asyncio.wait_for(subscription.get(), timeout=3)
+    second = await asyncio.wait_for(subscription.get(), timeout=3)
+    assert (first["seq"], first["payload"]["text"]) == (job.events.last_seq - 1, "こんにちは")
+    assert second == {"type": "complete", "seq": job.events.last_seq}
+    assert mirror.status == "completed"
+    await forwarder
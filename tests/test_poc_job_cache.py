@@ -0,0 +1,79 @@
+from dataclasses import dataclass, field
+
+import pytest
+
+from poc.job_cache import JobCache, deep_sizeof
+
+
+@dataclass
+class Job:
+    job_id: str
+    status: str = "completed"
+    transcripts: list = field(default_factory=list)
+
+
+class Clock:
+    now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _cache(clock, archive, **kwargs):
+    async def loader(job_id):
+        return Job(job_id) if job_id in archive else None
+
+    return JobCache(
+        loader=loader,
+        evictable=lambda job: job.status == "completed",
+        size_of=lambda job: deep_sizeof(job.transcripts),
+        clock=clock,
+        **kwargs,
+    )
+
+
+def test_lru_evicts_only_completed_jobs():
+    cache = _cache(Clock(), archive=set(), max_resident=2)
+    cache.put("live", Job("live", status="processing"))
+    cache.put("old", Job("old"))
+    cache.put("new", Job("new"))
+
+    assert "live" in cache
+    assert "old" not in cache
+    assert "new" in cache
+    assert cache.stats()["evicted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_ttl_eviction_and_lazy_rehydration():
+    clock = Clock()
+    cache = _cache(clock, archive={"done"}, ttl_seconds=10)
+    cache.put("done", Job("done", transcripts=[{"text": "こんにちは"}]))
+    clock.now = 11
+    cache.sweep()
+    assert "done" not in cache
+
+    job = await cache.get("done")
+    assert job is not None and job.job_id == "done"
+    assert await cache.get("missing") is None
+    stats = cache.stats()
+    assert stats["rehydrated"] == 1
+    assert stats["misses"] == 2
+    assert stats["by_status"] == {"completed": 1}
+
+
+@pytest.mark.asyncio
+async def test_expired_jobs_are_evicted_without_another_put():
+    clock = Clock()
+    cache = _cache(clock, archive=set(), ttl_seconds=10)
+    cache.put("done", Job("done"))
+    cache.put("other", Job("other"))
+    clock.now = 8
+    assert await cache.get("other") is not None
+    clock.now = 15
+    assert cache.stats()["resident"] == 1
+    assert "done" not in cache and "other" in cache
+
+    clock.now = 30
+    assert await cache.get("other") is not None
+    assert cache.evicted == 1
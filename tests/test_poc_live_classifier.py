@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from poc.live_classifier import LiveClassifier
+from poc.sentences import sentence_segments_from_transcripts
+
+
+def _transcripts():
+    return [
+        {"speaker": "A", "text": "本日の議題は予算です。まず進捗を共有します。"},
+        {"speaker": "B", "text": "質問してもいいですか？"},
+        {"speaker": "A", "text": "どうぞ。"},
+        {"speaker": "B", "text": "締め切りはいつですか？来週でしょうか。"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batches_by_size_with_context_and_matching_indexes():
+    calls, deltas = [], []
+
+    async def classify(segments, agenda_text):
+        calls.append([segment["index"] for segment in segments])
+        return [{**segment, "category": "報告"} for segment in segments]
+
+    live = LiveClassifier(classify, "予算", deltas.extend, batch_size=3, max_delay=60, context=1)
+    for transcript in _transcripts():
+        live.add(transcript)
+    await asyncio.sleep(0)
+    await live.close()
+
+    assert calls == [[1, 2, 3], [3, 4, 5, 6]]
+    expected = sentence_segments_from_transcripts(_transcripts())
+    assert [(item["index"], item["text"]) for item in deltas] == [(item["index"], item["text"]) for item in expected]
+    assert deltas[3]["context_before"] == expected[3]["context_before"]
+
+
+@pytest.mark.asyncio
+async def test_flushes_partial_batch_after_max_delay():
+    deltas = []
+
+    async def classify(segments, agenda_text):
+        return [{**segment, "category": "質問"} for segment in segments]
+
+    live = LiveClassifier(classify, "", deltas.extend, batch_size=10, max_delay=0.05)
+    live.add({"speaker": "B", "text": "質問してもいいですか？"})
+    await asyncio.sleep(0.2)
+
+    assert [item["index"] for item in deltas] == [1]
+    assert live.pending == 0
+    await live.close()
@@ -0,0 +1,60 @@
+import pytest
+
+from poc.pacing import MAX_CHUNK_MS, MIN_CHUNK_MS, AudioPacer, PacingPolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(None, ("realtime", 1.0)), ("4x", ("multiplier", 4.0)), ("1.5X", ("multiplier", 1.5)), ("max", ("max", 0.0))],
+)
+def test_pacing_policy_parse(value, expected):
+    policy = PacingPolicy.parse(value)
+    assert (policy.mode, policy.speed) == expected
+
+
+@pytest.mark.parametrize("value", ["fast", "0x", "-2x"])
+def test_pacing_policy_rejects_unknown_values(value):
+    with pytest.raises(ValueError):
+        PacingPolicy.parse(value)
+
+
+@pytest.mark.asyncio
+async def test_multiplier_pacing_subtracts_time_spent_sending():
+    clock = FakeClock()
+    pacer = AudioPacer(PacingPolicy.parse("4x"), sample_rate=16000, clock=clock, sleep=clock.sleep)
+    pacer.start()
+    chunk = pacer.chunk_bytes()
+    clock.now += 0.005  # the send itself took 5 ms
+    await pacer.after_send(chunk, 0.005)
+
+    assert chunk == 1600
+    assert clock.sleeps == [pytest.approx(0.05 / 4 - 0.005)]
+
+
+@pytest.mark.asyncio
+async def test_max_pacing_grows_chunks_and_backs_off_on_pushback():
+    clock = FakeClock()
+    pacer = AudioPacer(PacingPolicy.parse("max"), sample_rate=16000, clock=clock, sleep=clock.sleep)
+    for _ in range(10):
+        await pacer.after_send(pacer.chunk_bytes(), 0.001)
+    assert pacer.chunk_ms == MAX_CHUNK_MS
+    assert clock.sleeps == []
+
+    await pacer.after_send(pacer.chunk_bytes(), 0.3)
+    assert pacer.chunk_ms == MAX_CHUNK_MS // 2
+    assert pacer.pushbacks == 1
+    assert clock.sleeps == [0.3]
+    assert pacer.chunk_ms >= MIN_CHUNK_MS
@@ -0,0 +1,132 @@
+import asyncio
+import io
+import wave
+
+import pytest
+
+from poc.audio import AudioValidationError
+from poc.controller import POCController
+from poc.scheduler import QueueFullError, TranscriptionScheduler
+
+
+def _job(started, release, name):
+    async def run():
+        started.append(name)
+        await release.wait()
+
+    return run
+
+
+@pytest.mark.asyncio
+async def test_scheduler_limits_concurrency_and_reports_positions():
+    scheduler = TranscriptionScheduler(max_concurrency=1, max_queued=2)
+    started, release = [], asyncio.Event()
+
+    assert scheduler.submit("a", _job(started, release, "a")) == 0
+    assert scheduler.submit("b", _job(started, release, "b")) == 1
+    assert scheduler.submit("c", _job(started, release, "c")) == 2
+    await asyncio.sleep(0)
+
+    assert started == ["a"]
+    assert scheduler.position("a") is None
+    assert scheduler.position("c") == 2
+
+    release.set()
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert started == ["a", "b", "c"]
+    assert scheduler.running_count == 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_rejects_when_queue_is_full():
+    scheduler = TranscriptionScheduler(max_concurrency=1, max_queued=1)
+    started, release = [], asyncio.Event()
+    scheduler.submit("a", _job(started, release, "a"))
+    scheduler.submit("b", _job(started, release, "b"))
+
+    with pytest.raises(QueueFullError) as excinfo:
+        scheduler.submit("c", _job(started, release, "c"))
+    assert excinfo.value.retry_after >= 1
+    release.set()
+
+
+@pytest.mark.asyncio
+async def test_priority_policy_starts_higher_priority_first():
+    scheduler = TranscriptionScheduler(max_concurrency=1, max_queued=3, policy="priority")
+    started, release = [], asyncio.Event()
+    scheduler.submit("running", _job(started, release, "running"))
+    scheduler.submit("low", _job(started, release, "low"), priority=0)
+    scheduler.submit("high", _job(started, release, "high"), priority=5)
+
+    assert scheduler.position("high") == 1
+    release.set()
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert started == ["running", "high", "low"]
+
+
+@pytest.mark.asyncio
+async def test_reservation_holds_a_slot_until_submitted_or_released():
+    scheduler = TranscriptionScheduler(max_concurrency=1, max_queued=0)
+    started, release = [], asyncio.Event()
+    reservation = scheduler.reserve()
+
+    with pytest.raises(QueueFullError):
+        scheduler.reserve()
+    assert scheduler.submit("a", _job(started, release, "a"), reservation=reservation) == 0
+    assert scheduler.reserved_count == 0 and not reservation.release()
+    with pytest.raises(QueueFullError):
+        scheduler.reserve()
+
+    release.set()
+    for _ in range(10):
+        await asyncio.sleep(0)
+    scheduler.reserve().release()
+    assert scheduler.has_capacity()
+
+
+class _Upload:
+    def __init__(self, payload):
+        self.buffer = io.BytesIO(payload)
+        self.reads = 0
+
+    async def read(self, size):
+        self.reads += 1
+        await asyncio.sleep(0)
+        return self.buffer.read(size)
+
+
+def _wav_bytes(frames=16000):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(b"\x00\x00" * frames)
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_starts_race_for_the_last_slot_before_reading_the_body(tmp_path, monkeypatch):
+    controller = POCController(storage_dir=tmp_path / "poc")
+    controller.scheduler = TranscriptionScheduler(max_concurrency=1, max_queued=0)
+    release = asyncio.Event()
+
+    async def process(job, audio_path):
+        await release.wait()
+
+    monkeypatch.setattr(controller, "_process_audio", process)
+    with pytest.raises(AudioValidationError):
+        await controller.start_transcription("", "bad.wav", _Upload(b"not a wav" * 10))
+    assert controller.scheduler.reserved_count == 0
+
+    uploads = [_Upload(_wav_bytes()), _Upload(_wav_bytes())]
+    results = await asyncio.gather(
+        *(controller.start_transcription("", "a.wav", upload) for upload in uploads), return_exceptions=True
+    )
+
+    assert isinstance(results[0], str) and isinstance(results[1], QueueFullError)
+    assert uploads[1].reads == 0
+    assert controller.scheduler.running_count == 1 and controller.scheduler.reserved_count == 0
+    release.set()
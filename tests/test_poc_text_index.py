@@ -0,0 +1,47 @@
+from poc.text_index import TranscriptSearchIndex, highlight, normalize_text
+
+
+def _job(job_id, completed_at, rows, classified=None):
+    return {
+        "job_id": job_id,
+        "agenda_text": "リリース準備の確認",
+        "completed_at": completed_at,
+        "archive_name": job_id,
+        "transcripts": [{"index": idx, "speaker": speaker, "text": text} for idx, (speaker, text) in enumerate(rows, 1)],
+        "classified_segments": classified or [],
+    }
+
+
+def test_search_filters_and_reindexing(tmp_path):
+    index = TranscriptSearchIndex(tmp_path / "search.db")
+    index.index_job(_job("old", "2024-01-01", [("話者1", "予算の見直しをお願いします。"), ("話者2", "予算は来週決めます。")]))
+    index.index_job(_job("new", "2024-02-01", [("話者1", "予定どおり進めます。"), ("話者2", "ＡＰＩの予算を確認します。")]))
+
+    items, total = index.search("予算")
+    assert total == 3
+    assert [(item["job_id"], item["index"]) for item in items] == [("new", 2), ("old", 1), ("old", 2)]
+    assert items[0]["highlight"] == "ＡＰＩの<mark>予算</mark>を確認します。"
+
+    items, _ = index.search("api 予算", speaker="話者2")
+    assert [(item["job_id"], item["speaker"]) for item in items] == [("new", "話者2")]
+    assert index.search("準備")[0][0]["kind"] == "agenda"
+    assert index.search("予定 見直し")[1] == 0
+
+    index.index_job(_job("old", "2024-01-01", [("話者1", "予算の見直しをお願いします。")], [{"index": 1, "category": "提案"}]))
+    items, total = index.search("予算", category="提案")
+    assert total == 1 and items[0]["job_id"] == "old"
+    assert index.search("来週")[1] == 0
+
+
+def test_highlight_keeps_offsets_of_the_original_text():
+    assert normalize_text("ＡＢｃ") == "abc"
+    snippet, ranges = highlight("<b>ＡＰＩ</b> の話", ["api"])
+    assert ranges == [[3, 6]]
+    assert snippet == "&lt;b&gt;<mark>ＡＰＩ</mark>&lt;/b&gt; の話"
+
+
+def test_index_is_opened_on_first_use(tmp_path):
+    index = TranscriptSearchIndex(tmp_path / "data" / "search.db")
+    assert not (tmp_path / "data").exists()
+    assert not index.has_job("missing")
+    assert (tmp_path / "data" / "search.db").exists()
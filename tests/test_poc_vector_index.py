@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+import pytest
+
+from poc import controller as controller_module
+from poc.vector_index import VectorIndex, archive_rows, transcript_passages
+
+
+def _rows(job_id, count):
+    return [{"job_id": job_id, "start": idx, "end": idx, "text": f"{job_id}-{idx}"} for idx in range(count)]
+
+
+@pytest.mark.parametrize("quantize", [False, True])
+def test_search_ranks_by_cosine_and_survives_reopen(tmp_path, quantize):
+    index = VectorIndex(tmp_path, quantize=quantize)
+    index.add(_rows("a", 2), [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+    index.add(_rows("b", 1), [[0.7, 0.7, 0.0]])
+
+    results = index.search([1.0, 0.1, 0.0], limit=2)
+    assert [row["text"] for row in results] == ["a-0", "b-0"]
+    assert results[0]["score"] == pytest.approx(0.995, abs=0.01)
+
+    reopened = VectorIndex(tmp_path)
+    assert reopened.count == 3
+    assert reopened.has_job("b") and not reopened.has_job("c")
+    assert reopened.search([0.0, 0.0, 1.0], limit=10)[0]["score"] == pytest.approx(0.0, abs=0.01)
+    with pytest.raises(ValueError):
+        reopened.add(_rows("c", 1), [[1.0, 0.0]])
+
+
+def test_passages_group_rows_by_length():
+    transcripts = [{"index": idx, "speaker": "A", "text": "あ" * 150} for idx in range(1, 6)]
+    passages = transcript_passages(transcripts, max_chars=400)
+    assert [(passage["start"], passage["end"]) for passage in passages] == [(1, 2), (3, 4), (5, 5)]
+
+    rows = archive_rows({"job_id": "j1", "archive_name": "定例", "transcripts": transcripts})
+    assert rows[0]["job_id"] == "j1" and rows[0]["archive_name"] == "定例"
+
+
+def test_adding_a_job_twice_keeps_one_copy(tmp_path):
+    first, second = VectorIndex(tmp_path), VectorIndex(tmp_path)
+    assert not first.has_job("a") and not second.has_job("a")
+
+    assert first.add(_rows("a", 2), [[1.0, 0.0], [0.0, 1.0]]) == 2
+    assert second.add(_rows("a", 2) + _rows("b", 1), [[1.0, 0.0], [0.0, 1.0], [0.5, 0.5]]) == 1
+
+    reopened = VectorIndex(tmp_path)
+    assert reopened.count == 3
+    assert [row["text"] for row in reopened.search([0.5, 0.5], limit=1)] == ["b-0"]
+
+
+@pytest.mark.asyncio
+async def test_controller_embeds_a_job_once_when_indexed_concurrently(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_embeddings(texts):
+        calls.append(texts)
+        time.sleep(0.05)
+        return [[1.0, 0.0] for _ in texts]
+
+    monkeypatch.setattr(controller_module, "create_embeddings", fake_embeddings)
+    controller = controller_module.POCController(storage_dir=tmp_path / "poc")
+    data = {"job_id": "j1", "transcripts": [{"index": 1, "speaker": "A", "text": "こんにちは"}]}
+
+    assert sorted(await asyncio.gather(controller.index_archived_job(data), controller.index_archived_job(data))) == [0, 1]
+    assert await controller.index_archived_job(data) == 0
+    assert len(calls) == 1 and controller.vector_index.count == 1
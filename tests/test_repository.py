@@ -0,0 +1,50 @@
+import json
+
+from models.meeting_model import Meeting
+from services.repository import SqliteMeetingRepository
+
+
+def test_sqlite_repository_filters_and_paginates(tmp_path):
+    repository = SqliteMeetingRepository(tmp_path / "meetings.db")
+    for idx in range(5):
+        repository._upsert(
+            Meeting(
+                meeting_id=f"mtg-{idx}",
+                title=f"会議{idx}",
+                status="scheduled",
+                scheduled_for="2024-01-01T10:00:00+00:00",
+                created_at=f"2024-01-0{idx + 1}T09:00:00+00:00",
+            )
+        )
+    repository.update_meeting("mtg-1", status="completed")
+    repository.update_meeting("mtg-3", status="completed", summary_s3_key="summaries/mtg-3.json")
+
+    page = repository.list_meetings(limit=2, offset=1)
+    completed = repository.list_meetings(status="completed")
+
+    assert [meeting.meeting_id for meeting in page] == ["mtg-1", "mtg-2"]
+    assert [meeting.meeting_id for meeting in completed] == ["mtg-1", "mtg-3"]
+    assert completed[1].summary_s3_key == "summaries/mtg-3.json"
+    assert repository.count_meetings() == 5
+    assert repository.count_meetings(status="completed") == 2
+    journal_mode = repository._connect().execute("PRAGMA journal_mode").fetchone()[0]
+    assert journal_mode == "wal"
+
+
+def test_sqlite_repository_imports_json_once(tmp_path):
+    source = tmp_path / "meetings.json"
+    source.write_text(
+        json.dumps(
+            [
+                {"meeting_id": "mtg-1", "title": "定例", "status": "completed"},
+                {"meeting_id": "mtg-2", "title": "採用", "scheduled_for": "2024-01-01T10:00:00+00:00"},
+            ]
+        )
+    )
+    repository = SqliteMeetingRepository(tmp_path / "meetings.db")
+
+    assert repository.import_json(source) == 2
+    assert repository.import_json(source) == 0
+    assert repository.get_meeting("mtg-1").status == "completed"
+    assert repository.get_meeting("mtg-2").created_at == "2024-01-01T10:00:00+00:00"
+    assert [meeting.title for meeting in repository.list_meetings()] == ["定例", "採用"]
@@ -1,12 +1,14 @@
 import io
 import json
+import threading
 
 import boto3
+import pytest
 from botocore.stub import Stubber, ANY
-from botocore.exceptions import ClientError
+from botocore.exceptions import ClientError, EndpointConnectionError
 from botocore.response import StreamingBody
 
-from services.s3_storage import S3Storage
+from services.s3_storage import AsyncS3Storage, CircuitBreaker, S3Storage
 
 
 def test_s3_storage_write_json_uses_client(tmp_path):
@@ -49,3 +51,104 @@ def test_s3_storage_read_text_fallback(tmp_path):
     file_path.write_text("local copy", encoding="utf-8")
 
     assert storage.read_text("transcripts/demo.txt") == "local copy"
+
+
+class _CountingErrorClient:
+    def __init__(self):
+        self.calls = 0
+
+    def get_object(self, **kwargs):
+        self.calls += 1
+        raise EndpointConnectionError(endpoint_url="https://s3.example")
+
+
+def test_s3_storage_breaker_skips_s3_after_repeated_failures(tmp_path):
+    clock = {"now": 0.0}
+    client = _CountingErrorClient()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=lambda: clock["now"])
+    storage = S3Storage(bucket="test-bucket", client=client, breaker=breaker)
+    storage._fallback_dir = tmp_path
+    (tmp_path / "demo.txt").write_text("local copy", encoding="utf-8")
+
+    for _ in range(5):
+        assert storage.read_text("demo.txt") == "local copy"
+    assert client.calls == 2
+    assert storage.health()["backend"] == "local"
+
+    clock["now"] = 31
+    assert breaker.state == "half_open"
+    storage.read_text("demo.txt")
+    assert client.calls == 3
+    assert breaker.state == "open"
+
+
+def test_s3_storage_missing_key_does_not_trip_breaker(tmp_path):
+    class MissingClient:
+        def get_object(self, **kwargs):
+            raise ClientError({"Error": {"Code": "NoSuchKey", "Message": "missing"}}, "GetObject")
+
+    storage = S3Storage(bucket="test-bucket", client=MissingClient(), breaker=CircuitBreaker(failure_threshold=1))
+    storage._fallback_dir = tmp_path
+    for _ in range(3):
+        try:
+            storage.read_text("nope.json")
+        except FileNotFoundError:
+            pass
+    assert storage.breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_async_storage_bulk_calls_run_off_the_event_loop(tmp_path):
+    class RecordingClient:
+        def __init__(self):
+            self.threads = set()
+
+        def get_object(self, **kwargs):
+            self.threads.add(threading.current_thread().name)
+            if kwargs["Key"] == "missing.json":
+                raise ClientError({"Error": {"Code": "NoSuchKey", "Message": "missing"}}, "GetObject")
+            return {"Body": io.BytesIO(kwargs["Key"].encode("utf-8"))}
+
+        def put_object(self, **kwargs):
+            self.threads.add(threading.current_thread().name)
+
+    client = RecordingClient()
+    storage = S3Storage(bucket="test-bucket", client=client)
+    storage._fallback_dir = tmp_path
+    async_storage = AsyncS3Storage(storage, max_workers=4)
+
+    await async_storage.write_many({"a.json": {"n": 1}, "b.json": {"n": 2}})
+    objects = await async_storage.read_many(["a.json", "missing.json", "b.json"])
+
+    assert objects == {"a.json": b"a.json", "b.json": b"b.json"}
+    assert client.threads and all(name.startswith("s3-storage") for name in client.threads)
+    async_storage.close()
+
+
+def test_s3_storage_probe_that_raises_unexpectedly_reopens_the_breaker(tmp_path):
+    class BrokenClient:
+        def __init__(self):
+            self.calls = 0
+
+        def get_object(self, **kwargs):
+            self.calls += 1
+            if self.calls == 1:
+                raise EndpointConnectionError(endpoint_url="https://s3.example")
+            raise RuntimeError("unexpected")
+
+    clock = {"now": 0.0}
+    client = BrokenClient()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=lambda: clock["now"])
+    storage = S3Storage(bucket="test-bucket", client=client, breaker=breaker)
+    storage._fallback_dir = tmp_path
+    (tmp_path / "demo.txt").write_text("local copy", encoding="utf-8")
+
+    assert storage.read_text("demo.txt") == "local copy"
+    clock["now"] = 31
+    assert storage.health()["backend"] == "s3-half-open"
+    with pytest.raises(RuntimeError):
+        storage.read_text("demo.txt")
+    assert breaker.state == "open" and storage.health()["backend"] == "local"
+
+    clock["now"] = 62
+    assert breaker.allow()